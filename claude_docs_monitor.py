@@ -7,9 +7,11 @@ and produces unified diffs when content changes.
 
 import argparse
 import asyncio
+import fnmatch
 import hashlib
 import json
 import os
+import random
 import re
 import shutil
 import sqlite3
@@ -17,12 +19,19 @@ import subprocess
 import sys
 import time
 import webbrowser
+import zlib
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, timezone
-from difflib import unified_diff
+from difflib import SequenceMatcher, unified_diff
 from pathlib import Path
+from xml.sax.saxutils import escape as xml_escape
 
 import httpx
 
+from llm_backend import (RateLimitError, batch_results, call_claude, get_api_usage, poll_batch,
+                         resolve_backend, submit_batch)
+
 try:
     from rich.console import Console
     from rich.table import Table
@@ -40,6 +49,52 @@ DB_PATH = DB_DIR / "snapshots.db"
 MAX_CONCURRENT = 5
 MAX_RETRIES = 3
 BACKOFF_BASE = 1  # seconds
+NORMALIZE_RULES_PATH = DB_DIR / "normalize.json"
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16        # 16 bands × 4 rows: ~99% recall at 0.7 similarity, ~12% candidates at 0.3
+MOVE_SIMILARITY = 0.7  # estimated Jaccard needed to call a removed/added pair a move
+MIN_SECTION_WORDS = 20  # shorter sections are too generic to track between pages
+FLAP_WINDOW = 5        # distinct recent versions per URL checked for reverts
+FLAP_STABLE_RUNS = 3   # unchanged runs before a revert is reported as a real change
+HISTORY_DIRNAME = "history"  # monthly history segments live in <report dir>/history/YYYY-MM.{md,html}
+MAX_DIFF_BYTES = 64_000  # per-diff cap inlined in report.md / rendered in diffs/*.html; full diff in diffs/*.diff
+REPORT_DIFFS_DIRNAME = "diffs"
+DUMP_WORKERS = 8  # threads writing files in `dump`
+MIRROR_MANIFEST = "manifest.json"  # filename → sha256 of each file in a page mirror
+RUN_ARTIFACT = "run.json"  # structured results of the last check, read by digest
+FEED_DIRNAME = "changes"    # static change feed: index.json, per-run shards, feed.atom
+FEED_MANIFEST_RUNS = 100    # runs listed in changes/index.json (and per archive page)
+FEED_ATOM_ENTRIES = 50
+CLASSIFY_BATCH_TOKENS = 24_000  # estimated input tokens per structured-classification call
+CLASSIFY_WORKERS = 4            # classification batches in flight at once
+CLASSIFY_RETRIES = 2            # extra attempts for a failed batch
+BATCH_POLL_SECONDS = 60         # `backfill --batch --wait` polling interval
+CASCADE_FAST_MODEL = "haiku"    # first tier of `--cascade`
+CASCADE_MIN_CONFIDENCE = 0.7    # fast-tier events below this self-reported confidence are escalated
+CASCADE_LARGE_DIFF_TOKENS = 4_000  # diffs estimated above this always go to the stronger model
+HISTORY_FRAGMENT_VERSION = 1  # bump when history entry rendering changes, so rebuild-history re-renders
+
+# Volatile fragments stripped before hashing. Override by writing a JSON list of
+# rules to data-claude/normalize.json (see `renormalize --print-rules`).
+#   {"name", "pattern", "replace", "flags"?}  → re.sub over the whole page
+#   {"name", "sort_between": [start, end]}    → sort lines inside matching blocks
+DEFAULT_NORMALIZE_RULES = [
+    {"name": "cache-busting-query",
+     "pattern": r"([?&](?:v|ver|version|t|ts|cb|cachebust|build|_)=)[\w.-]+",
+     "replace": r"\1*"},
+    {"name": "build-id",
+     "pattern": r"((?:build[_-]?id|buildId)[\"']?\s*[:=]\s*[\"']?)[\w.-]+",
+     "replace": r"\1*", "flags": "i"},
+    {"name": "iso-timestamp",
+     "pattern": r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?",
+     "replace": "<timestamp>"},
+    {"name": "csrf-token",
+     "pattern": r"((?:csrf[\w-]*|authenticity_token)[\"']?(?:\s+(?:content|value))?\s*[:=]\s*[\"'])[^\"']*",
+     "replace": r"\1*", "flags": "i"},
+    {"name": "request-id",
+     "pattern": r"((?:x-)?request[_-]id[\"']?\s*[:=]\s*[\"']?)[\w-]+",
+     "replace": r"\1*", "flags": "i"},
+]
 
 console = Console() if HAS_RICH else None
 
@@ -92,10 +147,118 @@ def init_db(db_path: Path = DB_PATH) -> sqlite3.Connection:
         CREATE INDEX IF NOT EXISTS idx_ce_url ON change_events(url);
         CREATE INDEX IF NOT EXISTS idx_ce_category ON change_events(category);
         CREATE INDEX IF NOT EXISTS idx_ce_severity ON change_events(severity);
+
+        CREATE TABLE IF NOT EXISTS recent_hashes (
+            url         TEXT    PRIMARY KEY,
+            hashes_json TEXT    NOT NULL,
+            updated_at  TEXT    NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS flap_events (
+            id                  INTEGER PRIMARY KEY AUTOINCREMENT,
+            url                 TEXT    NOT NULL,
+            first_detected_at   TEXT    NOT NULL,
+            last_detected_at    TEXT    NOT NULL,
+            from_hash           TEXT    NOT NULL,
+            to_hash             TEXT    NOT NULL,
+            from_snapshot_id    INTEGER,
+            flips               INTEGER NOT NULL DEFAULT 1,
+            stable_runs         INTEGER NOT NULL DEFAULT 0,
+            status              TEXT    NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_flap_url ON flap_events(url, status);
+
+        CREATE TABLE IF NOT EXISTS line_provenance (
+            url         TEXT    PRIMARY KEY,
+            snapshot_id INTEGER NOT NULL,
+            hash        TEXT    NOT NULL,
+            runs_json   TEXT    NOT NULL,
+            updated_at  TEXT    NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS history_fragments (
+            index_id     INTEGER NOT NULL,
+            settings_key TEXT    NOT NULL,
+            window_end   TEXT,
+            segment      TEXT,
+            md           TEXT,
+            html         TEXT,
+            PRIMARY KEY (index_id, settings_key)
+        );
+
+        CREATE TABLE IF NOT EXISTS git_exports (
+            repo          TEXT    NOT NULL,
+            branch        TEXT    NOT NULL,
+            last_index_id INTEGER NOT NULL,
+            head          TEXT    NOT NULL,
+            files_json    TEXT    NOT NULL,
+            updated_at    TEXT    NOT NULL,
+            PRIMARY KEY (repo, branch)
+        );
+
+        CREATE TABLE IF NOT EXISTS classification_cache (
+            url            TEXT    NOT NULL,
+            old_hash       TEXT    NOT NULL,
+            new_hash       TEXT    NOT NULL,
+            model          TEXT    NOT NULL,
+            prompt_version TEXT    NOT NULL,
+            events_json    TEXT    NOT NULL,
+            created_at     TEXT    NOT NULL,
+            PRIMARY KEY (url, old_hash, new_hash, model, prompt_version)
+        );
+
+        CREATE TABLE IF NOT EXISTS classification_batches (
+            batch_id       TEXT    PRIMARY KEY,
+            model          TEXT    NOT NULL,
+            prompt_version TEXT    NOT NULL,
+            include_html   INTEGER NOT NULL,
+            requests_json  TEXT    NOT NULL,
+            status         TEXT    NOT NULL,
+            submitted_at   TEXT    NOT NULL,
+            updated_at     TEXT    NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS history_checkpoints (
+            output_dir    TEXT    PRIMARY KEY,
+            settings_key  TEXT    NOT NULL,
+            last_index_id INTEGER NOT NULL,
+            updated_at    TEXT    NOT NULL
+        );
     """)
+    _migrate_schema(conn)
     return conn
 
 
+# Columns added after the initial schema. Existing databases get them via
+# ALTER TABLE on open; new databases get them the same way.
+_SCHEMA_ADDITIONS = {
+    "page_snapshots": [
+        ("normalized_hash", "TEXT"),
+        ("normalize_rules", "TEXT"),
+    ],
+    "classification_cache": [
+        # Normalized hash of the classified diff text; rows without it never match
+        ("unit_hash", "TEXT"),
+    ],
+    "classification_batches": [
+        ("min_llm_severity", "TEXT"),  # heuristic cut-off the batch was submitted with
+    ],
+    "change_events": [
+        ("classifier", "TEXT"),  # "heuristic" or "llm:<model>"; NULL for added/removed/moved rows
+        ("confidence", "REAL"),  # model's self-reported confidence, 0-1
+    ],
+}
+
+
+def _migrate_schema(conn: sqlite3.Connection):
+    """Add any columns from _SCHEMA_ADDITIONS that the database is missing."""
+    for table, columns in _SCHEMA_ADDITIONS.items():
+        existing = {r["name"] for r in conn.execute(f"PRAGMA table_info({table})")}
+        for name, decl in columns:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+    conn.commit()
+
+
 def store_index_snapshot(conn: sqlite3.Connection, content: str, urls: list[str]) -> int:
     """Store an index snapshot and return its id."""
     h = sha256(content)
@@ -116,15 +279,20 @@ def get_last_index_snapshot(conn: sqlite3.Connection) -> sqlite3.Row | None:
 
 
 def store_page_snapshot(conn: sqlite3.Connection, url: str, content: str | None,
-                        status_code: int | None, duration_ms: float, error: str | None = None):
-    """Append a page snapshot."""
+                        status_code: int | None, duration_ms: float, error: str | None = None) -> int:
+    """Append a page snapshot with both its raw and normalized hash. Returns the row id."""
     h = sha256(content) if content else None
+    rules = get_normalize_rules()
+    nh = normalized_sha256(content, rules) if content else None
+    fp = normalize_rules_fingerprint(rules) if content else None
     now = utcnow()
-    conn.execute(
-        "INSERT INTO page_snapshots (url, fetched_at, content, hash, status_code, duration_ms, error) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?)",
-        (url, now, content, h, status_code, duration_ms, error),
+    cur = conn.execute(
+        "INSERT INTO page_snapshots (url, fetched_at, content, hash, status_code, duration_ms, error, "
+        "normalized_hash, normalize_rules) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (url, now, content, h, status_code, duration_ms, error, nh, fp),
     )
+    return cur.lastrowid
 
 
 def get_last_page_snapshot(conn: sqlite3.Connection, url: str) -> sqlite3.Row | None:
@@ -171,6 +339,236 @@ def get_all_tracked_urls(conn: sqlite3.Connection) -> list[dict]:
     return [dict(r) for r in rows]
 
 
+def iter_latest_snapshots(conn: sqlite3.Connection, changed_since: str | None = None):
+    """Stream (url, content) of every URL's latest snapshot, in URL order, in one query.
+
+    Rows come straight off the cursor, so only one page is held at a time.
+    URLs whose latest fetch failed (no content) are skipped. With
+    ``changed_since`` (ISO timestamp), only pages whose content differs from
+    their last snapshot before that time (or that are new since) are returned;
+    pairs that both have a normalized hash are compared by it, so volatile-only
+    differences do not count.
+    """
+    sql = """
+        SELECT p.url, p.content
+        FROM page_snapshots p
+        INNER JOIN (
+            SELECT url, MAX(id) as max_id FROM page_snapshots GROUP BY url
+        ) latest ON p.id = latest.max_id
+        WHERE p.content IS NOT NULL
+    """
+    params: tuple = ()
+    if changed_since:
+        sql += """
+        AND (
+            SELECT CASE WHEN p.normalized_hash IS NOT NULL AND q.normalized_hash IS NOT NULL
+                        THEN q.normalized_hash = p.normalized_hash ELSE q.hash = p.hash END
+            FROM page_snapshots q
+            WHERE q.url = p.url AND q.fetched_at < ? AND q.content IS NOT NULL
+            ORDER BY q.id DESC LIMIT 1
+        ) IS NOT 1
+        """
+        params = (changed_since,)
+    for row in conn.execute(sql + " ORDER BY p.url", params):
+        yield row["url"], row["content"]
+
+
+def load_recent_hashes(conn: sqlite3.Connection) -> dict[str, list[list]]:
+    """Return {url: [[normalized_hash, snapshot_id], ...]} newest first, for every tracked URL."""
+    return {r["url"]: json.loads(r["hashes_json"])
+            for r in conn.execute("SELECT url, hashes_json FROM recent_hashes")}
+
+
+def seed_recent_hashes(conn: sqlite3.Connection, url: str, rules: list[dict] | None = None) -> list[list]:
+    """Build a URL's recent-version list from its stored snapshots (first use after upgrading)."""
+    recent = []
+    for row in conn.execute(
+        "SELECT id, content, normalized_hash, normalize_rules FROM page_snapshots "
+        "WHERE url = ? AND content IS NOT NULL ORDER BY id DESC LIMIT ?",
+        (url, FLAP_WINDOW * 10),
+    ):
+        h = effective_normalized_hash(row, rules)
+        if all(h != seen for seen, _ in recent):
+            recent.append([h, row["id"]])
+            if len(recent) >= FLAP_WINDOW:
+                break
+    return recent
+
+
+def _save_recent_hashes(conn: sqlite3.Connection, url: str, entries: list[list]):
+    conn.execute(
+        "INSERT INTO recent_hashes (url, hashes_json, updated_at) VALUES (?, ?, ?) "
+        "ON CONFLICT(url) DO UPDATE SET hashes_json = excluded.hashes_json, updated_at = excluded.updated_at",
+        (url, json.dumps(entries), utcnow()),
+    )
+
+
+def seed_missing_recent_hashes(conn: sqlite3.Connection, recent: dict[str, list[list]],
+                               urls: Iterable[str], rules: list[dict] | None = None) -> int:
+    """Seed and store the recent-version list of every URL that has snapshots but no list yet.
+
+    Runs before a check's change loop, so a page that does not change on the
+    first run after upgrading still has its older versions to revert to.
+    Returns the number of URLs seeded.
+    """
+    seeded = 0
+    for url in urls:
+        if url in recent:
+            continue
+        entries = seed_recent_hashes(conn, url, rules)
+        if entries:
+            recent[url] = entries
+            _save_recent_hashes(conn, url, entries)
+            seeded += 1
+    return seeded
+
+
+def push_recent_hash(conn: sqlite3.Connection, recent: dict[str, list[list]], url: str,
+                     normalized_hash: str, snapshot_id: int):
+    """Record a URL's current version at the front of its recent list, if it isn't already."""
+    entries = recent.get(url, [])
+    if entries and entries[0][0] == normalized_hash:
+        return
+    entries = [[normalized_hash, snapshot_id]] + [e for e in entries if e[0] != normalized_hash]
+    recent[url] = entries[:FLAP_WINDOW]
+    _save_recent_hashes(conn, url, recent[url])
+
+
+def get_pending_flaps(conn: sqlite3.Connection) -> dict[str, sqlite3.Row]:
+    """Return the open (pending) flap event per URL."""
+    return {r["url"]: r for r in conn.execute(
+        "SELECT * FROM flap_events WHERE status = 'pending' ORDER BY id")}
+
+
+def record_flap(conn: sqlite3.Connection, pending: dict[str, sqlite3.Row], url: str,
+                from_hash: str, to_hash: str, from_snapshot_id: int) -> int:
+    """Record a revert to a recent version, folding repeated flips of the same pair into one event.
+
+    Returns the number of flips recorded for this event so far.
+    """
+    now = utcnow()
+    ev = pending.get(url)
+    if ev and {ev["from_hash"], ev["to_hash"]} == {from_hash, to_hash}:
+        conn.execute(
+            "UPDATE flap_events SET last_detected_at = ?, from_hash = ?, to_hash = ?, "
+            "from_snapshot_id = ?, flips = flips + 1, stable_runs = 0 WHERE id = ?",
+            (now, from_hash, to_hash, from_snapshot_id, ev["id"]),
+        )
+        flips = ev["flips"] + 1
+    else:
+        if ev:
+            conn.execute("UPDATE flap_events SET status = 'superseded' WHERE id = ?", (ev["id"],))
+        conn.execute(
+            "INSERT INTO flap_events (url, first_detected_at, last_detected_at, from_hash, to_hash, "
+            "from_snapshot_id, status) VALUES (?, ?, ?, ?, ?, ?, 'pending')",
+            (url, now, now, from_hash, to_hash, from_snapshot_id),
+        )
+        flips = 1
+    pending[url] = conn.execute(
+        "SELECT * FROM flap_events WHERE url = ? AND status = 'pending' ORDER BY id DESC LIMIT 1", (url,)
+    ).fetchone()
+    return flips
+
+
+def _encode_provenance(first_seen: list[str]) -> str:
+    """Pack per-line first-seen timestamps as {"runs": [...distinct], "lines": [run index, ...]}."""
+    runs = list(dict.fromkeys(first_seen))
+    pos = {r: i for i, r in enumerate(runs)}
+    return json.dumps({"runs": runs, "lines": [pos[r] for r in first_seen]})
+
+
+def _decode_provenance(runs_json: str) -> list[str]:
+    data = json.loads(runs_json)
+    return [data["runs"][i] for i in data["lines"]]
+
+
+def save_line_provenance(conn: sqlite3.Connection, url: str, snapshot_id: int, content_hash: str,
+                         first_seen: list[str]):
+    """Persist a URL's line provenance for the snapshot it now describes."""
+    conn.execute(
+        "INSERT INTO line_provenance (url, snapshot_id, hash, runs_json, updated_at) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT(url) DO UPDATE SET snapshot_id = excluded.snapshot_id, hash = excluded.hash, "
+        "runs_json = excluded.runs_json, updated_at = excluded.updated_at",
+        (url, snapshot_id, content_hash, _encode_provenance(first_seen), utcnow()),
+    )
+
+
+def advance_line_provenance(conn: sqlite3.Connection, url: str, prev: sqlite3.Row | None,
+                            snapshot_id: int, content: str):
+    """Bring a URL's provenance up to ``snapshot_id``, the version check just stored.
+
+    Called from check for every new or changed page. When the stored
+    provenance describes ``prev`` this costs one line diff of the page; a
+    page without provenance (or with provenance that fell behind) is
+    replayed once from where it stops, and every later run is one diff again.
+    """
+    row = conn.execute("SELECT hash, runs_json FROM line_provenance WHERE url = ?", (url,)).fetchone()
+    if row and prev and prev["content"] and row["hash"] == prev["hash"]:
+        fetched_at = conn.execute("SELECT fetched_at FROM page_snapshots WHERE id = ?",
+                                  (snapshot_id,)).fetchone()["fetched_at"]
+        first_seen = carry_line_provenance(_decode_provenance(row["runs_json"]),
+                                           prev["content"], content, fetched_at)
+        save_line_provenance(conn, url, snapshot_id, sha256(content), first_seen)
+        return
+    _, first_seen, start_id, last_id, last_hash = _replay_line_provenance(conn, url)
+    if last_id != start_id:
+        save_line_provenance(conn, url, last_id, last_hash, first_seen)
+
+
+def get_line_provenance(conn: sqlite3.Connection, url: str,
+                        persist: bool = True) -> tuple[list[str], list[str]] | None:
+    """Return (lines, first_seen) for a URL's latest content, catching up on any missed versions.
+
+    Starts from the stored provenance (or the page's first snapshot) and
+    replays only the versions after it. With ``persist`` the result is
+    saved so the next call starts from here. Returns None if the URL has
+    no stored content.
+    """
+    content, first_seen, start_id, last_id, last_hash = _replay_line_provenance(conn, url)
+    if content is None:
+        return None
+    if persist and last_id != start_id:
+        save_line_provenance(conn, url, last_id, last_hash, first_seen)
+        conn.commit()
+    return normalize(content).splitlines(), first_seen
+
+
+def _replay_line_provenance(conn: sqlite3.Connection, url: str):
+    """Replay a URL's versions after its stored provenance (or from its first snapshot).
+
+    Returns (latest content or None, first_seen, stored snapshot id, latest
+    snapshot id, latest hash); the two ids are equal when nothing was replayed.
+    """
+    row = conn.execute("SELECT * FROM line_provenance WHERE url = ?", (url,)).fetchone()
+    content = None
+    first_seen: list[str] = []
+    start_id = 0
+    last_hash = None
+    if row:
+        snap = conn.execute("SELECT content FROM page_snapshots WHERE id = ?", (row["snapshot_id"],)).fetchone()
+        if snap:
+            content = snap["content"]
+            first_seen = _decode_provenance(row["runs_json"])
+            start_id = row["snapshot_id"]
+            last_hash = row["hash"]
+    last_id = start_id
+    for snap in conn.execute(
+        "SELECT id, fetched_at, hash FROM page_snapshots "
+        "WHERE url = ? AND id > ? AND content IS NOT NULL ORDER BY id",
+        (url, start_id),
+    ).fetchall():
+        if snap["hash"] == last_hash:
+            continue
+        new_content = conn.execute("SELECT content FROM page_snapshots WHERE id = ?",
+                                   (snap["id"],)).fetchone()["content"]
+        if content is None:
+            first_seen = [snap["fetched_at"]] * len(normalize(new_content).splitlines())
+        else:
+            first_seen = carry_line_provenance(first_seen, content, new_content, snap["fetched_at"])
+        content, last_hash, last_id = new_content, snap["hash"], snap["id"]
+    return content, first_seen, start_id, last_id, last_hash
+
+
 def store_change_event(conn: sqlite3.Connection, run_timestamp: str, url: str,
                        event_type: str, diff_text: str | None = None,
                        ai_result: dict | None = None) -> int:
@@ -184,13 +582,17 @@ def store_change_event(conn: sqlite3.Connection, run_timestamp: str, url: str,
     action_required = ai_result.get("action_required") if ai_result else None
     tags = ai_result.get("tags") if ai_result else None
     tags_json = json.dumps(tags) if tags else None
+    classifier = ai_result.get("classifier") if ai_result else None
+    confidence = ai_result.get("confidence") if ai_result else None
     cur = conn.execute(
         "INSERT INTO change_events "
         "(run_timestamp, url, page_name, event_type, category, severity, "
-        " summary, details, action_required, tags_json, diff_text, created_at) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        " summary, details, action_required, tags_json, diff_text, classifier, confidence, "
+        " created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
         (run_timestamp, url, page_name, event_type, category, severity,
-         summary, details, action_required, tags_json, diff_text, now),
+         summary, details, action_required, tags_json, diff_text, classifier,
+         confidence if isinstance(confidence, (int, float)) else None, now),
     )
     return cur.lastrowid
 
@@ -241,6 +643,32 @@ def get_change_events_for_run(conn: sqlite3.Connection, run_timestamp: str) -> l
     ).fetchall()
 
 
+def get_cached_classification(conn: sqlite3.Connection, key: tuple[str, str, str, str],
+                              model: str, prompt_version: str) -> list[dict] | None:
+    """Return the cached events for a (url, old_hash, new_hash, unit_hash) diff unit, or None."""
+    row = conn.execute(
+        "SELECT events_json FROM classification_cache WHERE url = ? AND old_hash = ? "
+        "AND new_hash = ? AND unit_hash = ? AND model = ? AND prompt_version = ?",
+        (*key, model, prompt_version),
+    ).fetchone()
+    return json.loads(row["events_json"]) if row else None
+
+
+def store_cached_classification(conn: sqlite3.Connection, key: tuple[str, str, str, str],
+                                model: str, prompt_version: str, events: list[dict]):
+    """Cache the events classified for a (url, old_hash, new_hash, unit_hash) diff unit.
+
+    The unit hash is not part of the table's primary key, so a transition
+    keeps only its most recently classified grouping.
+    """
+    conn.execute(
+        "INSERT OR REPLACE INTO classification_cache "
+        "(url, old_hash, new_hash, unit_hash, model, prompt_version, events_json, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (*key, model, prompt_version, json.dumps(events), utcnow()),
+    )
+
+
 # ── Utilities ───────────────────────────────────────────────────────────────
 
 def sha256(text: str) -> str:
@@ -259,6 +687,104 @@ def normalize(text: str) -> str:
     return text.replace("\r\n", "\n").replace("\r", "\n")
 
 
+def load_normalize_rules(path: Path = NORMALIZE_RULES_PATH) -> list[dict]:
+    """Load normalization rules from path, or the built-in defaults if it doesn't exist."""
+    if not path.exists():
+        return DEFAULT_NORMALIZE_RULES
+    rules = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(rules, list):
+        raise ValueError(f"{path}: expected a JSON list of rules")
+    for rule in rules:
+        if "pattern" not in rule and "sort_between" not in rule:
+            raise ValueError(f"{path}: rule {rule.get('name', rule)!r} needs 'pattern' or 'sort_between'")
+    return rules
+
+
+_NORMALIZE_RULES: list[dict] | None = None
+_COMPILED_RULES: dict[str, list] = {}
+
+
+def get_normalize_rules() -> list[dict]:
+    """Return the active normalization rules (loaded once per process)."""
+    global _NORMALIZE_RULES
+    if _NORMALIZE_RULES is None:
+        _NORMALIZE_RULES = load_normalize_rules()
+    return _NORMALIZE_RULES
+
+
+def normalize_rules_fingerprint(rules: list[dict]) -> str:
+    """Short stable id for a rule set, stored per snapshot to detect stale normalized hashes."""
+    return sha256(json.dumps(rules, sort_keys=True))[:16]
+
+
+def _compile_rules(rules: list[dict]) -> list:
+    """Compile rules into (kind, ...) tuples, cached by fingerprint."""
+    fp = normalize_rules_fingerprint(rules)
+    if fp not in _COMPILED_RULES:
+        compiled = []
+        for rule in rules:
+            flags = re.MULTILINE
+            if "i" in rule.get("flags", ""):
+                flags |= re.IGNORECASE
+            if "sort_between" in rule:
+                start, end = rule["sort_between"]
+                compiled.append(("sort", re.compile(start, flags), re.compile(end, flags)))
+            else:
+                compiled.append(("sub", re.compile(rule["pattern"], flags), rule.get("replace", "")))
+        _COMPILED_RULES[fp] = compiled
+    return _COMPILED_RULES[fp]
+
+
+def _sort_blocks(text: str, start: re.Pattern, end: re.Pattern) -> str:
+    """Sort the lines strictly between each start/end marker line pair."""
+    out = []
+    block = None
+    for line in text.split("\n"):
+        if block is None:
+            out.append(line)
+            if start.search(line):
+                block = []
+        elif end.search(line):
+            out.extend(sorted(block))
+            out.append(line)
+            block = None
+        else:
+            block.append(line)
+    if block is not None:
+        out.extend(block)
+    return "\n".join(out)
+
+
+def normalize_for_hash(text: str, rules: list[dict] | None = None) -> str:
+    """Apply line-ending normalization plus the volatile-fragment rules."""
+    text = normalize(text)
+    for kind, a, b in _compile_rules(get_normalize_rules() if rules is None else rules):
+        if kind == "sort":
+            text = _sort_blocks(text, a, b)
+        else:
+            text = a.sub(b, text)
+    return text
+
+
+def normalized_sha256(text: str, rules: list[dict] | None = None) -> str:
+    """SHA-256 of text after volatile-fragment normalization."""
+    return sha256(normalize_for_hash(text, rules))
+
+
+def effective_normalized_hash(row, rules: list[dict] | None = None) -> str | None:
+    """Normalized hash of a snapshot row under the given rules.
+
+    Uses the stored value when it was computed under the same rule set and
+    falls back to re-normalizing the stored content otherwise.
+    """
+    rules = get_normalize_rules() if rules is None else rules
+    if not row["content"]:
+        return None
+    if row["normalized_hash"] and row["normalize_rules"] == normalize_rules_fingerprint(rules):
+        return row["normalized_hash"]
+    return normalized_sha256(row["content"], rules)
+
+
 def parse_index(content: str) -> list[str]:
     """Extract markdown page URLs from llms.txt content.
 
@@ -290,18 +816,272 @@ def is_html_diff(diff_text: str) -> bool:
     return html_count / len(changed) > 0.5
 
 
-def compute_diff(old_content: str, new_content: str, url: str) -> str:
-    """Compute unified diff between two versions."""
+def compute_diff(old_content: str, new_content: str, url: str, from_url: str | None = None) -> str:
+    """Compute unified diff between two versions (from_url labels the old side of a move)."""
     old_lines = normalize(old_content).splitlines(keepends=True)
     new_lines = normalize(new_content).splitlines(keepends=True)
     diff_lines = unified_diff(
         old_lines, new_lines,
-        fromfile=f"a/{url}", tofile=f"b/{url}",
+        fromfile=f"a/{from_url or url}", tofile=f"b/{url}",
         lineterm="\n",
     )
     return "".join(diff_lines)
 
 
+def split_hunks(diff_text: str) -> tuple[str, list[str]]:
+    """Split a unified diff into its file header and a list of hunks (each starting with @@)."""
+    header = []
+    hunks: list[list[str]] = []
+    for line in diff_text.splitlines(keepends=True):
+        if line.startswith("@@"):
+            hunks.append([line])
+        elif hunks:
+            hunks[-1].append(line)
+        else:
+            header.append(line)
+    return "".join(header), ["".join(h) for h in hunks]
+
+
+def hunk_key(hunk: str) -> str | None:
+    """Hash of a hunk's added/removed lines with whitespace collapsed.
+
+    Line numbers and context lines are ignored, so the same edit to a shared
+    snippet hashes identically on every page it appears on.
+    """
+    changed = [line[0] + " ".join(line[1:].split())
+               for line in hunk.splitlines()[1:]
+               if line.startswith(("+", "-"))]
+    if not changed:
+        return None
+    return sha256("\n".join(changed))
+
+
+def group_shared_hunks(changes: list[dict], min_pages: int = 2) -> list[dict]:
+    """Group hunks that appear identically on several changed pages.
+
+    Returns one group per shared hunk: ``{"id": "shared:N", "hunk", "urls"}``.
+    Each change dict gains ``shared_ids`` (groups it belongs to) and
+    ``residual_diff`` (its diff without the shared hunks, "" if nothing is left).
+    """
+    seen: dict[str, dict] = {}
+    split = []
+    for ch in changes:
+        header, hunks = split_hunks(ch["diff"] or "")
+        keys = [hunk_key(h) for h in hunks]
+        split.append((header, hunks, keys))
+        for h, k in zip(hunks, keys):
+            if k is None:
+                continue
+            group = seen.setdefault(k, {"hunk": h, "urls": []})
+            if ch["url"] not in group["urls"]:
+                group["urls"].append(ch["url"])
+
+    shared = {}
+    groups = []
+    for k, group in seen.items():
+        if len(group["urls"]) >= min_pages:
+            group["id"] = f"shared:{len(groups) + 1}"
+            shared[k] = group["id"]
+            groups.append(group)
+
+    for ch, (header, hunks, keys) in zip(changes, split):
+        if not hunks:
+            ch["shared_ids"] = []
+            ch["residual_diff"] = ch["diff"]
+            continue
+        ids = [shared[k] for k in keys if k in shared]
+        ch["shared_ids"] = list(dict.fromkeys(ids))
+        rest = [h for h, k in zip(hunks, keys) if k not in shared]
+        ch["residual_diff"] = header + "".join(rest) if rest else ""
+    return groups
+
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MINHASH_SEEDS = [(random.Random(i).randrange(1, _MERSENNE_PRIME), random.Random(-i - 1).randrange(_MERSENNE_PRIME))
+                  for i in range(MINHASH_PERMUTATIONS)]
+
+
+def _shingles(text: str, k: int = 5) -> set[int]:
+    """Hashed k-word shingles of text (case- and punctuation-insensitive)."""
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < k:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + k]).encode("utf-8")) for i in range(len(words) - k + 1)}
+
+
+def minhash_signature(text: str) -> tuple[int, ...] | None:
+    """MinHash signature of text's shingle set, or None for empty text."""
+    shingles = _shingles(text)
+    if not shingles:
+        return None
+    return tuple(min((a * x + b) % _MERSENNE_PRIME for x in shingles) for a, b in _MINHASH_SEEDS)
+
+
+def signature_similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class MinHashLSH:
+    """Banded locality-sensitive index over MinHash signatures.
+
+    Each signature is split into LSH_BANDS bands; keys that share any band
+    land in the same bucket, so a query only compares against near neighbours
+    instead of every indexed item.
+    """
+
+    def __init__(self, bands: int = LSH_BANDS):
+        self.bands = bands
+        self.rows = MINHASH_PERMUTATIONS // bands
+        self.buckets: dict[tuple, list] = {}
+        self.signatures: dict = {}
+
+    def _band_keys(self, sig: tuple[int, ...]):
+        for i in range(self.bands):
+            yield (i,) + sig[i * self.rows:(i + 1) * self.rows]
+
+    def add(self, key, sig: tuple[int, ...]):
+        self.signatures[key] = sig
+        for band in self._band_keys(sig):
+            self.buckets.setdefault(band, []).append(key)
+
+    def query(self, sig: tuple[int, ...], threshold: float = MOVE_SIMILARITY) -> list[tuple[float, object]]:
+        """Return (similarity, key) for indexed items at or above threshold, best first."""
+        candidates = set()
+        for band in self._band_keys(sig):
+            candidates.update(self.buckets.get(band, ()))
+        scored = [(signature_similarity(sig, self.signatures[k]), k) for k in candidates]
+        return sorted((s, k) for s, k in scored if s >= threshold)[::-1]
+
+
+def split_sections(content: str) -> list[tuple[str, str]]:
+    """Split markdown into (heading, body) sections at heading lines."""
+    sections = []
+    heading, body = "", []
+    in_fence = False
+    for line in normalize(content).split("\n"):
+        if line.startswith("```"):
+            in_fence = not in_fence
+        if not in_fence and re.match(r"#{1,6} ", line):
+            if body or heading:
+                sections.append((heading, "\n".join(body)))
+            heading, body = line.strip(), []
+        else:
+            body.append(line)
+    if body or heading:
+        sections.append((heading, "\n".join(body)))
+    return sections
+
+
+def _match_best(index: MinHashLSH, queries: list[tuple[object, tuple[int, ...]]],
+                allowed=lambda src, dst: True) -> list[tuple[object, object, float]]:
+    """Greedy one-to-one matching of query items onto indexed items by similarity."""
+    pairs = []
+    for qkey, sig in queries:
+        for sim, ikey in index.query(sig):
+            if allowed(ikey, qkey):
+                pairs.append((sim, ikey, qkey))
+    used_src, used_dst, matched = set(), set(), []
+    for sim, ikey, qkey in sorted(pairs, key=lambda p: -p[0]):
+        if ikey in used_src or qkey in used_dst:
+            continue
+        used_src.add(ikey)
+        used_dst.add(qkey)
+        matched.append((ikey, qkey, sim))
+    return matched
+
+
+def detect_moves(pairs: list[tuple[str, str, str]], removed_pages: dict[str, str],
+                 added_pages: dict[str, str]) -> tuple[list[dict], list[dict]]:
+    """Find renamed pages and sections that moved between pages.
+
+    ``pairs`` is (url, old_content, new_content) for pages changed in place;
+    ``removed_pages``/``added_pages`` map URLs dropped from / new to the index
+    to their last / first content. Returns (page_moves, section_moves):
+    page moves are ``{"from", "to", "similarity"}``, section moves add
+    ``"section"`` (the heading). Both use MinHash LSH, so cost grows with the
+    number of changed items rather than their pairwise product.
+    """
+    page_index = MinHashLSH()
+    for url, content in removed_pages.items():
+        sig = minhash_signature(content)
+        if sig:
+            page_index.add(url, sig)
+    queries = [(url, sig) for url, sig in ((u, minhash_signature(c)) for u, c in added_pages.items()) if sig]
+    page_moves = [{"from": src, "to": dst, "similarity": round(sim, 2)}
+                  for src, dst, sim in _match_best(page_index, queries)]
+    moved_from = {m["from"] for m in page_moves}
+    moved_to = {m["to"] for m in page_moves}
+
+    # Sections that disappeared from one page and appeared on another
+    gone, new = [], []
+    for url, old, cur in pairs:
+        old_secs, new_secs = split_sections(old), split_sections(cur)
+        old_keys, new_keys = set(old_secs), set(new_secs)
+        gone += [(url, sec) for sec in old_secs if sec not in new_keys]
+        new += [(url, sec) for sec in new_secs if sec not in old_keys]
+    gone += [(url, sec) for url, c in removed_pages.items() if url not in moved_from for sec in split_sections(c)]
+    new += [(url, sec) for url, c in added_pages.items() if url not in moved_to for sec in split_sections(c)]
+
+    section_index = MinHashLSH()
+    for i, (url, (heading, body)) in enumerate(gone):
+        if len(body.split()) >= MIN_SECTION_WORDS:
+            section_index.add(i, minhash_signature(body))
+    section_queries = [(j, minhash_signature(body)) for j, (url, (heading, body)) in enumerate(new)
+                       if len(body.split()) >= MIN_SECTION_WORDS]
+    section_moves = [
+        {"section": new[j][1][0] or "(page intro)", "from": gone[i][0], "to": new[j][0],
+         "similarity": round(sim, 2)}
+        for i, j, sim in _match_best(section_index, section_queries,
+                                     allowed=lambda i, j: gone[i][0] != new[j][0])
+    ]
+    return page_moves, section_moves
+
+
+def apply_moves(changes: list[dict], pairs: list[tuple[str, str, str]],
+                added: list[str], removed: list[str],
+                old_contents: dict[str, str], new_contents: dict[str, str]):
+    """Turn matching removed/added pages into moves and diff them against each other.
+
+    Appends a change (with ``moved_from``) for every moved page whose content
+    also changed. Returns (added, removed, moved, section_moves) with moved
+    pages taken out of the added/removed lists.
+    """
+    removed_pages = {u: old_contents[u] for u in removed if old_contents.get(u)}
+    added_pages = {u: new_contents[u] for u in added if new_contents.get(u)}
+    moved, section_moves = detect_moves(pairs, removed_pages, added_pages)
+    for mv in moved:
+        diff_text = compute_diff(removed_pages[mv["from"]], added_pages[mv["to"]], mv["to"],
+                                 from_url=mv["from"])
+        if diff_text:
+            changes.append({"url": mv["to"], "diff": diff_text, "moved_from": mv["from"],
+                            "old_hash": sha256(removed_pages[mv["from"]]),
+                            "new_hash": sha256(added_pages[mv["to"]]),
+                            "old_normalized_hash": normalized_sha256(removed_pages[mv["from"]]),
+                            "new_normalized_hash": normalized_sha256(added_pages[mv["to"]])})
+    moved_from = {mv["from"] for mv in moved}
+    moved_to = {mv["to"] for mv in moved}
+    return ([u for u in added if u not in moved_to], [u for u in removed if u not in moved_from],
+            moved, section_moves)
+
+
+def carry_line_provenance(first_seen: list[str], old_content: str, new_content: str,
+                          run_at: str) -> list[str]:
+    """Map per-line first-seen runs from old_content onto new_content.
+
+    Unchanged lines keep their run; inserted or rewritten lines get ``run_at``.
+    """
+    old_lines = normalize(old_content).splitlines()
+    new_lines = normalize(new_content).splitlines()
+    out: list[str] = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes():
+        if tag == "equal":
+            out.extend(first_seen[i1:i2])
+        else:
+            out.extend([run_at] * (j2 - j1))
+    return out
+
+
 # ── HTTP Layer ──────────────────────────────────────────────────────────────
 
 async def fetch_url(client: httpx.AsyncClient, url: str, semaphore: asyncio.Semaphore,
@@ -369,8 +1149,11 @@ def print_plain(msg: str):
 
 
 def print_summary(changes: list[dict], added_urls: list[str], removed_urls: list[str],
-                  errors: list[dict], total: int, first_run: bool, quiet: bool):
+                  errors: list[dict], total: int, first_run: bool, quiet: bool,
+                  moved: list[dict] | None = None, flaps: list[dict] | None = None):
     """Print summary report."""
+    moved = moved or []
+    flaps = flaps or []
     if first_run:
         if HAS_RICH:
             console.print(Panel(
@@ -390,6 +1173,7 @@ def print_summary(changes: list[dict], added_urls: list[str], removed_urls: list
         table.add_row("Changed", f"[yellow]{len(changes)}[/yellow]" if changes else "0")
         table.add_row("Added", f"[green]{len(added_urls)}[/green]" if added_urls else "0")
         table.add_row("Removed", f"[red]{len(removed_urls)}[/red]" if removed_urls else "0")
+        table.add_row("Moved", f"[cyan]{len(moved)}[/cyan]" if moved else "0")
         table.add_row("Errors", f"[red]{len(errors)}[/red]" if errors else "0")
         console.print(table)
     else:
@@ -398,6 +1182,7 @@ def print_summary(changes: list[dict], added_urls: list[str], removed_urls: list
         print(f"Changed:     {len(changes)}")
         print(f"Added:       {len(added_urls)}")
         print(f"Removed:     {len(removed_urls)}")
+        print(f"Moved:       {len(moved)}")
         print(f"Errors:      {len(errors)}")
 
     if added_urls:
@@ -420,6 +1205,26 @@ def print_summary(changes: list[dict], added_urls: list[str], removed_urls: list
             for u in removed_urls:
                 print(f"  - {u}")
 
+    if moved:
+        if HAS_RICH:
+            console.print("\n[bold cyan]Moved pages:[/bold cyan]")
+            for mv in moved:
+                console.print(f"  {mv['from']} → {mv['to']}")
+        else:
+            print("\nMoved pages:")
+            for mv in moved:
+                print(f"  {mv['from']} → {mv['to']}")
+
+    if flaps:
+        if HAS_RICH:
+            console.print("\n[bold yellow]Reverted to a recent version (held out of the digest):[/bold yellow]")
+            for fl in flaps:
+                console.print(f"  ↺ {fl['url']} (flip {fl['flips']})")
+        else:
+            print("\nReverted to a recent version (held out of the digest):")
+            for fl in flaps:
+                print(f"  ↺ {fl['url']} (flip {fl['flips']})")
+
     if errors:
         if HAS_RICH:
             console.print("\n[bold red]Errors:[/bold red]")
@@ -449,50 +1254,367 @@ def print_diffs(changes: list[dict], quiet: bool):
             print(diff_text)
 
 
-def generate_md_report(report_data: dict, output_dir: Path):
-    """Write a Markdown report to output_dir/report.md."""
+def _md_fenced_diff(diff_text: str, artifact: str | None = None) -> list[str]:
+    return ["```diff", diff_text, "```"]
+
+
+def _md_diff_units(report_data: dict, heading: str,
+                   render=_md_fenced_diff) -> Iterator[tuple[str, list[str]]]:
+    """Yield a run's diffs as (id, markdown lines) units: each shared hunk once, then per-page remainders.
+
+    The id is the shared group id ("shared:1") or the page URL. ``render``
+    turns (diff text, artifact stem or None) into the lines under each heading;
+    units are rendered one at a time, as they are consumed.
+    """
+    for group in report_data.get("shared", []):
+        lines = [f"{heading} {group['id']}\n",
+                 f"Same change on {len(group['urls'])} pages:\n"]
+        for url in group["urls"]:
+            lines.append(f"- {url}")
+        lines.append("")
+        lines.extend(render(group["hunk"], group.get("artifact")))
+        yield group["id"], lines
+    for ch in report_data["changes"]:
+        diff_text = ch.get("residual_diff", ch["diff"])
+        if not diff_text:
+            continue
+        lines = [f"{heading} {ch['url']}\n"]
+        if ch.get("moved_from"):
+            lines.append(f"*Moved from {ch['moved_from']}*\n")
+        if ch.get("settled_flips"):
+            lines.append(f"*Settled after {ch['settled_flips']} flip(s)*\n")
+        if ch.get("shared_ids"):
+            lines.append(f"*Also part of {', '.join(ch['shared_ids'])}*\n")
+        lines.extend(render(diff_text, ch.get("artifact")))
+        yield ch["url"], lines
+
+
+def _md_diff_blocks(report_data: dict, heading: str, render=_md_fenced_diff) -> list[str]:
+    """Markdown lines for a run's diffs: each shared hunk once, then per-page remainders."""
+    return [line for _, lines in _md_diff_units(report_data, heading, render) for line in lines]
+
+
+def _md_move_lines(report_data: dict, heading: str) -> list[str]:
+    """Markdown lines for a run's moved pages and moved sections."""
+    lines = []
+    if report_data.get("moved"):
+        lines.append(f"\n{heading} Moved Pages\n")
+        for mv in report_data["moved"]:
+            lines.append(f"- {mv['from']} → {mv['to']} (similarity {mv['similarity']:.2f})")
+    if report_data.get("section_moves"):
+        lines.append(f"\n{heading} Moved Sections\n")
+        for mv in report_data["section_moves"]:
+            lines.append(f"- `{mv['section']}`: {mv['from']} → {mv['to']} (similarity {mv['similarity']:.2f})")
+    return lines
+
+
+def _md_flap_lines(report_data: dict, heading: str) -> list[str]:
+    """Markdown lines for a run's reverted (flapping) pages."""
+    lines = []
+    if report_data.get("flaps"):
+        lines.append(f"\n{heading} Reverted Pages\n")
+        lines.append(f"*Back to a recent version; diffed once stable for {FLAP_STABLE_RUNS} runs.*\n")
+        for fl in report_data["flaps"]:
+            lines.append(f"- {fl['url']} (flip {fl['flips']})")
+    return lines
+
+
+def diff_stats(diff_text: str) -> tuple[int, int, int]:
+    """Return (hunks, added lines, removed lines) for a unified diff."""
+    hunks = added = removed = 0
+    for line in diff_text.splitlines():
+        if line.startswith("@@"):
+            hunks += 1
+        elif line.startswith("+") and not line.startswith("+++"):
+            added += 1
+        elif line.startswith("-") and not line.startswith("---"):
+            removed += 1
+    return hunks, added, removed
+
+
+def _stats_label(diff_text: str) -> str:
+    hunks, added, removed = diff_stats(diff_text)
+    return f"{hunks} hunk{'s' if hunks != 1 else ''}, +{added} −{removed}"
+
+
+def truncate_diff(diff_text: str, max_bytes: int) -> tuple[str, bool]:
+    """Cut a diff at the last whole line within max_bytes. Returns (text, truncated)."""
+    data = diff_text.encode("utf-8")
+    if max_bytes <= 0 or len(data) <= max_bytes:
+        return diff_text, False
+    cut = data[:max_bytes]
+    nl = cut.rfind(b"\n")
+    if nl > 0:
+        cut = cut[:nl]
+    return cut.decode("utf-8", errors="ignore"), True
+
+
+def _diff_artifact_name(url: str) -> str:
+    # The hash keeps "a/b" and "a_b" apart once the path is flattened
+    return f"{url_to_filename(url).removesuffix('.md').replace('/', '_')}-{sha256(url)[:8]}"
+
+
+def write_diff_artifacts(report_data: dict, output_dir: Path, max_diff_bytes: int = MAX_DIFF_BYTES):
+    """Write each diff of a run to output_dir/diffs/<name>.diff (full) and .html (rendered, capped).
+
+    Sets ``artifact`` (the shared file stem) on every shared group and change
+    that has a diff, and removes artifacts left over from earlier runs.
+    """
+    diff_dir = output_dir / REPORT_DIFFS_DIRNAME
+    diff_dir.mkdir(parents=True, exist_ok=True)
+    written = set()
+
+    def write(name: str, title: str, diff_text: str):
+        (diff_dir / f"{name}.diff").write_text(diff_text, encoding="utf-8")
+        shown, truncated = truncate_diff(diff_text, max_diff_bytes)
+        with open(diff_dir / f"{name}.html", "w", encoding="utf-8") as f:
+            f.write("<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+                    f"<title>{_esc_html(title)}</title>\n<style>\n{_HTML_CSS}\n"
+                    "body { max-width: none; margin: 0; }\n</style>\n</head>\n<body>\n")
+            f.write(_render_diff_html(shown))
+            if truncated:
+                f.write(f'\n<p class="ts">Truncated at {max_diff_bytes:,} bytes — '
+                        f'<a href="{name}.diff" target="_blank">full diff</a></p>')
+            f.write("\n</body>\n</html>\n")
+        written.update({f"{name}.diff", f"{name}.html"})
+
+    for group in report_data.get("shared", []):
+        group["artifact"] = group["id"].replace(":", "-")
+        write(group["artifact"], group["id"], group["hunk"])
+    for ch in report_data["changes"]:
+        diff_text = ch.get("residual_diff", ch["diff"])
+        if not diff_text:
+            continue
+        ch["artifact"] = _diff_artifact_name(ch["url"])
+        write(ch["artifact"], ch["url"], diff_text)
+
+    for p in diff_dir.iterdir():
+        if p.name not in written:
+            p.unlink()
+
+
+def _run_artifact(report_data: dict) -> dict:
+    """The JSON-serializable structured results of a run."""
+    return {
+        "timestamp": report_data["timestamp"],
+        "first_run": report_data["first_run"],
+        "total": report_data["total"],
+        "changes": [
+            {k: ch[k] for k in ("url", "diff", "residual_diff", "shared_ids", "moved_from",
+                                "settled_flips", "old_hash", "new_hash", "old_normalized_hash",
+                                "new_normalized_hash", "artifact")
+             if ch.get(k) is not None}
+            for ch in report_data["changes"]
+        ],
+        "shared": [{k: g[k] for k in ("id", "hunk", "urls")} for g in report_data.get("shared", [])],
+        "added": report_data["added"],
+        "removed": report_data["removed"],
+        "moved": report_data.get("moved", []),
+        "section_moves": report_data.get("section_moves", []),
+        "flaps": report_data.get("flaps", []),
+        "errors": [{"url": e["url"], "error": e["error"]} for e in report_data["errors"]],
+    }
+
+
+def _write_json_atomic(path: Path, data, indent: int | None = 1) -> bytes:
+    """Write JSON through a temp file and rename, so readers never see a partial file."""
+    payload = json.dumps(data, indent=indent).encode("utf-8")
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+    return payload
+
+
+def write_run_artifact(report_data: dict, output_dir: Path):
+    """Write the run's structured results to output_dir/run.json — the check → digest handoff.
+
+    Holds everything digest and --gh-issue need (full diffs, shared hunks,
+    index changes, moves, reverts, errors), so they never parse report.md.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
-    lines = [
-        "# Claude Docs Monitor Report",
-        f"\n*Generated: {report_data['timestamp']}*\n",
+    _write_json_atomic(output_dir / RUN_ARTIFACT, _run_artifact(report_data))
+
+
+def _run_id(timestamp: str) -> str:
+    """Compact, sortable run id from a "YYYY-MM-DD HH:MM:SS UTC" timestamp."""
+    return datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S UTC").strftime("%Y%m%dT%H%M%SZ")
+
+
+def _atom_feed(entries: list[dict], updated: str) -> str:
+    """Render manifest entries (newest first) as an Atom feed linking each run's shard."""
+    out = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        '<feed xmlns="http://www.w3.org/2005/Atom">',
+        "<title>Claude Docs Monitor changes</title>",
+        "<id>urn:claude-docs-monitor:changes</id>",
+        f"<updated>{updated}</updated>",
+        '<link rel="self" href="feed.atom"/>',
+        '<link rel="alternate" type="application/json" href="index.json"/>',
     ]
+    for e in entries:
+        counts = ", ".join(f"{e[k]} {k}" for k in ("changed", "added", "removed", "moved") if e[k])
+        pages = "\n".join(e["pages"]) + ("\n…" if e["pages_truncated"] else "")
+        out.extend([
+            "<entry>",
+            f"<title>{xml_escape(e['timestamp'])}: {xml_escape(counts or 'no changes')}</title>",
+            f"<id>urn:claude-docs-monitor:run:{e['id']}</id>",
+            f"<updated>{e['updated']}</updated>",
+            f'<link rel="alternate" type="application/json" href="{e["href"]}"/>',
+            f"<summary>{xml_escape(pages)}</summary>",
+            "</entry>",
+        ])
+    out.append("</feed>")
+    return "\n".join(out) + "\n"
+
+
+def publish_change_feed(report_data: dict, output_dir: Path) -> str | None:
+    """Publish a run to the static change feed under output_dir/changes/.
+
+    - ``<run-id>.json``: the run's structured results; written once, never changed
+    - ``index.json``: manifest of the newest FEED_MANIFEST_RUNS runs (id, href,
+      sha256, counts), newest first, plus the list of archive pages
+    - ``archive-NNNN.json``: older manifest entries, FEED_MANIFEST_RUNS per page;
+      full pages never change
+    - ``feed.atom``: the newest FEED_ATOM_ENTRIES runs
+
+    Every write touches a bounded number of entries, so publishing costs the
+    same however long the history. Runs with nothing to report (and the
+    baseline run) are not published. Returns the run id, or None.
+    """
+    if report_data["first_run"] or not (report_data["changes"] or report_data["added"]
+                                        or report_data["removed"] or report_data.get("moved")):
+        return None
 
-    if report_data["first_run"]:
-        lines.append(f"**First run: {report_data['total']} pages snapshotted.**\n")
-        for url in report_data["urls"]:
-            lines.append(f"- {url}")
-    else:
-        lines.append("| Metric | Count |")
-        lines.append("|--------|------:|")
-        lines.append(f"| Changed | {len(report_data['changes'])} |")
-        lines.append(f"| Added | {len(report_data['added'])} |")
-        lines.append(f"| Removed | {len(report_data['removed'])} |")
-        lines.append(f"| Errors | {len(report_data['errors'])} |")
+    feed_dir = output_dir / FEED_DIRNAME
+    feed_dir.mkdir(parents=True, exist_ok=True)
+    run_id = _run_id(report_data["timestamp"])
+    shard = feed_dir / f"{run_id}.json"
+    if shard.exists():
+        return run_id  # already published; shards are immutable
+    payload = _write_json_atomic(shard, _run_artifact(report_data))
+
+    pages = [ch["url"] for ch in report_data["changes"]] + report_data["added"] + report_data["removed"]
+    updated = datetime.strptime(report_data["timestamp"], "%Y-%m-%d %H:%M:%S UTC").strftime("%Y-%m-%dT%H:%M:%SZ")
+    entry = {
+        "id": run_id,
+        "timestamp": report_data["timestamp"],
+        "updated": updated,
+        "href": shard.name,
+        "sha256": hashlib.sha256(payload).hexdigest(),
+        "bytes": len(payload),
+        "changed": len(report_data["changes"]),
+        "added": len(report_data["added"]),
+        "removed": len(report_data["removed"]),
+        "moved": len(report_data.get("moved", [])),
+        "pages": pages[:20],
+        "pages_truncated": len(pages) > 20,
+    }
+
+    index_path = feed_dir / "index.json"
+    manifest = (json.loads(index_path.read_text(encoding="utf-8")) if index_path.exists()
+                else {"version": 1, "runs": [], "archives": []})
+    manifest["runs"].insert(0, entry)
+
+    # Entries past the window move to the newest archive page (newest first there too)
+    overflow = manifest["runs"][FEED_MANIFEST_RUNS:]
+    del manifest["runs"][FEED_MANIFEST_RUNS:]
+    for old in reversed(overflow):
+        archives = manifest["archives"]
+        page = None
+        if archives:
+            page = json.loads((feed_dir / archives[0]).read_text(encoding="utf-8"))
+            if len(page["runs"]) >= FEED_MANIFEST_RUNS:
+                page = None
+        if page is None:
+            name = f"archive-{len(archives) + 1:04d}.json"
+            archives.insert(0, name)
+            page = {"version": 1, "runs": []}
+        page["runs"].insert(0, old)
+        _write_json_atomic(feed_dir / archives[0], page)
+
+    manifest["updated"] = updated
+    _write_json_atomic(index_path, manifest)
+    atom = feed_dir / "feed.atom"
+    tmp = atom.with_name(atom.name + ".tmp")
+    tmp.write_text(_atom_feed(manifest["runs"][:FEED_ATOM_ENTRIES], updated), encoding="utf-8")
+    os.replace(tmp, atom)
+    return run_id
+
+
+def load_run_artifact(output_dir: Path) -> dict | None:
+    """Load output_dir/run.json written by the last check, or None if there isn't one."""
+    path = output_dir / RUN_ARTIFACT
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _md_report_diff_lines(report_data: dict, max_diff_bytes: int) -> Iterator[str]:
+    """Yield report.md diff lines one unit at a time: _md_diff_units with stats, a link to
+    the full artifact and a size cap."""
+    def block(diff_text: str, artifact: str | None) -> list[str]:
+        link = f"{REPORT_DIFFS_DIRNAME}/{artifact}.diff" if artifact else None
+        shown, truncated = truncate_diff(diff_text, max_diff_bytes)
+        lines = [f"*{_stats_label(diff_text)}*" + (f" — [full diff]({link})" if link else "") + "\n",
+                 *_md_fenced_diff(shown)]
+        if truncated:
+            lines.append(f"\n*Truncated at {max_diff_bytes:,} bytes; see [{link}]({link}).*\n")
+        return lines
+
+    for _, lines in _md_diff_units(report_data, "###", block):
+        yield from lines
+
+
+def generate_md_report(report_data: dict, output_dir: Path, max_diff_bytes: int = MAX_DIFF_BYTES):
+    """Write a Markdown report to output_dir/report.md, streaming it line by line.
+
+    Diffs over max_diff_bytes are truncated, linking to the full diff written
+    by write_diff_artifacts().
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / "report.md", "w", encoding="utf-8") as f:
+        def out(line: str = ""):
+            f.write(line + "\n")
+
+        out("# Claude Docs Monitor Report")
+        out(f"\n*Generated: {report_data['timestamp']}*\n")
+
+        if report_data["first_run"]:
+            out(f"**First run: {report_data['total']} pages snapshotted.**\n")
+            for url in report_data["urls"]:
+                out(f"- {url}")
+            return
+
+        out("| Metric | Count |")
+        out("|--------|------:|")
+        out(f"| Changed | {len(report_data['changes'])} |")
+        out(f"| Added | {len(report_data['added'])} |")
+        out(f"| Removed | {len(report_data['removed'])} |")
+        out(f"| Moved | {len(report_data.get('moved', []))} |")
+        out(f"| Errors | {len(report_data['errors'])} |")
 
         if report_data["added"]:
-            lines.append("\n## Added Pages\n")
+            out("\n## Added Pages\n")
             for url in report_data["added"]:
-                lines.append(f"- {url}")
+                out(f"- {url}")
 
         if report_data["removed"]:
-            lines.append("\n## Removed Pages\n")
+            out("\n## Removed Pages\n")
             for url in report_data["removed"]:
-                lines.append(f"- {url}")
+                out(f"- {url}")
+
+        for line in _md_move_lines(report_data, "##") + _md_flap_lines(report_data, "##"):
+            out(line)
 
         if report_data["errors"]:
-            lines.append("\n## Errors\n")
+            out("\n## Errors\n")
             for e in report_data["errors"]:
-                lines.append(f"- **{e['url']}**: {e['error']}")
+                out(f"- **{e['url']}**: {e['error']}")
 
         if report_data["changes"]:
-            lines.append("\n## Diffs\n")
-            for ch in report_data["changes"]:
-                lines.append(f"### {ch['url']}\n")
-                lines.append("```diff")
-                lines.append(ch["diff"])
-                lines.append("```")
-
-    (output_dir / "report.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+            out("\n## Diffs\n")
+            for line in _md_report_diff_lines(report_data, max_diff_bytes):
+                out(line)
 
 
 _HTML_CSS = """\
@@ -520,7 +1642,10 @@ hr { border: none; border-top: 2px solid #e1e4e8; margin: 2em 0; }
 .diff-line.ctx { background: #ffffff; color: #57606a; }
 .diff-header { background: #f6f8fa; padding: 8px 10px; font-family: "SFMono-Regular", Consolas,
                "Liberation Mono", Menlo, monospace; font-size: .85em; font-weight: 600;
-               border-bottom: 1px solid #d0d7de; color: #24292e; }"""
+               border-bottom: 1px solid #d0d7de; color: #24292e; }
+details.lazy-diff { border: 1px solid #d0d7de; border-radius: 6px; margin: .6em 0; }
+details.lazy-diff > summary { padding: 6px 10px; cursor: pointer; background: #f6f8fa; }
+details.lazy-diff iframe { width: 100%; height: 60vh; border: 0; border-top: 1px solid #d0d7de; }"""
 
 
 def _esc_html(text: str) -> str:
@@ -547,60 +1672,149 @@ def _render_diff_html(diff_text: str) -> str:
     return "\n".join(parts)
 
 
-def generate_html_report(report_data: dict, output_dir: Path):
-    """Write a self-contained HTML report to output_dir/report.html."""
-    output_dir.mkdir(parents=True, exist_ok=True)
+def _html_inline_diff(title: str, diff_text: str, artifact: str | None = None) -> str:
+    return _render_diff_html(diff_text)
 
-    body_parts = [
-        "<h1>Claude Docs Monitor Report</h1>",
-        f'<p class="ts">{_esc_html(report_data["timestamp"])}</p>',
-    ]
 
-    if report_data["first_run"]:
-        body_parts.append(f"<p><strong>First run: {report_data['total']} pages snapshotted.</strong></p>")
-        body_parts.append("<ul>")
-        for url in report_data["urls"]:
-            body_parts.append(f"<li>{_esc_html(url)}</li>")
-        body_parts.append("</ul>")
-    else:
-        body_parts.append("<table><tr><th>Metric</th><th>Count</th></tr>")
-        body_parts.append(f"<tr><td>Changed</td><td>{len(report_data['changes'])}</td></tr>")
-        body_parts.append(f"<tr><td>Added</td><td>{len(report_data['added'])}</td></tr>")
-        body_parts.append(f"<tr><td>Removed</td><td>{len(report_data['removed'])}</td></tr>")
-        body_parts.append(f"<tr><td>Errors</td><td>{len(report_data['errors'])}</td></tr>")
-        body_parts.append("</table>")
+def _html_diff_blocks(report_data: dict, tag: str, render=_html_inline_diff) -> list[str]:
+    """HTML parts for a run's diffs: each shared hunk once, then per-page remainders.
 
-        if report_data["added"]:
-            body_parts.append("<h2>Added Pages</h2><ul>")
-            for url in report_data["added"]:
-                body_parts.append(f"<li>{_esc_html(url)}</li>")
-            body_parts.append("</ul>")
+    ``render`` turns (title, diff text, artifact stem or None) into the diff's HTML.
+    """
+    parts = []
+    for group in report_data.get("shared", []):
+        parts.append(f"<{tag}>{_esc_html(group['id'])} — same change on "
+                     f"{len(group['urls'])} pages</{tag}><ul>")
+        for url in group["urls"]:
+            parts.append(f"<li>{_esc_html(url)}</li>")
+        parts.append("</ul>")
+        parts.append(render(group["id"], group["hunk"], group.get("artifact")))
+    for ch in report_data["changes"]:
+        diff_text = ch.get("residual_diff", ch["diff"])
+        if not diff_text:
+            continue
+        parts.append(f"<{tag}>{_esc_html(ch['url'])}</{tag}>")
+        if ch.get("moved_from"):
+            parts.append(f'<p class="ts">Moved from {_esc_html(ch["moved_from"])}</p>')
+        if ch.get("settled_flips"):
+            parts.append(f'<p class="ts">Settled after {ch["settled_flips"]} flip(s)</p>')
+        if ch.get("shared_ids"):
+            parts.append(f'<p class="ts">Also part of {_esc_html(", ".join(ch["shared_ids"]))}</p>')
+        parts.append(render(ch["url"], diff_text, ch.get("artifact")))
+    return parts
+
+
+def _html_move_parts(report_data: dict, tag: str) -> list[str]:
+    """HTML parts for a run's moved pages and moved sections."""
+    parts = []
+    if report_data.get("moved"):
+        parts.append(f"<{tag}>Moved Pages</{tag}><ul>")
+        for mv in report_data["moved"]:
+            parts.append(f"<li>{_esc_html(mv['from'])} → {_esc_html(mv['to'])} "
+                         f"(similarity {mv['similarity']:.2f})</li>")
+        parts.append("</ul>")
+    if report_data.get("section_moves"):
+        parts.append(f"<{tag}>Moved Sections</{tag}><ul>")
+        for mv in report_data["section_moves"]:
+            parts.append(f"<li><code>{_esc_html(mv['section'])}</code>: {_esc_html(mv['from'])} → "
+                         f"{_esc_html(mv['to'])} (similarity {mv['similarity']:.2f})</li>")
+        parts.append("</ul>")
+    return parts
+
+
+def _html_flap_parts(report_data: dict, tag: str) -> list[str]:
+    """HTML parts for a run's reverted (flapping) pages."""
+    parts = []
+    if report_data.get("flaps"):
+        parts.append(f"<{tag}>Reverted Pages</{tag}>")
+        parts.append(f'<p class="ts">Back to a recent version; diffed once stable for '
+                     f'{FLAP_STABLE_RUNS} runs.</p><ul>')
+        for fl in report_data["flaps"]:
+            parts.append(f"<li>{_esc_html(fl['url'])} (flip {fl['flips']})</li>")
+        parts.append("</ul>")
+    return parts
 
-        if report_data["removed"]:
-            body_parts.append("<h2>Removed Pages</h2><ul>")
-            for url in report_data["removed"]:
-                body_parts.append(f"<li>{_esc_html(url)}</li>")
-            body_parts.append("</ul>")
 
-        if report_data["errors"]:
-            body_parts.append("<h2>Errors</h2><ul>")
-            for e in report_data["errors"]:
-                body_parts.append(f"<li><strong>{_esc_html(e['url'])}</strong>: {_esc_html(e['error'])}</li>")
-            body_parts.append("</ul>")
+# Loads a diff's iframe the first time its <details> is opened (works from file:// too)
+_LAZY_DIFF_SCRIPT = """\
+document.querySelectorAll("details[data-src]").forEach(function (d) {
+  d.addEventListener("toggle", function () {
+    var f = d.querySelector("iframe");
+    if (d.open && !f.getAttribute("src")) f.setAttribute("src", d.dataset.src);
+  });
+});"""
 
-        if report_data["changes"]:
-            body_parts.append("<h2>Diffs</h2>")
-            for ch in report_data["changes"]:
-                body_parts.append(f"<h3>{_esc_html(ch['url'])}</h3>")
-                body_parts.append(_render_diff_html(ch["diff"]))
 
-    html = (
-        "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
-        "<meta name=\"viewport\" content=\"width=device-width,initial-scale=1\">\n"
-        f"<title>Claude Docs Monitor Report</title>\n<style>\n{_HTML_CSS}\n</style>\n</head>\n"
-        f"<body>\n{''.join(body_parts)}\n</body>\n</html>\n"
-    )
-    (output_dir / "report.html").write_text(html, encoding="utf-8")
+def _html_lazy_diff(title: str, diff_text: str, artifact: str | None) -> str:
+    """A collapsed diff: a one-line summary with stats; the rendered diff loads on expand."""
+    stats = _esc_html(_stats_label(diff_text))
+    if not artifact:
+        return (f'<details class="lazy-diff"><summary>{stats}</summary>'
+                f"{_render_diff_html(diff_text)}</details>")
+    src = f"{REPORT_DIFFS_DIRNAME}/{artifact}.html"
+    return (f'<details class="lazy-diff" data-src="{src}"><summary>{stats} — '
+            f'<a href="{REPORT_DIFFS_DIRNAME}/{artifact}.diff">raw</a></summary>'
+            f'<iframe title="{_esc_html(title)}"></iframe></details>')
+
+
+def generate_html_report(report_data: dict, output_dir: Path):
+    """Write an HTML report to output_dir/report.html, streaming it part by part.
+
+    The report carries summaries and per-page hunk counts; each diff is a
+    collapsed section that loads diffs/<name>.html when expanded.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / "report.html", "w", encoding="utf-8") as f:
+        f.write("<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+                "<meta name=\"viewport\" content=\"width=device-width,initial-scale=1\">\n"
+                f"<title>Claude Docs Monitor Report</title>\n<style>\n{_HTML_CSS}\n</style>\n</head>\n"
+                "<body>\n")
+        f.write("<h1>Claude Docs Monitor Report</h1>")
+        f.write(f'<p class="ts">{_esc_html(report_data["timestamp"])}</p>')
+
+        if report_data["first_run"]:
+            f.write(f"<p><strong>First run: {report_data['total']} pages snapshotted.</strong></p>")
+            f.write("<ul>")
+            for url in report_data["urls"]:
+                f.write(f"<li>{_esc_html(url)}</li>")
+            f.write("</ul>")
+        else:
+            f.write("<table><tr><th>Metric</th><th>Count</th></tr>")
+            f.write(f"<tr><td>Changed</td><td>{len(report_data['changes'])}</td></tr>")
+            f.write(f"<tr><td>Added</td><td>{len(report_data['added'])}</td></tr>")
+            f.write(f"<tr><td>Removed</td><td>{len(report_data['removed'])}</td></tr>")
+            f.write(f"<tr><td>Moved</td><td>{len(report_data.get('moved', []))}</td></tr>")
+            f.write(f"<tr><td>Errors</td><td>{len(report_data['errors'])}</td></tr>")
+            f.write("</table>")
+
+            if report_data["added"]:
+                f.write("<h2>Added Pages</h2><ul>")
+                for url in report_data["added"]:
+                    f.write(f"<li>{_esc_html(url)}</li>")
+                f.write("</ul>")
+
+            if report_data["removed"]:
+                f.write("<h2>Removed Pages</h2><ul>")
+                for url in report_data["removed"]:
+                    f.write(f"<li>{_esc_html(url)}</li>")
+                f.write("</ul>")
+
+            f.write("".join(_html_move_parts(report_data, "h2")))
+            f.write("".join(_html_flap_parts(report_data, "h2")))
+
+            if report_data["errors"]:
+                f.write("<h2>Errors</h2><ul>")
+                for e in report_data["errors"]:
+                    f.write(f"<li><strong>{_esc_html(e['url'])}</strong>: {_esc_html(e['error'])}</li>")
+                f.write("</ul>")
+
+            if report_data["changes"]:
+                f.write("<h2>Diffs</h2>")
+                for part in _html_diff_blocks(report_data, "h3", _html_lazy_diff):
+                    f.write(part)
+                f.write(f"\n<script>\n{_LAZY_DIFF_SCRIPT}\n</script>")
+
+        f.write("\n</body>\n</html>\n")
 
 
 def _build_md_entry(report_data: dict) -> str:
@@ -619,6 +1833,7 @@ def _build_md_entry(report_data: dict) -> str:
         lines.append(f"| Changed | {len(report_data['changes'])} |")
         lines.append(f"| Added | {len(report_data['added'])} |")
         lines.append(f"| Removed | {len(report_data['removed'])} |")
+        lines.append(f"| Moved | {len(report_data.get('moved', []))} |")
         lines.append(f"| Errors | {len(report_data['errors'])} |")
 
         if report_data["added"]:
@@ -631,6 +1846,9 @@ def _build_md_entry(report_data: dict) -> str:
             for url in report_data["removed"]:
                 lines.append(f"- {url}")
 
+        lines.extend(_md_move_lines(report_data, "###"))
+        lines.extend(_md_flap_lines(report_data, "###"))
+
         if report_data["errors"]:
             lines.append("\n### Errors\n")
             for e in report_data["errors"]:
@@ -638,11 +1856,7 @@ def _build_md_entry(report_data: dict) -> str:
 
         if report_data["changes"]:
             lines.append("\n### Diffs\n")
-            for ch in report_data["changes"]:
-                lines.append(f"#### {ch['url']}\n")
-                lines.append("```diff")
-                lines.append(ch["diff"])
-                lines.append("```")
+            lines.extend(_md_diff_blocks(report_data, "####"))
 
     return "\n".join(lines) + "\n"
 
@@ -663,6 +1877,7 @@ def _build_html_entry(report_data: dict) -> str:
         parts.append(f"<tr><td>Changed</td><td>{len(report_data['changes'])}</td></tr>")
         parts.append(f"<tr><td>Added</td><td>{len(report_data['added'])}</td></tr>")
         parts.append(f"<tr><td>Removed</td><td>{len(report_data['removed'])}</td></tr>")
+        parts.append(f"<tr><td>Moved</td><td>{len(report_data.get('moved', []))}</td></tr>")
         parts.append(f"<tr><td>Errors</td><td>{len(report_data['errors'])}</td></tr>")
         parts.append("</table>")
 
@@ -678,6 +1893,9 @@ def _build_html_entry(report_data: dict) -> str:
                 parts.append(f"<li>{_esc_html(url)}</li>")
             parts.append("</ul>")
 
+        parts.extend(_html_move_parts(report_data, "h3"))
+        parts.extend(_html_flap_parts(report_data, "h3"))
+
         if report_data["errors"]:
             parts.append("<h3>Errors</h3><ul>")
             for e in report_data["errors"]:
@@ -686,55 +1904,123 @@ def _build_html_entry(report_data: dict) -> str:
 
         if report_data["changes"]:
             parts.append("<h3>Diffs</h3>")
-            for ch in report_data["changes"]:
-                parts.append(f"<h4>{_esc_html(ch['url'])}</h4>")
-                parts.append(_render_diff_html(ch["diff"]))
+            parts.extend(_html_diff_blocks(report_data, "h4"))
 
     return "\n".join(parts)
 
 
-def append_md_history(report_data: dict, output_dir: Path):
-    """Append a new entry to output_dir/history.md."""
-    output_dir.mkdir(parents=True, exist_ok=True)
-    history_path = output_dir / "history.md"
-    entry = _build_md_entry(report_data)
-    if history_path.exists():
-        with open(history_path, "a", encoding="utf-8") as f:
-            f.write("\n---\n\n")
-            f.write(entry)
-    else:
-        with open(history_path, "w", encoding="utf-8") as f:
-            f.write("# Claude Docs Monitor History\n\n")
-            f.write(entry)
-
-
-def append_html_history(report_data: dict, output_dir: Path):
-    """Append a new entry to output_dir/history.html."""
-    output_dir.mkdir(parents=True, exist_ok=True)
+_HISTORY_HTML_TAIL = "\n</body>\n</html>\n"
 
-    entry = _build_html_entry(report_data)
-    history_path = output_dir / "history.html"
-
-    if history_path.exists():
-        content = history_path.read_text(encoding="utf-8")
-        insert_point = content.rfind("</body>")
-        if insert_point != -1:
-            content = content[:insert_point] + "<hr>" + entry + content[insert_point:]
-            history_path.write_text(content, encoding="utf-8")
-            return
 
-    # Create new file
-    html = (
+def _history_html_page(title: str, body: str) -> str:
+    return (
         "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
         "<meta name=\"viewport\" content=\"width=device-width,initial-scale=1\">\n"
-        f"<title>Claude Docs Monitor History</title>\n<style>\n{_HTML_CSS}\n</style>\n</head>\n"
-        f"<body>\n<h1>Claude Docs Monitor History</h1>\n{entry}\n</body>\n</html>\n"
+        f"<title>{_esc_html(title)}</title>\n<style>\n{_HTML_CSS}\n</style>\n</head>\n"
+        f"<body>\n<h1>{_esc_html(title)}</h1>\n{body}{_HISTORY_HTML_TAIL}"
     )
-    history_path.write_text(html, encoding="utf-8")
 
 
-def save_diff_files(changes: list[dict], diff_dir: str):
-    """Save .diff files to disk."""
+def _history_segment(report_data: dict) -> str:
+    """Segment name (YYYY-MM) for a run, from its "YYYY-MM-DD HH:MM:SS UTC" timestamp."""
+    return report_data["timestamp"][:7]
+
+
+def _prepare_history_dir(output_dir: Path) -> Path:
+    """Return output_dir/history/, moving a pre-segment single-file history into it on first use."""
+    seg_dir = output_dir / HISTORY_DIRNAME
+    if not seg_dir.exists():
+        seg_dir.mkdir(parents=True)
+        for ext in ("md", "html"):
+            legacy = output_dir / f"history.{ext}"
+            if legacy.exists():
+                legacy.replace(seg_dir / f"legacy.{ext}")
+    return seg_dir
+
+
+def write_history_index(output_dir: Path):
+    """Rewrite the small history.md / history.html index pages listing every segment, newest first."""
+    seg_dir = output_dir / HISTORY_DIRNAME
+
+    def segments(ext: str) -> list[str]:
+        names = sorted((p.stem for p in seg_dir.glob(f"*.{ext}")), reverse=True)
+        # legacy.* is the pre-segment single-file history; keep it last
+        return [n for n in names if n != "legacy"] + (["legacy"] if "legacy" in names else [])
+
+    md = ["# Claude Docs Monitor History", ""]
+    md.extend(f"- [{n}]({HISTORY_DIRNAME}/{n}.md)" for n in segments("md"))
+    (output_dir / "history.md").write_text("\n".join(md) + "\n", encoding="utf-8")
+
+    items = "".join(f'<li><a href="{HISTORY_DIRNAME}/{n}.html">{n}</a></li>\n' for n in segments("html"))
+    (output_dir / "history.html").write_text(
+        _history_html_page("Claude Docs Monitor History", f"<ul>\n{items}</ul>"), encoding="utf-8"
+    )
+
+
+def append_md_history(report_data: dict, output_dir: Path) -> bool:
+    """Append a new entry to the current month's segment, output_dir/history/YYYY-MM.md.
+
+    Returns True if the segment was created (the index pages need rewriting).
+    """
+    seg_dir = _prepare_history_dir(output_dir)
+    segment = _history_segment(report_data)
+    path = seg_dir / f"{segment}.md"
+    entry = _build_md_entry(report_data)
+    created = not path.exists()
+    with open(path, "a", encoding="utf-8") as f:
+        if created:
+            f.write(f"# Claude Docs Monitor History — {segment}\n\n")
+        else:
+            f.write("\n---\n\n")
+        f.write(entry)
+    return created
+
+
+def append_html_history(report_data: dict, output_dir: Path) -> bool:
+    """Append a new entry to the current month's segment, output_dir/history/YYYY-MM.html.
+
+    Only the closing tags at the end of the segment are rewritten, so an
+    append costs the size of the entry, not of the history.
+    Returns True if the segment was created.
+    """
+    seg_dir = _prepare_history_dir(output_dir)
+    segment = _history_segment(report_data)
+    path = seg_dir / f"{segment}.html"
+    entry = _build_html_entry(report_data)
+
+    if path.exists():
+        tail = _HISTORY_HTML_TAIL.encode("utf-8")
+        with open(path, "r+b") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size >= len(tail):
+                f.seek(size - len(tail))
+                if f.read() == tail:
+                    f.seek(size - len(tail))
+                    f.write(("<hr>" + entry + _HISTORY_HTML_TAIL).encode("utf-8"))
+                    f.truncate()
+                    return False
+        # Unrecognized ending (hand-edited?) — leave it alone and just append
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("<hr>" + entry + "\n")
+        return False
+
+    path.write_text(
+        _history_html_page(f"Claude Docs Monitor History — {segment}", entry), encoding="utf-8"
+    )
+    return True
+
+
+def append_history(report_data: dict, output_dir: Path):
+    """Append a run to the Markdown and HTML history segments, refreshing the index when a segment starts."""
+    created = append_md_history(report_data, output_dir)
+    created = append_html_history(report_data, output_dir) or created
+    if created or not (output_dir / "history.md").exists():
+        write_history_index(output_dir)
+
+
+def save_diff_files(changes: list[dict], diff_dir: str):
+    """Save .diff files to disk."""
     diff_path = Path(diff_dir)
     diff_path.mkdir(parents=True, exist_ok=True)
     for ch in changes:
@@ -753,6 +2039,22 @@ def save_diff_files(changes: list[dict], diff_dir: str):
 
 # ── Core Commands ───────────────────────────────────────────────────────────
 
+def _advance_flap(conn: sqlite3.Connection, pending: dict[str, sqlite3.Row], url: str) -> sqlite3.Row | None:
+    """Count another unchanged run for a URL's pending revert.
+
+    Returns the flap event once it has been stable for FLAP_STABLE_RUNS runs
+    (and marks it settled), otherwise None.
+    """
+    ev = pending[url]
+    stable = ev["stable_runs"] + 1
+    if stable >= FLAP_STABLE_RUNS:
+        conn.execute("UPDATE flap_events SET stable_runs = ?, status = 'stable' WHERE id = ?",
+                     (stable, ev["id"]))
+        return pending.pop(url)
+    conn.execute("UPDATE flap_events SET stable_runs = ? WHERE id = ?", (stable, ev["id"]))
+    return None
+
+
 async def cmd_check(args):
     """Main check command: fetch all pages, detect changes, show diffs."""
     conn = init_db()
@@ -767,6 +2069,9 @@ async def cmd_check(args):
     async with httpx.AsyncClient(http2=True) as client:
         index_result = await fetch_url(client, INDEX_URL, semaphore)
 
+    added_urls_index = []
+    removed_urls_index = []
+
     if index_result["error"] or not index_result["content"]:
         # Fall back to last stored URL list
         last_index = get_last_index_snapshot(conn)
@@ -795,8 +2100,6 @@ async def cmd_check(args):
 
         # Compare against last index
         last_index = get_last_index_snapshot(conn)
-        added_urls_index = []
-        removed_urls_index = []
         if last_index:
             old_urls = set(json.loads(last_index["urls_json"]))
             new_urls = set(urls)
@@ -816,9 +2119,15 @@ async def cmd_check(args):
     # Step 2: Fetch all pages
     results = await fetch_all(urls, show_progress=not getattr(args, "quiet", False))
 
-    # Step 3: Detect changes
+    # Step 3: Detect changes (on normalized hashes, so volatile fragments don't count)
+    rules = get_normalize_rules()
     changes = []
     errors = []
+    pairs = []  # (url, old, new) for pages changed in place, for section-move detection
+    flaps = []
+    recent = load_recent_hashes(conn)
+    seed_missing_recent_hashes(conn, recent, (r["url"] for r in results if not r["error"]), rules)
+    pending = get_pending_flaps(conn)
     for result in results:
         url = result["url"]
         if result["error"]:
@@ -828,12 +2137,39 @@ async def cmd_check(args):
             continue
 
         prev = get_last_page_snapshot(conn, url)
+        new_hash = normalized_sha256(result["content"], rules) if result["content"] else None
 
         if prev and result["content"]:
-            new_hash = sha256(result["content"])
-            if prev["hash"] != new_hash:
-                diff_text = compute_diff(prev["content"] or "", result["content"], url)
-                changes.append({"url": url, "diff": diff_text})
+            prev_hash = effective_normalized_hash(prev, rules)
+            if prev_hash != new_hash:
+                if prev_hash and any(h == new_hash for h, _ in recent.get(url, [])):
+                    # Back to a version seen recently: a revert or flap, held out of the
+                    # diff/digest pipeline until it stays put for FLAP_STABLE_RUNS runs
+                    flips = record_flap(conn, pending, url, prev_hash, new_hash, prev["id"])
+                    flaps.append({"url": url, "flips": flips})
+                else:
+                    if url in pending:
+                        conn.execute("UPDATE flap_events SET status = 'superseded' WHERE id = ?",
+                                     (pending.pop(url)["id"],))
+                    diff_text = compute_diff(prev["content"] or "", result["content"], url)
+                    changes.append({"url": url, "diff": diff_text,
+                                    "old_hash": prev["hash"], "new_hash": sha256(result["content"]),
+                                    "old_normalized_hash": prev_hash, "new_normalized_hash": new_hash})
+                    pairs.append((url, prev["content"] or "", result["content"]))
+            elif url in pending and pending[url]["to_hash"] == new_hash:
+                settled = _advance_flap(conn, pending, url)
+                if settled:
+                    old = conn.execute("SELECT content, hash, normalized_hash, normalize_rules "
+                                       "FROM page_snapshots WHERE id = ?",
+                                       (settled["from_snapshot_id"],)).fetchone()
+                    diff_text = compute_diff(old["content"] if old else "", result["content"], url)
+                    if diff_text:
+                        changes.append({"url": url, "diff": diff_text, "settled_flips": settled["flips"],
+                                        "old_hash": old["hash"] if old else None,
+                                        "new_hash": sha256(result["content"]),
+                                        "old_normalized_hash": (effective_normalized_hash(old, rules)
+                                                                if old else None),
+                                        "new_normalized_hash": new_hash})
             # Check status code change
             if prev["status_code"] and result["status_code"] != prev["status_code"]:
                 if prev["status_code"] == 200 and result["status_code"] != 200:
@@ -843,11 +2179,28 @@ async def cmd_check(args):
                             "diff": f"Status changed: {prev['status_code']} → {result['status_code']}",
                         })
 
-        store_page_snapshot(conn, url, result["content"], result["status_code"],
-                            result["duration_ms"])
+        snapshot_id = store_page_snapshot(conn, url, result["content"], result["status_code"],
+                                          result["duration_ms"])
+        if new_hash:
+            push_recent_hash(conn, recent, url, new_hash, snapshot_id)
+            if not prev or not prev["content"] or prev["hash"] != sha256(result["content"]):
+                advance_line_provenance(conn, url, prev, snapshot_id, result["content"])
 
     conn.commit()
 
+    # Renamed pages show up as one removal plus one addition: match them by content
+    moved = []
+    section_moves = []
+    if not first_run and (added_urls_index or removed_urls_index or pairs):
+        old_contents = {}
+        for u in removed_urls_index:
+            snap = get_last_page_snapshot(conn, u)
+            if snap and snap["content"]:
+                old_contents[u] = snap["content"]
+        new_contents = {r["url"]: r["content"] for r in results if r["content"]}
+        added_urls_index, removed_urls_index, moved, section_moves = apply_moves(
+            changes, pairs, added_urls_index, removed_urls_index, old_contents, new_contents)
+
     # Step 4: Filter HTML noise unless --include-html
     include_html = getattr(args, "include_html", False)
     if not include_html and changes:
@@ -869,48 +2222,88 @@ async def cmd_check(args):
                 print("Use --include-html to show all diffs")
         changes = filtered
 
+    # Group hunks that changed identically on several pages (shared footers, renames)
+    shared = group_shared_hunks(changes)
+
     # Step 5: Display report
     added_urls_display = added_urls_index if not first_run else []
     removed_urls_display = removed_urls_index if not first_run else []
     quiet = getattr(args, "quiet", False)
 
-    print_summary(changes, added_urls_display, removed_urls_display, errors, len(urls), first_run, quiet)
+    print_summary(changes, added_urls_display, removed_urls_display, errors, len(urls), first_run, quiet,
+                  moved=moved, flaps=flaps)
     print_diffs(changes, quiet)
 
     # Save diffs if requested
     if getattr(args, "save_diffs", None) and changes:
         save_diff_files(changes, args.save_diffs)
 
-    # Always dump latest pages to disk
+    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+    # Always mirror latest pages to disk (only changed files are rewritten)
     dump_dir = Path(getattr(args, "dump", None) or "data-claude/pages")
-    dump_dir.mkdir(parents=True, exist_ok=True)
-    written = 0
-    for result in results:
-        if result["content"]:
-            filename = url_to_filename(result["url"])
-            (dump_dir / filename).write_text(result["content"], encoding="utf-8")
-            written += 1
+    written, unchanged, removed_files = sync_mirror(
+        dump_dir,
+        ((r["url"], r["content"]) for r in results if r["content"]),
+        keep_urls=urls,
+    )
+    msg = f"Updated {written} pages in {dump_dir}/ ({unchanged} unchanged"
+    msg += f", {removed_files} removed)" if removed_files else ")"
     if HAS_RICH:
-        console.print(f"[green]Updated {written} pages in {dump_dir}/[/green]")
+        console.print(f"[green]{msg}[/green]")
     else:
-        print(f"Updated {written} pages in {dump_dir}/")
+        print(msg)
+
+    # Versioned copy of the tree for this run, hardlinking unchanged files
+    if getattr(args, "snapshot_tree", None):
+        tree, linked, tree_written = write_snapshot_tree(
+            Path(args.snapshot_tree), _run_id(timestamp),
+            ((r["url"], r["content"]) for r in results if r["content"]),
+            carry_urls=urls,
+        )
+        msg = f"Snapshot tree {tree}/ ({tree_written} written, {linked} hardlinked)"
+        if HAS_RICH:
+            console.print(f"[green]{msg}[/green]")
+        else:
+            print(msg)
+
+    # Append this run to a git repository of the docs
+    if getattr(args, "git_export", None):
+        try:
+            _, commits = git_export(conn, Path(args.git_export))
+            msg = f"Exported {commits} commit(s) to {args.git_export}"
+            if HAS_RICH:
+                console.print(f"[green]{msg}[/green]")
+            else:
+                print(msg)
+        except (RuntimeError, OSError) as exc:
+            print(f"Warning: git export failed: {exc}")
 
     # Step 6: Generate reports
     report_dir = Path(getattr(args, "report", None) or "data-claude")
     report_data = {
-        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "timestamp": timestamp,
         "first_run": first_run,
         "total": len(urls),
         "urls": urls,
         "changes": changes,
+        "shared": shared,
         "added": added_urls_display,
         "removed": removed_urls_display,
+        "moved": moved,
+        "section_moves": section_moves,
+        "flaps": flaps,
         "errors": errors,
     }
-    generate_md_report(report_data, report_dir)
+    max_diff_bytes = getattr(args, "max_diff_bytes", None)
+    if max_diff_bytes is None:
+        max_diff_bytes = MAX_DIFF_BYTES
+    write_diff_artifacts(report_data, report_dir, max_diff_bytes)
+    write_run_artifact(report_data, report_dir)
+    publish_change_feed(report_data, report_dir)
+    generate_md_report(report_data, report_dir, max_diff_bytes)
     generate_html_report(report_data, report_dir)
-    append_md_history(report_data, report_dir)
-    append_html_history(report_data, report_dir)
+    append_history(report_data, report_dir)
     if HAS_RICH:
         console.print(f"[green]Reports written to {report_dir}/ (report + history)[/green]")
     else:
@@ -1007,6 +2400,31 @@ def cmd_diff(args):
         print(diff_text)
 
 
+def cmd_blame(args):
+    """Show, for each current line of a page, the run in which it first appeared."""
+    conn = init_db()
+    url = args.url
+    result = get_line_provenance(conn, url)
+    if not result:
+        print(f"No snapshots found for {url}")
+        return
+    lines, first_seen = result
+    pattern = re.compile(args.grep, re.IGNORECASE) if getattr(args, "grep", None) else None
+
+    shown = 0
+    for n, (line, seen) in enumerate(zip(lines, first_seen), 1):
+        if pattern and not pattern.search(line):
+            continue
+        stamp = datetime.fromisoformat(seen).strftime("%Y-%m-%d %H:%M")
+        if HAS_RICH:
+            console.print(f"[dim]{stamp}[/dim] [cyan]{n:>5}[/cyan]  {line}", markup=True, highlight=False)
+        else:
+            print(f"{stamp} {n:>5}  {line}")
+        shown += 1
+    if pattern and not shown:
+        print(f"No lines matching '{args.grep}' in {url}")
+
+
 def url_to_filename(url: str) -> str:
     """Derive a clean .md filename from a doc URL.
 
@@ -1018,18 +2436,449 @@ def url_to_filename(url: str) -> str:
     return path
 
 
+def _write_file_atomic(path: Path, content: str):
+    """Write via a temp file in the same directory and rename over the target."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(content, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def sync_mirror(out_dir: Path, pages: Iterable[tuple[str, str]],
+                keep_urls: Iterable[str] = (), prune: bool = True,
+                workers: int = 1) -> tuple[int, int, int]:
+    """Bring a directory of page files up to date, touching only what changed.
+
+    ``pages`` yields (url, content) and is consumed as it streams. A file is
+    written (temp file + atomic rename, parent directories created) only if
+    its hash differs from out_dir/manifest.json (filename → sha256); with
+    ``workers`` > 1 the writes run on a thread pool. Unless ``prune`` is off,
+    files in the manifest that are neither in ``pages`` nor in ``keep_urls``
+    (e.g. pages that failed to fetch this run) are deleted. Returns
+    (written, unchanged, removed).
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MIRROR_MANIFEST
+    old = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+    new = {}
+    written = unchanged = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        inflight = set()
+        for url, content in pages:
+            filename = url_to_filename(url)
+            h = sha256(content)
+            new[filename] = h
+            path = out_dir / filename
+            if path.exists() and (old.get(filename) or sha256(path.read_text(encoding="utf-8"))) == h:
+                unchanged += 1
+                continue
+            written += 1
+            if workers <= 1:
+                _write_file_atomic(path, content)
+                continue
+            inflight.add(pool.submit(_write_file_atomic, path, content))
+            # Bound the pages held in memory while writers catch up
+            if len(inflight) >= workers * 4:
+                done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                for f in done:
+                    f.result()
+        for f in inflight:
+            f.result()
+
+    keep = {url_to_filename(u) for u in keep_urls}
+    removed = 0
+    for filename, h in old.items():
+        if filename in new:
+            continue
+        if filename in keep or not prune:
+            new[filename] = h
+            continue
+        path = out_dir / filename
+        if path.exists():
+            path.unlink()
+            removed += 1
+        # Drop directories left empty by nested names like whats-new/2026-w13.md
+        parent = path.parent
+        while parent != out_dir and parent.is_dir() and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+
+    if new != old:
+        _write_file_atomic(manifest_path, json.dumps(new, indent=1, sort_keys=True) + "\n")
+    return written, unchanged, removed
+
+
+def write_snapshot_tree(root: Path, run_id: str, pages: Iterable[tuple[str, str]],
+                        carry_urls: Iterable[str] = ()) -> tuple[Path, int, int]:
+    """Materialize root/<run_id>/ as a full copy of the pages, sharing unchanged files.
+
+    Files whose hash matches the previous tree (the one root/current points
+    to, per its manifest.json) are hardlinked to it instead of written, so a
+    tree costs disk only for what changed. ``carry_urls`` are pages to take
+    over from the previous tree unchanged (e.g. ones that failed to fetch).
+    The tree is built under a temp name, renamed into place, and then
+    root/current is swapped to it atomically. Returns (tree, linked, written).
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    current = root / "current"
+    prev_dir = current.resolve() if current.is_symlink() and current.exists() else None
+    prev = {}
+    if prev_dir and (prev_dir / MIRROR_MANIFEST).exists():
+        prev = json.loads((prev_dir / MIRROR_MANIFEST).read_text(encoding="utf-8"))
+
+    name = run_id
+    n = 1
+    while (root / name).exists():
+        n += 1
+        name = f"{run_id}-{n}"
+    tmp_dir = root / f".{name}.tmp"
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir()
+
+    def link_prev(filename: str):
+        target = tmp_dir / filename
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(prev_dir / filename, target)
+        except OSError:
+            # No hardlinks here (other filesystem, FAT, ...): fall back to a copy
+            shutil.copy2(prev_dir / filename, target)
+
+    manifest = {}
+    linked = written = 0
+    for url, content in pages:
+        filename = url_to_filename(url)
+        h = sha256(content)
+        manifest[filename] = h
+        if prev.get(filename) == h and (prev_dir / filename).exists():
+            link_prev(filename)
+            linked += 1
+        else:
+            path = tmp_dir / filename
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+            written += 1
+    for url in carry_urls:
+        filename = url_to_filename(url)
+        if filename not in manifest and filename in prev and (prev_dir / filename).exists():
+            link_prev(filename)
+            manifest[filename] = prev[filename]
+            linked += 1
+
+    (tmp_dir / MIRROR_MANIFEST).write_text(json.dumps(manifest, indent=1, sort_keys=True) + "\n",
+                                           encoding="utf-8")
+    tree = root / name
+    tmp_dir.rename(tree)
+
+    tmp_link = root / ".current.tmp"
+    if tmp_link.is_symlink() or tmp_link.exists():
+        tmp_link.unlink()
+    tmp_link.symlink_to(name, target_is_directory=True)
+    os.replace(tmp_link, current)
+    return tree, linked, written
+
+
+def _git(repo: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", "--git-dir", str(repo), *args], capture_output=True, text=True)
+
+
+def _fast_import_path(path: str) -> str:
+    """Quote a path for a fast-import M/D command when it needs it."""
+    if path.startswith('"') or any(c in path for c in '\n\\ '):
+        return json.dumps(path)
+    return path
+
+
+def git_export(conn: sqlite3.Connection, repo: Path, branch: str = "main",
+               full: bool = False) -> tuple[int, int]:
+    """Export runs to a bare git repository, one commit per run that changed the tree.
+
+    Streams a single pass over page_snapshots (ids and hashes only; content is
+    read just for files that changed), grouped into runs by index_snapshots,
+    into one ``git fast-import`` process. Progress is kept in git_exports, so
+    later calls append only runs newer than the last export. Starts over if
+    the branch is missing, the progress record is missing, or ``full`` is set.
+    Returns (runs scanned, commits written).
+    """
+    if not (repo / "HEAD").exists():
+        repo.mkdir(parents=True, exist_ok=True)
+        res = subprocess.run(["git", "init", "-q", "--bare", "-b", branch, str(repo)],
+                             capture_output=True, text=True)
+        if res.returncode != 0:
+            raise RuntimeError(f"git init failed: {res.stderr.strip()}")
+
+    key = str(repo.resolve())
+    ref = f"refs/heads/{branch}"
+    head = _git(repo, "rev-parse", "--verify", "-q", ref).stdout.strip() or None
+    state = conn.execute("SELECT * FROM git_exports WHERE repo = ? AND branch = ?", (key, branch)).fetchone()
+    if full or not head or not state:
+        files: dict[str, str] = {}
+        last_id = 0
+        parent = None
+    else:
+        files = json.loads(state["files_json"])
+        last_id = state["last_index_id"]
+        parent = head
+
+    index_rows = conn.execute(
+        "SELECT id, fetched_at, urls_json FROM index_snapshots WHERE id > ? ORDER BY id", (last_id,)
+    ).fetchall()
+    if not index_rows:
+        return 0, 0
+
+    snaps = conn.execute(
+        "SELECT id, url, hash, fetched_at FROM page_snapshots "
+        "WHERE content IS NOT NULL AND fetched_at >= ? ORDER BY fetched_at, id",
+        (index_rows[0]["fetched_at"],),
+    )
+    pending = snaps.fetchone()
+
+    # --force: a from-scratch export replaces whatever the branch held before
+    proc = subprocess.Popen(["git", "--git-dir", str(repo), "fast-import", "--quiet", "--force"],
+                            stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    out = proc.stdin
+    commits = 0
+    try:
+        for i, idx in enumerate(index_rows):
+            end = index_rows[i + 1]["fetched_at"] if i + 1 < len(index_rows) else None
+            in_index = {url_to_filename(u) for u in json.loads(idx["urls_json"])}
+
+            # Latest snapshot of each page fetched in this run's window
+            run_files: dict[str, tuple[str, int]] = {}
+            while pending and (end is None or pending["fetched_at"] < end):
+                run_files[url_to_filename(pending["url"])] = (pending["hash"], pending["id"])
+                pending = snaps.fetchone()
+
+            modified = sorted((fn, h, sid) for fn, (h, sid) in run_files.items()
+                              if fn in in_index and files.get(fn) != h)
+            deleted = sorted(fn for fn in files if fn not in in_index)
+            if not modified and not deleted:
+                continue
+
+            added = sum(1 for fn, _, _ in modified if fn not in files)
+            when = int(datetime.fromisoformat(idx["fetched_at"]).timestamp())
+            ts = datetime.fromisoformat(idx["fetched_at"]).strftime("%Y-%m-%d %H:%M:%S UTC")
+            msg = (f"Docs snapshot {ts}\n\n{len(modified) - added} changed, {added} added, "
+                   f"{len(deleted)} removed\n").encode("utf-8")
+            out.write(f"commit {ref}\n".encode())
+            out.write(f"committer claude-docs-monitor <docs-monitor@localhost> {when} +0000\n".encode())
+            out.write(f"data {len(msg)}\n".encode() + msg)
+            if parent:
+                out.write(f"from {parent}\n".encode())
+                parent = None  # later commits in the stream continue from the branch tip
+            for fn in deleted:
+                out.write(f"D {_fast_import_path(fn)}\n".encode("utf-8"))
+                del files[fn]
+            for fn, h, sid in modified:
+                data = conn.execute("SELECT content FROM page_snapshots WHERE id = ?",
+                                    (sid,)).fetchone()["content"].encode("utf-8")
+                out.write(f"M 100644 inline {_fast_import_path(fn)}\n".encode("utf-8"))
+                out.write(f"data {len(data)}\n".encode() + data + b"\n")
+                files[fn] = h
+            out.write(b"\n")
+            commits += 1
+        out.close()
+    except BrokenPipeError:
+        pass
+    stderr = proc.stderr.read().decode("utf-8", errors="replace")
+    if proc.wait() != 0:
+        raise RuntimeError(f"git fast-import failed: {stderr.strip()[:500]}")
+
+    head = _git(repo, "rev-parse", "--verify", "-q", ref).stdout.strip()
+    if head:
+        conn.execute(
+            "INSERT OR REPLACE INTO git_exports (repo, branch, last_index_id, head, files_json, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, branch, index_rows[-1]["id"], head, json.dumps(files), utcnow()),
+        )
+        conn.commit()
+    return len(index_rows), commits
+
+
+def _reconstruct_run(conn: sqlite3.Connection, index_rows: list[sqlite3.Row], run_idx: int,
+                     include_html: bool) -> dict | None:
+    """Rebuild the report_data of one past run from the two index windows around it.
+
+    A run's pages are the snapshots fetched between its index fetch and the
+    next one. Returns None if the run stored no page snapshots.
+    """
+    idx_row = index_rows[run_idx]
+    run_time = idx_row["fetched_at"]
+    current_urls = json.loads(idx_row["urls_json"])
+
+    # Determine time window: from this index fetch to the next (or far future)
+    if run_idx + 1 < len(index_rows):
+        next_time = index_rows[run_idx + 1]["fetched_at"]
+    else:
+        next_time = "9999-12-31T23:59:59+00:00"
+
+    # Get page snapshots for this run (fetched between this index and the next)
+    page_rows = conn.execute(
+        "SELECT url, content, hash, normalized_hash, normalize_rules, status_code, error "
+        "FROM page_snapshots WHERE fetched_at >= ? AND fetched_at < ? "
+        "ORDER BY id",
+        (run_time, next_time),
+    ).fetchall()
+
+    if not page_rows:
+        return None
+
+    # Build a lookup of this run's pages
+    run_pages = {}
+    for pr in page_rows:
+        run_pages[pr["url"]] = dict(pr)
+
+    timestamp = datetime.fromisoformat(run_time).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+    # First run or subsequent?
+    if run_idx == 0:
+        return {
+            "timestamp": timestamp,
+            "first_run": True,
+            "total": len(current_urls),
+            "urls": current_urls,
+            "changes": [],
+            "added": [],
+            "removed": [],
+            "errors": [run_pages[u] for u in run_pages if run_pages[u]["error"]],
+        }
+
+    prev_urls = json.loads(index_rows[run_idx - 1]["urls_json"])
+    added = sorted(set(current_urls) - set(prev_urls))
+    removed = sorted(set(prev_urls) - set(current_urls))
+
+    # Get previous run's page snapshots for comparison
+    prev_time = index_rows[run_idx - 1]["fetched_at"]
+    prev_page_rows = conn.execute(
+        "SELECT url, content, hash, normalized_hash, normalize_rules FROM page_snapshots "
+        "WHERE fetched_at >= ? AND fetched_at < ? ORDER BY id",
+        (prev_time, run_time),
+    ).fetchall()
+    prev_pages = {}
+    for pr in prev_page_rows:
+        prev_pages[pr["url"]] = dict(pr)
+
+    # Compute diffs
+    changes = []
+    pairs = []
+    for url in current_urls:
+        cur = run_pages.get(url)
+        prev = prev_pages.get(url)
+        if cur and prev and cur["content"] and prev["content"]:
+            old_norm, new_norm = effective_normalized_hash(prev), effective_normalized_hash(cur)
+            if new_norm != old_norm:
+                diff_text = compute_diff(prev["content"], cur["content"], url)
+                changes.append({"url": url, "diff": diff_text,
+                                "old_hash": prev["hash"], "new_hash": cur["hash"],
+                                "old_normalized_hash": old_norm, "new_normalized_hash": new_norm})
+                pairs.append((url, prev["content"], cur["content"]))
+
+    added, removed, moved, section_moves = apply_moves(
+        changes, pairs, added, removed,
+        {u: p["content"] for u, p in prev_pages.items()},
+        {u: p["content"] for u, p in run_pages.items()},
+    )
+
+    errors = [run_pages[u] for u in run_pages if run_pages[u].get("error")]
+
+    # Filter HTML noise unless --include-html
+    if not include_html:
+        changes = [ch for ch in changes if not (ch["diff"] and is_html_diff(ch["diff"]))]
+    shared = group_shared_hunks(changes)
+
+    return {
+        "timestamp": timestamp,
+        "first_run": False,
+        "total": len(current_urls),
+        "urls": current_urls,
+        "changes": changes,
+        "shared": shared,
+        "added": added,
+        "removed": removed,
+        "moved": moved,
+        "section_moves": section_moves,
+        "errors": errors,
+    }
+
+
+# Per-process state for reconstruct_runs() workers, set once by the pool initializer
+_worker_conn: sqlite3.Connection | None = None
+_worker_index_rows: list[dict] | None = None
+
+
+def _init_run_worker(db_path: Path, index_rows: list[dict]):
+    global _worker_conn, _worker_index_rows
+    _worker_conn = init_db(db_path)
+    _worker_index_rows = index_rows
+
+
+def _run_worker(task: tuple[int, bool, bool]) -> tuple[int, dict | None, tuple[str, str] | None]:
+    run_idx, include_html, render = task
+    report_data = _reconstruct_run(_worker_conn, _worker_index_rows, run_idx, include_html)
+    rendered = (_build_md_entry(report_data), _build_html_entry(report_data)) if render and report_data else None
+    return run_idx, report_data, rendered
+
+
+def reconstruct_runs(conn: sqlite3.Connection, index_rows: list[sqlite3.Row], run_idxs: list[int],
+                     include_html: bool, jobs: int = 1, render: bool = False):
+    """Yield (run_idx, report_data, rendered) for each run in run_idxs, in run order.
+
+    Runs are independent once their page windows are known, so with jobs > 1
+    they are reconstructed (and, with ``render``, rendered to Markdown/HTML
+    history entries) in a process pool with one DB connection per worker.
+    """
+    if jobs <= 1 or len(run_idxs) < 2:
+        for run_idx in run_idxs:
+            report_data = _reconstruct_run(conn, index_rows, run_idx, include_html)
+            rendered = (_build_md_entry(report_data), _build_html_entry(report_data)) if render and report_data else None
+            yield run_idx, report_data, rendered
+        return
+
+    rows = [dict(r) for r in index_rows]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_run_worker,
+                             initargs=(DB_PATH, rows)) as pool:
+        tasks = [(run_idx, include_html, render) for run_idx in run_idxs]
+        yield from pool.map(_run_worker, tasks, chunksize=max(1, len(tasks) // (jobs * 8)))
+
+
+def _history_settings_key(include_html: bool) -> str:
+    """Everything besides the stored snapshots that a rendered history entry depends on."""
+    return (f"v{HISTORY_FRAGMENT_VERSION};html={int(include_html)};"
+            f"rules={normalize_rules_fingerprint(get_normalize_rules())}")
+
+
+def _write_history_segment(output_dir: Path, segment: str, fragments: list[sqlite3.Row]):
+    """Write one month's history files from its rendered fragments, as the appends would have."""
+    seg_dir = output_dir / HISTORY_DIRNAME
+    md = f"# Claude Docs Monitor History — {segment}\n\n" + "\n---\n\n".join(f["md"] for f in fragments)
+    (seg_dir / f"{segment}.md").write_text(md, encoding="utf-8")
+    (seg_dir / f"{segment}.html").write_text(
+        _history_html_page(f"Claude Docs Monitor History — {segment}",
+                           "<hr>".join(f["html"] for f in fragments)),
+        encoding="utf-8",
+    )
+
+
 def cmd_rebuild_history(args):
-    """Rebuild history.html and history.md from all stored snapshots."""
+    """Rebuild the history segments and index pages from all stored snapshots.
+
+    Each run's rendered entry is kept in history_fragments, keyed by run and by
+    the settings it was rendered with. A rebuild re-renders only runs without a
+    current fragment (new runs, the previously open-ended last run, or runs
+    under different settings) and rewrites only the months they fall in.
+    --full discards the fragments and renders everything.
+    """
     conn = init_db()
     include_html = getattr(args, "include_html", False)
+    full = getattr(args, "full", False)
+    jobs = getattr(args, "jobs", 1) or 1
     output_dir = Path(getattr(args, "report", None) or "data-claude")
     output_dir.mkdir(parents=True, exist_ok=True)
-
-    # Delete existing history files
-    for f in ("history.html", "history.md"):
-        p = output_dir / f
-        if p.exists():
-            p.unlink()
+    seg_dir = output_dir / HISTORY_DIRNAME
+    settings_key = _history_settings_key(include_html)
+    checkpoint_key = str(output_dir.resolve())
 
     # Get all index snapshots in order — each represents a run
     index_rows = conn.execute(
@@ -1040,137 +2889,248 @@ def cmd_rebuild_history(args):
         print("No snapshots in database. Run 'check' first.")
         return
 
-    # For each consecutive pair of index snapshots, reconstruct what changed
-    entries_written = 0
-    for run_idx, idx_row in enumerate(index_rows):
-        run_time = idx_row["fetched_at"]
-        current_urls = json.loads(idx_row["urls_json"])
-
-        # Determine time window: from this index fetch to the next (or far future)
-        if run_idx + 1 < len(index_rows):
-            next_time = index_rows[run_idx + 1]["fetched_at"]
-        else:
-            next_time = "9999-12-31T23:59:59+00:00"
-
-        # Get page snapshots for this run (fetched between this index and the next)
-        page_rows = conn.execute(
-            "SELECT url, content, hash, status_code, error "
-            "FROM page_snapshots WHERE fetched_at >= ? AND fetched_at < ? "
-            "ORDER BY id",
-            (run_time, next_time),
-        ).fetchall()
+    if full:
+        conn.execute("DELETE FROM history_fragments")
+        conn.execute("DELETE FROM history_checkpoints WHERE output_dir = ?", (checkpoint_key,))
+        conn.commit()
+        for f in ("history.html", "history.md"):
+            p = output_dir / f
+            if p.exists():
+                p.unlink()
+        if seg_dir.exists():
+            for p in seg_dir.iterdir():
+                if p.suffix in (".md", ".html"):
+                    p.unlink()
+
+    checkpoint = conn.execute(
+        "SELECT settings_key, last_index_id FROM history_checkpoints WHERE output_dir = ?",
+        (checkpoint_key,),
+    ).fetchone()
+    # Without a checkpoint for these settings the files on disk can't be trusted
+    trusted = checkpoint and checkpoint["settings_key"] == settings_key
+    stored = {
+        r["index_id"]: r for r in conn.execute(
+            "SELECT index_id, window_end, segment FROM history_fragments WHERE settings_key = ?",
+            (settings_key,),
+        )
+    }
 
-        if not page_rows:
+    # A run's fragment is current if its page window hasn't moved since it was rendered
+    dirty_segments = set()
+    window_ends = {}
+    stale = []
+    for run_idx, idx_row in enumerate(index_rows):
+        window_end = index_rows[run_idx + 1]["fetched_at"] if run_idx + 1 < len(index_rows) else None
+        frag = stored.get(idx_row["id"])
+        if frag and frag["window_end"] == window_end:
+            if not trusted or idx_row["id"] > checkpoint["last_index_id"]:
+                dirty_segments.add(frag["segment"])
             continue
-
-        # Build a lookup of this run's pages
-        run_pages = {}
-        for pr in page_rows:
-            run_pages[pr["url"]] = dict(pr)
-
-        # First run or subsequent?
-        if run_idx == 0:
-            timestamp = datetime.fromisoformat(run_time).strftime("%Y-%m-%d %H:%M:%S UTC")
-            report_data = {
-                "timestamp": timestamp,
-                "first_run": True,
-                "total": len(current_urls),
-                "urls": current_urls,
-                "changes": [],
-                "added": [],
-                "removed": [],
-                "errors": [run_pages[u] for u in run_pages if run_pages[u]["error"]],
-            }
-        else:
-            prev_urls = json.loads(index_rows[run_idx - 1]["urls_json"])
-            added = sorted(set(current_urls) - set(prev_urls))
-            removed = sorted(set(prev_urls) - set(current_urls))
-
-            # Get previous run's page snapshots for comparison
-            prev_time = index_rows[run_idx - 1]["fetched_at"]
-            prev_page_rows = conn.execute(
-                "SELECT url, content, hash FROM page_snapshots "
-                "WHERE fetched_at >= ? AND fetched_at < ? ORDER BY id",
-                (prev_time, run_time),
-            ).fetchall()
-            prev_pages = {}
-            for pr in prev_page_rows:
-                prev_pages[pr["url"]] = dict(pr)
-
-            # Compute diffs
-            changes = []
-            for url in current_urls:
-                cur = run_pages.get(url)
-                prev = prev_pages.get(url)
-                if cur and prev and cur["hash"] and prev["hash"]:
-                    if cur["hash"] != prev["hash"] and cur["content"] and prev["content"]:
-                        diff_text = compute_diff(prev["content"], cur["content"], url)
-                        changes.append({"url": url, "diff": diff_text})
-
-            errors = [run_pages[u] for u in run_pages if run_pages[u].get("error")]
-
-            # Filter HTML noise unless --include-html
-            if not include_html:
-                changes = [ch for ch in changes if not (ch["diff"] and is_html_diff(ch["diff"]))]
-
-            timestamp = datetime.fromisoformat(run_time).strftime("%Y-%m-%d %H:%M:%S UTC")
-            report_data = {
-                "timestamp": timestamp,
-                "first_run": False,
-                "total": len(current_urls),
-                "urls": current_urls,
-                "changes": changes,
-                "added": added,
-                "removed": removed,
-                "errors": errors,
-            }
-
-        append_md_history(report_data, output_dir)
-        append_html_history(report_data, output_dir)
-        entries_written += 1
+        if frag:
+            dirty_segments.add(frag["segment"])
+        window_ends[run_idx] = window_end
+        stale.append(run_idx)
+
+    rendered = 0
+    for run_idx, report_data, entry in reconstruct_runs(conn, index_rows, stale, include_html,
+                                                        jobs=jobs, render=True):
+        segment = _history_segment(report_data) if report_data else None
+        conn.execute(
+            "INSERT OR REPLACE INTO history_fragments "
+            "(index_id, settings_key, window_end, segment, md, html) VALUES (?, ?, ?, ?, ?, ?)",
+            (index_rows[run_idx]["id"], settings_key, window_ends[run_idx], segment,
+             entry[0] if entry else None, entry[1] if entry else None),
+        )
+        dirty_segments.add(segment)
+        if not report_data:
+            continue
+        rendered += 1
 
         n_changes = len(report_data["changes"])
         n_added = len(report_data["added"])
         label = "first run" if report_data["first_run"] else f"{n_changes} changes, {n_added} added"
         if HAS_RICH:
-            console.print(f"  [dim]Run {entries_written}: {report_data['timestamp']} — {label}[/dim]")
+            console.print(f"  [dim]Run {run_idx + 1}: {report_data['timestamp']} — {label}[/dim]")
         else:
-            print(f"  Run {entries_written}: {report_data['timestamp']} — {label}")
+            print(f"  Run {run_idx + 1}: {report_data['timestamp']} — {label}")
+    conn.commit()
+    dirty_segments.discard(None)
+
+    # Rewrite affected months from their fragments; drop files for months with no runs
+    run_ids = {r["id"] for r in index_rows}
+    segments: dict[str, list[sqlite3.Row]] = {}
+    for frag in conn.execute(
+        "SELECT index_id, segment, md, html FROM history_fragments "
+        "WHERE settings_key = ? AND md IS NOT NULL ORDER BY index_id",
+        (settings_key,),
+    ):
+        if frag["index_id"] in run_ids:
+            segments.setdefault(frag["segment"], []).append(frag)
+
+    seg_dir.mkdir(parents=True, exist_ok=True)
+    for p in seg_dir.iterdir():
+        if p.suffix in (".md", ".html") and p.stem not in segments:
+            p.unlink()
+    for segment in sorted(segments):
+        if (segment in dirty_segments or not (seg_dir / f"{segment}.md").exists()
+                or not (seg_dir / f"{segment}.html").exists()):
+            _write_history_segment(output_dir, segment, segments[segment])
+            dirty_segments.add(segment)
+    write_history_index(output_dir)
 
+    conn.execute(
+        "INSERT OR REPLACE INTO history_checkpoints (output_dir, settings_key, last_index_id, updated_at) "
+        "VALUES (?, ?, ?, ?)",
+        (checkpoint_key, settings_key, index_rows[-1]["id"], utcnow()),
+    )
+    conn.commit()
+
+    n_runs = sum(len(v) for v in segments.values())
+    rewritten = len(dirty_segments & set(segments))
+    msg = (f"Rebuilt history from {n_runs} runs ({rendered} rendered, "
+           f"{rewritten} of {len(segments)} monthly segments rewritten) → "
+           f"{output_dir}/{HISTORY_DIRNAME}/ (index: history.html, history.md)")
     if HAS_RICH:
-        console.print(f"\n[green]Rebuilt history from {entries_written} runs → "
-                      f"{output_dir}/history.html and {output_dir}/history.md[/green]")
+        console.print(f"\n[green]{msg}[/green]")
     else:
-        print(f"\nRebuilt history from {entries_written} runs → "
-              f"{output_dir}/history.html and {output_dir}/history.md")
+        print(f"\n{msg}")
 
 
 def cmd_dump(args):
-    """Dump latest snapshot content to .md files in a directory."""
+    """Dump latest snapshot content to .md files in a directory.
+
+    Streams the latest snapshots from one query straight into the writers;
+    --glob and --changed-since narrow the set (and then nothing is pruned).
+    """
     conn = init_db()
-    tracked = get_all_tracked_urls(conn)
+    out_dir = Path(args.dir)
+    globs = getattr(args, "glob", None) or []
+    since = getattr(args, "changed_since", None)
+    workers = getattr(args, "workers", None) or DUMP_WORKERS
+    filtered = bool(globs or since)
+    if filtered and getattr(args, "snapshot_tree", None):
+        # A partial tree would become `current` and break hardlink sharing for the next full one
+        print("Error: --snapshot-tree always writes the full tree; it cannot be combined "
+              "with --glob or --changed-since.")
+        sys.exit(1)
 
-    if not tracked:
-        print("No snapshots yet. Run 'check' first.")
+    pages = iter_latest_snapshots(conn, _parse_relative_date(since) if since else None)
+    if globs:
+        pages = ((url, content) for url, content in pages
+                 if any(fnmatch.fnmatch(url_to_filename(url), g) for g in globs))
+
+    if getattr(args, "snapshot_tree", None):
+        run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        tree, linked, written = write_snapshot_tree(Path(args.snapshot_tree), run_id, pages)
+        msg = f"Dumped {written + linked} pages to {tree}/ ({written} written, {linked} hardlinked)"
+    else:
+        written, unchanged, removed = sync_mirror(out_dir, pages, prune=not filtered, workers=workers)
+        if not (written or unchanged or filtered):
+            print("No snapshots yet. Run 'check' first.")
+            return
+        msg = f"Dumped {written} pages to {out_dir}/ ({unchanged} unchanged"
+        msg += f", {removed} removed)" if removed else ")"
+
+    if HAS_RICH:
+        console.print(f"[green]{msg}[/green]")
+    else:
+        print(msg)
+
+
+def cmd_git_export(args):
+    """Export snapshot history into a bare git repository (incremental)."""
+    if not shutil.which("git"):
+        print("Error: 'git' not found in PATH.")
+        sys.exit(1)
+    conn = init_db()
+    repo = Path(args.repo)
+    try:
+        runs, commits = git_export(conn, repo, args.branch, getattr(args, "full", False))
+    except RuntimeError as exc:
+        print(f"Error: {exc}")
+        sys.exit(1)
+    msg = f"Exported {commits} commit(s) from {runs} new run(s) to {repo} ({args.branch})"
+    if HAS_RICH:
+        console.print(f"[green]{msg}[/green]")
+    else:
+        print(msg)
+
+
+def cmd_renormalize(args):
+    """Recompute normalized hashes for every stored snapshot under the current rules.
+
+    Also re-evaluates history: counts how many snapshot-to-snapshot transitions
+    count as changes by raw hash, under the previously stored normalized hashes,
+    and under the current rules.
+    """
+    rules = get_normalize_rules()
+    if getattr(args, "print_rules", False):
+        print(json.dumps(rules, indent=2))
         return
 
-    out_dir = Path(args.dir)
-    out_dir.mkdir(parents=True, exist_ok=True)
+    conn = init_db()
+    fp = normalize_rules_fingerprint(rules)
+    dry_run = getattr(args, "dry_run", False)
 
-    written = 0
-    for row in tracked:
-        # Get full content from the latest snapshot
-        snap = get_last_page_snapshot(conn, row["url"])
-        if not snap or not snap["content"]:
-            continue
-        filename = url_to_filename(row["url"])
-        (out_dir / filename).write_text(snap["content"], encoding="utf-8")
-        written += 1
+    updates = []
+    raw_changes = old_changes = new_changes = 0
+    suppressed: dict[str, int] = {}
+    last = None  # (url, raw, stored_norm, new_norm) of the previous content-bearing snapshot
+    rows = conn.execute(
+        "SELECT id, url, content, hash, normalized_hash, normalize_rules FROM page_snapshots "
+        "WHERE content IS NOT NULL ORDER BY url, id"
+    )
+    for row in rows:
+        new_norm = normalized_sha256(row["content"], rules)
+        old_norm = row["normalized_hash"]
+        if row["normalized_hash"] != new_norm or row["normalize_rules"] != fp:
+            updates.append((new_norm, fp, row["id"]))
+        if last and last[0] == row["url"]:
+            raw_changes += last[1] != row["hash"]
+            # A row stored before normalization has no normalized hash; compare
+            # such pairs by raw hash on both sides rather than raw against normalized
+            if last[2] is None or old_norm is None:
+                old_changes += last[1] != row["hash"]
+            else:
+                old_changes += last[2] != old_norm
+            if last[3] != new_norm:
+                new_changes += 1
+            elif last[1] != row["hash"]:
+                suppressed[row["url"]] = suppressed.get(row["url"], 0) + 1
+        last = (row["url"], row["hash"], old_norm, new_norm)
+
+    if not dry_run and updates:
+        conn.executemany(
+            "UPDATE page_snapshots SET normalized_hash = ?, normalize_rules = ? WHERE id = ?", updates
+        )
+        # Recent-version lists and open reverts hold hashes from the old rules
+        conn.execute("DELETE FROM recent_hashes")
+        conn.execute("UPDATE flap_events SET status = 'superseded' WHERE status = 'pending'")
+        conn.commit()
 
     if HAS_RICH:
-        console.print(f"[green]Dumped {written} pages to {out_dir}/[/green]")
+        table = Table(title=f"Normalization rules {fp}")
+        table.add_column("Transitions counted as changes", style="bold")
+        table.add_column("Count", justify="right")
+        table.add_row("Raw hash", str(raw_changes))
+        table.add_row("Previous normalized hash", str(old_changes))
+        table.add_row("Current rules", str(new_changes))
+        console.print(table)
+    else:
+        print(f"\nNormalization rules {fp}")
+        print(f"Raw hash changes:          {raw_changes}")
+        print(f"Previous normalized hash:  {old_changes}")
+        print(f"Current rules:             {new_changes}")
+
+    if suppressed:
+        print("\nPages with the most suppressed (volatile-only) changes:")
+        for url, n in sorted(suppressed.items(), key=lambda kv: -kv[1])[:10]:
+            print(f"  {n:>4}  {url}")
+
+    if dry_run:
+        print(f"\n(Dry run — {len(updates)} snapshot(s) would be updated.)")
     else:
-        print(f"Dumped {written} pages to {out_dir}/")
+        print(f"\nUpdated normalized hashes on {len(updates)} snapshot(s).")
 
 
 # ── AI Digest ─────────────────────────────────────────────────────────────
@@ -1214,6 +3174,11 @@ For each changed URL, produce a JSON object with:
 - details: 2-3 sentence explanation
 - action_required: what the user should do (null if nothing)
 - tags: array of keyword tags (e.g. ["hooks", "permissions", "cli"])
+- confidence: number from 0 to 1, how sure you are of the category and severity
+
+Some blocks are headed with an id like "shared:1" instead of a URL. Such a block is
+one edit that was made identically on every page listed under it: classify it once,
+using the id as the url.
 
 Severity guide:
 - high: breaking changes, removed features, security-related
@@ -1239,55 +3204,18 @@ _STRUCTURED_DIGEST_SCHEMA = json.dumps({
                     "summary": {"type": "string"},
                     "details": {"type": "string"},
                     "action_required": {"type": ["string", "null"]},
-                    "tags": {"type": "array", "items": {"type": "string"}}
+                    "tags": {"type": "array", "items": {"type": "string"}},
+                    "confidence": {"type": "number", "minimum": 0, "maximum": 1}
                 },
-                "required": ["url", "category", "severity", "summary", "details", "tags"]
+                "required": ["url", "category", "severity", "summary", "details", "tags", "confidence"]
             }
         }
     },
     "required": ["events"]
 })
 
-
-def _extract_report_timestamp(report_text: str) -> str | None:
-    """Extract the timestamp from a report's *Generated: ...* line."""
-    m = re.search(r'\*Generated:\s*(.+?)\*', report_text)
-    return m.group(1).strip() if m else None
-
-
-def _extract_diff_for_url(diffs_text: str, url: str) -> str | None:
-    """Extract the diff block for a specific URL from the diffs section."""
-    marker = f"### {url}\n"
-    idx = diffs_text.find(marker)
-    if idx == -1:
-        return None
-    start = idx + len(marker)
-    # Find next ### or end
-    next_marker = diffs_text.find("\n### ", start)
-    block = diffs_text[start:next_marker] if next_marker != -1 else diffs_text[start:]
-    # Strip code fences
-    block = block.strip()
-    if block.startswith("```diff"):
-        block = block[len("```diff"):].strip()
-    if block.endswith("```"):
-        block = block[:-3].strip()
-    return block
-
-
-def _extract_added_pages(report_text: str) -> list[str]:
-    """Parse URLs from ## Added Pages section."""
-    m = re.search(r'## Added Pages\s*\n((?:- .+\n?)+)', report_text)
-    if not m:
-        return []
-    return re.findall(r'- (https?://\S+)', m.group(1))
-
-
-def _extract_removed_pages(report_text: str) -> list[str]:
-    """Parse URLs from ## Removed Pages section."""
-    m = re.search(r'## Removed Pages\s*\n((?:- .+\n?)+)', report_text)
-    if not m:
-        return []
-    return re.findall(r'- (https?://\S+)', m.group(1))
+# Part of every classification_cache key: editing the prompt or schema invalidates the cache
+CLASSIFY_PROMPT_VERSION = sha256(_STRUCTURED_DIGEST_INSTRUCTION + _STRUCTURED_DIGEST_SCHEMA)[:16]
 
 
 def _parse_relative_date(date_str: str) -> str:
@@ -1352,91 +3280,559 @@ def _generate_digest_html(digest_md: str, output_dir: Path):
     (output_dir / "digest.html").write_text(html, encoding="utf-8")
 
 
-def _run_structured_classification(report_text: str, diffs: str, model: str, env: dict,
-                                   report_dir: Path) -> list[dict] | None:
-    """Run structured JSON classification of changes. Returns list of events or None on failure."""
-    run_timestamp = _extract_report_timestamp(report_text) or utcnow()
-    conn = init_db(report_dir / "snapshots.db" if (report_dir / "snapshots.db").exists() else DB_PATH)
+# ── Heuristic pre-classifier ──
+#
+# Deterministic labels for edits that do not need a model: whitespace and
+# reflow, code-fence language tags, link-target updates and small typo fixes.
+# Each rule compares every change block of a diff (a run of removed/added
+# lines between context lines) on its own, so text moved elsewhere in a page
+# never looks like a reflow; anything the rules do not recognize goes to the
+# model.
 
-    # Check for duplicate events
-    existing = conn.execute(
-        "SELECT COUNT(*) as cnt FROM change_events WHERE run_timestamp = ?", (run_timestamp,)
-    ).fetchone()
-    if existing and existing["cnt"] > 0:
-        if HAS_RICH:
-            console.print(f"[dim]Structured classification already exists for {run_timestamp} "
-                          f"({existing['cnt']} events) — skipping.[/dim]")
+SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2}
+MIN_LLM_SEVERITY = "medium"  # changes the heuristics rate below this skip the model
+_TYPO_MAX_TOKENS = 3         # changed word pairs allowed in a typo fix
+_TYPO_MAX_EDITS = 2          # character edits allowed per misspelled/corrected word
+_TYPO_MIN_LENGTH = 4         # shorter words are too easily a different word
+
+_FENCE_RE = re.compile(r"^(\s*(?:```|~~~))[\w+#.-]*\s*$")
+_LINK_TARGET_RE = re.compile(r"\]\([^)\s]*(?:\s+\"[^\"]*\")?\)|<https?://[^>]+>|https?://[^\s)>\]]+")
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def _diff_change_blocks(diff_text: str) -> list[tuple[list[str], list[str]]]:
+    """(removed lines, added lines) for each contiguous change block of a unified diff.
+
+    The file header is skipped; context lines and hunk headers end a block.
+    """
+    blocks: list[tuple[list[str], list[str]]] = []
+    removed: list[str] = []
+    added: list[str] = []
+    in_hunk = False
+    for line in diff_text.splitlines() + ["@@"]:
+        if in_hunk and line.startswith("-"):
+            removed.append(line[1:])
+        elif in_hunk and line.startswith("+"):
+            added.append(line[1:])
         else:
-            print(f"Structured classification already exists for {run_timestamp} "
-                  f"({existing['cnt']} events) — skipping.")
-        return None
+            if removed or added:
+                blocks.append((removed, added))
+                removed, added = [], []
+            in_hunk = in_hunk or line.startswith("@@")
+    return blocks
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance with adjacent transpositions counted as one edit."""
+    prev2: list[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def _is_typo_pair(old: str, new: str) -> bool:
+    """True if ``new`` reads as a spelling correction of ``old`` rather than another word.
+
+    Rejects digits and identifiers (versions, flags), case-only changes
+    (true → True), words that are the other plus a prefix or suffix
+    (allowed → disallowed, visible → invisible), a changed first letter
+    (increase → decrease) and anything beyond a couple of character edits.
+    """
+    lo, ln = old.lower(), new.lower()
+    return (not any(c.isdigit() or c == "_" for c in old + new)
+            and min(len(old), len(new)) >= _TYPO_MIN_LENGTH
+            and lo != ln
+            and not (lo in ln or ln in lo)
+            and lo[0] == ln[0]
+            and _edit_distance(lo, ln) <= _TYPO_MAX_EDITS)
+
+
+def _typo_fixes(old_text: str, new_text: str) -> int | None:
+    """Number of corrected words if the only edits are typo fixes, else None."""
+    old_tokens, new_tokens = _WORD_RE.findall(old_text), _WORD_RE.findall(new_text)
+    changed = 0
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old_tokens, new_tokens, autojunk=False).get_opcodes():
+        if tag == "equal":
+            continue
+        if tag != "replace" or i2 - i1 != j2 - j1:
+            return None
+        for old, new in zip(old_tokens[i1:i2], new_tokens[j1:j2]):
+            if not _is_typo_pair(old, new):
+                return None
+            changed += 1
+    return changed
 
-    stdin_text = f"## Diffs to classify:\n\n{diffs}"
 
-    if HAS_RICH:
-        console.print("[bold blue]Running structured classification...[/bold blue]")
-    else:
-        print("Running structured classification...")
+def _fence_only(removed: list[str], added: list[str]) -> bool:
+    if len(removed) != len(added):
+        return False
+    for old, new in zip(removed, added):
+        if old == new:
+            continue
+        mo, mn = _FENCE_RE.match(old), _FENCE_RE.match(new)
+        if not (mo and mn and mo.group(1) == mn.group(1)):
+            return False
+    return True
 
-    try:
-        result = subprocess.run(
-            ["claude", "-p", _STRUCTURED_DIGEST_INSTRUCTION, "--model", model,
-             "--max-turns", "1", "--output-format", "json",
-             "--json-schema", _STRUCTURED_DIGEST_SCHEMA],
-            input=stdin_text,
-            capture_output=True, text=True, timeout=300, env=env,
-        )
-    except (subprocess.TimeoutExpired, FileNotFoundError) as exc:
-        print(f"Warning: structured classification failed ({exc}). Continuing with text digest.")
-        return None
 
-    if result.returncode != 0:
-        print(f"Warning: structured classification exited with code {result.returncode}. "
-              f"Continuing with text digest.")
-        return None
+def _links_only(old_text: str, new_text: str) -> bool:
+    return bool(_LINK_TARGET_RE.search(old_text) and _LINK_TARGET_RE.search(new_text)
+                and _LINK_TARGET_RE.sub("<link>", old_text) == _LINK_TARGET_RE.sub("<link>", new_text))
 
-    raw = result.stdout.strip()
-    if not raw:
-        print("Warning: structured classification returned empty output. Continuing with text digest.")
-        return None
 
-    # Parse the JSON — claude CLI may wrap in {"type":"result","result":"..."}
-    try:
-        parsed = json.loads(raw)
-        if isinstance(parsed, dict) and "result" in parsed and isinstance(parsed["result"], str):
-            parsed = json.loads(parsed["result"])
-        if isinstance(parsed, list):
-            parsed = {"events": parsed}
-        events = parsed.get("events", [])
-    except (json.JSONDecodeError, AttributeError) as exc:
-        print(f"Warning: failed to parse structured output ({exc}). Continuing with text digest.")
+def heuristic_classify(diff_text: str) -> dict | None:
+    """Classify a trivial diff without a model, or return None if it needs one.
+
+    Every change block must match the same rule. Whitespace, code-fence and
+    typo edits are rated low; link-target updates medium, since a link may
+    now point somewhere new. Returns an event dict (without url) marked
+    ``classifier: heuristic``.
+    """
+    blocks = [(r, a, "\n".join(r), "\n".join(a)) for r, a in _diff_change_blocks(diff_text or "")]
+    if not blocks:
         return None
 
-    # Store each event
+    def event(kind: str, severity: str, summary: str, details: str) -> dict:
+        return {"category": "clarification", "severity": severity, "summary": summary,
+                "details": details, "action_required": None, "tags": [kind],
+                "classifier": "heuristic"}
+
+    if all(old.split() == new.split() for _, _, old, new in blocks):
+        return event("whitespace", "low", "Whitespace or line-wrapping change",
+                     "Only spacing or line breaks changed; the text is identical.")
+    if all(_fence_only(r, a) for r, a, _, _ in blocks):
+        return event("code-fence", "low", "Code block language tag changed",
+                     "Only the language annotation of one or more code fences changed.")
+    if all(_links_only(old, new) for _, _, old, new in blocks):
+        return event("links", "medium", "Link targets updated",
+                     "Only link destinations changed; the surrounding text is identical.")
+    fixes = [_typo_fixes(old, new) for _, _, old, new in blocks]
+    if None not in fixes and 0 < sum(fixes) <= _TYPO_MAX_TOKENS:
+        return event("typo", "low", "Typo or spelling fix",
+                     "A few words were corrected; the meaning is unchanged.")
+    return None
+
+
+def _heuristic_unit_events(run: dict, min_llm_severity: str) -> dict[str, list[dict]]:
+    """Heuristic events for the diff units of a run that may skip the model, by unit id."""
+    threshold = SEVERITY_RANK.get(min_llm_severity, SEVERITY_RANK[MIN_LLM_SEVERITY])
+    diffs = {g["id"]: g["hunk"] for g in run.get("shared", [])}
+    diffs.update((ch["url"], ch.get("residual_diff", ch["diff"])) for ch in run["changes"])
+    events = {}
+    for unit_id, diff_text in diffs.items():
+        ev = heuristic_classify(diff_text)
+        if ev and SEVERITY_RANK[ev["severity"]] < threshold:
+            events[unit_id] = [{**ev, "url": unit_id}]
+    return events
+
+
+def _store_classified_events(conn: sqlite3.Connection, run: dict, events: list[dict]) -> int:
+    """Store classified "changed" events, fanning shared-change events out to every page."""
+    shared = {g["id"]: g for g in run.get("shared", [])}
+    diffs = {ch["url"]: ch.get("residual_diff", ch["diff"]) for ch in run["changes"]}
     stored = 0
     for ev in events:
-        diff_text = _extract_diff_for_url(diffs, ev.get("url", ""))
-        store_change_event(conn, run_timestamp, ev.get("url", ""), "changed",
-                           diff_text=diff_text, ai_result=ev)
-        stored += 1
-
-    # Also store added/removed pages
-    for url in _extract_added_pages(report_text):
-        store_change_event(conn, run_timestamp, url, "added", ai_result={
+        url = ev.get("url", "")
+        group = shared.get(url)
+        diff_text = group["hunk"] if group else diffs.get(url)
+        for target in (group["urls"] if group else [url]):
+            store_change_event(conn, run["timestamp"], target, "changed",
+                               diff_text=diff_text, ai_result=ev)
+            stored += 1
+    return stored
+
+
+def _store_index_events(conn: sqlite3.Connection, run: dict) -> int:
+    """Store "added" and "removed" events for pages that entered or left the index."""
+    for url in run["added"]:
+        store_change_event(conn, run["timestamp"], url, "added", ai_result={
             "category": "feature", "severity": "medium",
             "summary": f"New documentation page: {url_to_filename(url)}",
             "details": "A new page was added to the documentation index.",
             "tags": ["new-page"],
         })
-        stored += 1
-    for url in _extract_removed_pages(report_text):
-        store_change_event(conn, run_timestamp, url, "removed", ai_result={
+    for url in run["removed"]:
+        store_change_event(conn, run["timestamp"], url, "removed", ai_result={
             "category": "breaking", "severity": "high",
             "summary": f"Documentation page removed: {url_to_filename(url)}",
             "details": "A page was removed from the documentation index.",
             "tags": ["removed-page"],
         })
+    return len(run["added"]) + len(run["removed"])
+
+
+def _store_move_events(conn: sqlite3.Connection, run: dict) -> int:
+    """Store "moved" events for renamed pages and sections that moved between pages.
+
+    Content edits made alongside a move are classified from their own diff;
+    these rows only record the move itself, instead of a breaking removal
+    plus a new-page addition.
+    """
+    stored = 0
+    for mv in run.get("moved", []):
+        old, new = mv["from"], mv["to"]
+        store_change_event(conn, run["timestamp"], new, "moved", ai_result={
+            "category": "clarification", "severity": "low",
+            "summary": f"Page moved: {url_to_filename(old)} → {url_to_filename(new)}",
+            "details": f"The page previously at {old} is now served at {new}.",
+            "tags": ["moved-page"],
+        })
+        stored += 1
+    for mv in run.get("section_moves", []):
+        heading, old, new = mv["section"], mv["from"], mv["to"]
+        store_change_event(conn, run["timestamp"], new, "moved", ai_result={
+            "category": "clarification", "severity": "low",
+            "summary": f"Section moved: {heading} ({url_to_filename(old)} → {url_to_filename(new)})",
+            "details": f"The section '{heading}' moved from {old} to {new}.",
+            "tags": ["moved-section"],
+        })
         stored += 1
+    return stored
+
+
+def _run_prompt_text(run: dict) -> str:
+    """The diffs section sent to the model: each shared hunk once, then per-page diffs.
+
+    A run with no diffs (only index changes) is described by its page lists.
+    """
+    text = "\n".join(_md_diff_blocks(run, "###"))
+    if text.strip():
+        return text
+    lines = []
+    if run["added"]:
+        lines.append("## Added Pages\n")
+        lines.extend(f"- {url}" for url in run["added"])
+    if run["removed"]:
+        lines.append("\n## Removed Pages\n")
+        lines.extend(f"- {url}" for url in run["removed"])
+    lines.extend(_md_move_lines(run, "##"))
+    lines.extend(_md_flap_lines(run, "##"))
+    return "\n".join(lines)
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough input-token estimate (~4 characters per token) used for batch packing."""
+    return len(text) // 4 + 1
+
+
+def batch_classification_units(units: list[tuple[str, str]],
+                               budget: int = CLASSIFY_BATCH_TOKENS) -> list[list[tuple[str, str]]]:
+    """Pack (id, text) units, in order, into batches of at most ``budget`` estimated tokens.
+
+    A unit that alone exceeds the budget is cut at a line boundary and sent
+    in a batch of its own.
+    """
+    batches: list[list[tuple[str, str]]] = []
+    current: list[tuple[str, str]] = []
+    used = 0
+    for unit_id, text in units:
+        cost = _estimate_tokens(text)
+        if cost > budget:
+            text, _ = truncate_diff(text, budget * 4)
+            text += "\n```\n*(diff truncated for classification)*"
+            cost = _estimate_tokens(text)
+        if current and used + cost > budget:
+            batches.append(current)
+            current, used = [], 0
+        current.append((unit_id, text))
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _parse_events(raw: str) -> list[dict]:
+    """Events from a structured-classification response. Raises ValueError if unparseable.
+
+    The CLI tier wraps the answer in {"type": "result", "result": "..."}; the
+    SDK and API tiers return the JSON itself, sometimes inside a code fence.
+    """
+    try:
+        parsed = json.loads(raw)
+    except json.JSONDecodeError:
+        m = re.search(r"\{.*\}", raw, re.DOTALL)
+        if not m:
+            raise ValueError("no JSON object in output")
+        parsed = json.loads(m.group(0))
+    if isinstance(parsed, dict) and "result" in parsed and isinstance(parsed["result"], str):
+        parsed = json.loads(parsed["result"])
+    if isinstance(parsed, list):
+        parsed = {"events": parsed}
+    if not isinstance(parsed, dict):
+        raise ValueError("output is not a JSON object")
+    return list(parsed.get("events", []))
+
+
+def _classify_batch(text: str, model: str, backend: str = "auto") -> list[dict]:
+    """Classify one batch of diff blocks.
+
+    call_claude's errors propagate as raised: RateLimitError once its own
+    retries are spent, RuntimeError or the backend's timeout/transport error
+    otherwise. Unparseable output raises RuntimeError.
+    """
+    raw = call_claude(prompt=_STRUCTURED_DIGEST_INSTRUCTION,
+                      stdin=f"## Diffs to classify:\n\n{text}",
+                      model=model, json_schema=_STRUCTURED_DIGEST_SCHEMA,
+                      backend=backend, max_tokens=8192, timeout=300)
+    try:
+        return _parse_events(raw)
+    except (ValueError, AttributeError) as exc:
+        raise RuntimeError(f"unparseable output ({exc})") from exc
+
+
+def classify_units(units: list[tuple[str, str]], model: str, backend: str = "auto",
+                   batch_tokens: int = CLASSIFY_BATCH_TOKENS,
+                   workers: int = CLASSIFY_WORKERS) -> tuple[list[dict], list[str]]:
+    """Classify (id, text) diff units in token-budgeted batches, ``workers`` at a time.
+
+    A failed batch is retried on its own (up to CLASSIFY_RETRIES times, with
+    backoff) without holding up the others. Rate limits are not retried here:
+    call_claude has already backed off for them. Returns the merged events in
+    unit order and the ids of units whose batch never succeeded.
+    """
+    batches = batch_classification_units(units, batch_tokens)
+
+    def run_batch(batch: list[tuple[str, str]]) -> list[dict]:
+        text = "\n".join(t for _, t in batch)
+        for attempt in range(CLASSIFY_RETRIES + 1):
+            try:
+                return _classify_batch(text, model, backend)
+            except RateLimitError:
+                raise
+            except Exception as exc:  # parse failures, timeouts and transport errors from any tier
+                if attempt == CLASSIFY_RETRIES:
+                    raise
+                print(f"  Warning: classification batch of {len(batch)} failed ({exc}); retrying.")
+                time.sleep(BACKOFF_BASE * 2 ** attempt)
+        return []
+
+    events: list[dict] = []
+    failed: list[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(run_batch, batch) for batch in batches]
+        for batch, future in zip(batches, futures):
+            try:
+                events.extend(future.result())
+            except Exception as exc:
+                print(f"  Warning: classification batch of {len(batch)} failed "
+                      f"({type(exc).__name__}: {exc}).")
+                failed.extend(unit_id for unit_id, _ in batch)
+    return events, failed
+
+
+def _classification_keys(run: dict) -> dict[str, tuple[str, str, str, str]]:
+    """classification_cache key (url, old_hash, new_hash, unit_hash) for each cacheable diff unit.
+
+    Page hashes are the normalized ones (raw for run.json files from before
+    they were recorded), and the unit hash is the normalized hash of the diff
+    text actually classified: a page's remaining diff depends on which hunks
+    the run shared with other pages. A shared hunk is keyed by the hunk
+    itself, so the same edit costs nothing when it lands again. Status-only
+    changes carry no hashes and are not cached.
+    """
+    keys = {}
+    for g in run.get("shared", []):
+        unit_hash = normalized_sha256(g["hunk"])
+        keys[g["id"]] = ("shared", unit_hash, "", unit_hash)
+    for ch in run["changes"]:
+        old_hash = ch.get("old_normalized_hash") or ch.get("old_hash")
+        new_hash = ch.get("new_normalized_hash") or ch.get("new_hash")
+        if old_hash and new_hash:
+            keys[ch["url"]] = (ch["url"], old_hash, new_hash,
+                               normalized_sha256(ch.get("residual_diff", ch["diff"])))
+    return keys
+
+
+def _lookup_cached_units(conn: sqlite3.Connection, run: dict, model: str,
+                        min_llm_severity: str = MIN_LLM_SEVERITY):
+    """Split a run's diff units into ones answered locally and ones for the model.
+
+    Trivial diffs are labelled by heuristic_classify (unless min_llm_severity
+    is "low"), then the classification cache is consulted. Returns (units,
+    keys, answered events by unit id, misses) where units and misses are
+    (id, text) lists and keys maps cacheable unit ids to their cache key.
+    """
+    units = [(unit_id, "\n".join(lines)) for unit_id, lines in _md_diff_units(run, "###")]
+    keys = _classification_keys(run)
+    by_unit = _heuristic_unit_events(run, min_llm_severity)
+    misses = []
+    for unit_id, text in units:
+        if unit_id in by_unit:
+            continue
+        cached = _cached_unit_events(conn, keys, unit_id, model)
+        if cached is None:
+            misses.append((unit_id, text))
+        else:
+            by_unit[unit_id] = cached
+    return units, keys, by_unit, misses
+
+
+def _cached_unit_events(conn: sqlite3.Connection, keys: dict, unit_id: str,
+                        model: str) -> list[dict] | None:
+    """A unit's cached events for ``model``, or None if it is not cacheable or not cached."""
+    if unit_id not in keys:
+        return None
+    cached = get_cached_classification(conn, keys[unit_id], model, CLASSIFY_PROMPT_VERSION)
+    if cached is None:
+        return None
+    # Shared group ids are per-run, so cached events take the current id
+    return [{"classifier": f"llm:{model}", **ev, "url": unit_id} for ev in cached]
+
+
+def _merge_classified(conn: sqlite3.Connection, units: list, keys: dict, by_unit: dict,
+                      misses: list, new_events: list[dict], model: str) -> list[dict]:
+    """Attach newly classified events to their units and cache them per unit.
+
+    Returns all events in unit order; events naming no missed unit come last.
+    Pass empty ``keys`` for events that are already cached.
+    """
+    miss_ids = {unit_id for unit_id, _ in misses}
+    stray = []
+    for ev in new_events:
+        ev.setdefault("classifier", f"llm:{model}")
+        unit_id = ev.get("url", "")
+        if unit_id not in miss_ids:
+            stray.append(ev)
+        else:
+            by_unit.setdefault(unit_id, []).append(ev)
+    for unit_id, _ in misses:
+        if unit_id in keys and unit_id in by_unit:
+            store_cached_classification(conn, keys[unit_id], model, CLASSIFY_PROMPT_VERSION,
+                                        by_unit[unit_id])
+    conn.commit()
+    return [ev for unit_id, _ in units for ev in by_unit.get(unit_id, [])] + stray
+
+
+def _should_escalate(events: list[dict]) -> bool:
+    """True if a fast-tier answer for one diff unit needs the stronger model."""
+    if not events:
+        return True
+    for ev in events:
+        confidence = ev.get("confidence")
+        if (ev.get("category") == "breaking" or ev.get("severity") == "high"
+                or not isinstance(confidence, (int, float)) or confidence < CASCADE_MIN_CONFIDENCE):
+            return True
+    return False
+
+
+def cascade_units(conn: sqlite3.Connection, keys: dict, units: list[tuple[str, str]],
+                  model: str, fast_model: str, backend: str = "auto",
+                  batch_tokens: int = CLASSIFY_BATCH_TOKENS,
+                  workers: int = CLASSIFY_WORKERS) -> tuple[list[dict], list[str], int]:
+    """Classify (id, text) units with ``fast_model``, then re-run on ``model`` the ones
+    that came back breaking or high severity, with low confidence or no events.
+
+    Units whose diff is very large skip the fast tier and go straight to
+    ``model``. Each tier's answers are cached under its own model. An escalated unit the
+    stronger model fails on keeps its fast-tier events. Returns (events in
+    unit order, ids of unclassified units, number escalated).
+    """
+    large = {unit_id for unit_id, text in units if _estimate_tokens(text) > CASCADE_LARGE_DIFF_TOKENS}
+    fast_by_unit: dict[str, list[dict]] = {}
+    fast_misses = []
+    for unit_id, text in units:
+        if unit_id in large:
+            continue
+        cached = _cached_unit_events(conn, keys, unit_id, fast_model)
+        if cached is None:
+            fast_misses.append((unit_id, text))
+        else:
+            fast_by_unit[unit_id] = cached
+    stray: list[dict] = []
+    if fast_misses:
+        new_events, _ = classify_units(fast_misses, fast_model, backend, batch_tokens, workers)
+        merged = _merge_classified(conn, fast_misses, keys, fast_by_unit, fast_misses,
+                                   new_events, fast_model)
+        stray = merged[sum(len(fast_by_unit.get(unit_id, [])) for unit_id, _ in fast_misses):]
+
+    escalate = [(unit_id, text) for unit_id, text in units
+                if unit_id in large or _should_escalate(fast_by_unit.get(unit_id, []))]
+    strong_by_unit: dict[str, list[dict]] = {}
+    if escalate:
+        new_events, _ = classify_units(escalate, model, backend, batch_tokens, workers)
+        _merge_classified(conn, escalate, keys, strong_by_unit, escalate, new_events, model)
+
+    events, failed = [], []
+    for unit_id, _ in units:
+        decided = strong_by_unit.get(unit_id) or fast_by_unit.get(unit_id)
+        if decided:
+            events.extend(decided)
+        else:
+            failed.append(unit_id)
+    return events + stray, failed, len(escalate)
+
+
+def classify_run(conn: sqlite3.Connection, run: dict, model: str, backend: str = "auto",
+                 batch_tokens: int = CLASSIFY_BATCH_TOKENS,
+                 workers: int = CLASSIFY_WORKERS,
+                 min_llm_severity: str = MIN_LLM_SEVERITY,
+                 fast_model: str | None = None) -> tuple[list[dict], list[str], int]:
+    """Classify a run's diffs, answering trivial ones heuristically and the rest from
+    classification_cache where possible.
+
+    Only the remaining misses are sent to the model, and their events are
+    cached per unit. With ``fast_model`` the misses go through cascade_units
+    instead. Returns (events in unit order, ids of unclassified units, diffs
+    answered without a model call).
+    """
+    units, keys, by_unit, misses = _lookup_cached_units(conn, run, model, min_llm_severity)
+    hits = len(by_unit)
+    if misses and fast_model:
+        new_events, failed, escalated = cascade_units(conn, keys, misses, model, fast_model,
+                                                      backend, batch_tokens, workers)
+        print(f"  Cascade: {escalated} of {len(misses)} diff(s) escalated from {fast_model} to {model}.")
+        return _merge_classified(conn, units, {}, by_unit, misses, new_events, model), failed, hits
+    new_events, failed = classify_units(misses, model, backend, batch_tokens, workers) if misses else ([], [])
+    return _merge_classified(conn, units, keys, by_unit, misses, new_events, model), failed, hits
+
+
+def _run_structured_classification(run: dict, model: str, backend: str, report_dir: Path,
+                                   batch_tokens: int = CLASSIFY_BATCH_TOKENS,
+                                   workers: int = CLASSIFY_WORKERS,
+                                   min_llm_severity: str = MIN_LLM_SEVERITY,
+                                   fast_model: str | None = None) -> list[dict] | None:
+    """Run structured JSON classification of changes. Returns list of events or None on failure."""
+    run_timestamp = run["timestamp"]
+    conn = init_db(report_dir / "snapshots.db" if (report_dir / "snapshots.db").exists() else DB_PATH)
+
+    # Check for duplicate events
+    existing = conn.execute(
+        "SELECT COUNT(*) as cnt FROM change_events WHERE run_timestamp = ?", (run_timestamp,)
+    ).fetchone()
+    if existing and existing["cnt"] > 0:
+        if HAS_RICH:
+            console.print(f"[dim]Structured classification already exists for {run_timestamp} "
+                          f"({existing['cnt']} events) — skipping.[/dim]")
+        else:
+            print(f"Structured classification already exists for {run_timestamp} "
+                  f"({existing['cnt']} events) — skipping.")
+        return None
+
+    if HAS_RICH:
+        console.print("[bold blue]Running structured classification...[/bold blue]")
+    else:
+        print("Running structured classification...")
+
+    events, failed, hits = classify_run(conn, run, model, backend, batch_tokens, workers,
+                                        min_llm_severity, fast_model)
+    if failed and not events:
+        print("Warning: structured classification failed. Continuing with text digest.")
+        return None
+    if failed:
+        print(f"Warning: {len(failed)} diff(s) could not be classified: {', '.join(failed)}")
+    if hits:
+        print(f"  {hits} diff(s) answered without a model call (heuristics or cache).")
+
+    # Store each event, plus added/removed/moved pages
+    stored = _store_classified_events(conn, run, events)
+    stored += _store_index_events(conn, run)
+    stored += _store_move_events(conn, run)
 
     conn.commit()
     if HAS_RICH:
@@ -1447,13 +3843,12 @@ def _run_structured_classification(report_text: str, diffs: str, model: str, env
     return events
 
 
-def _create_gh_issues(report_text: str, report_dir: Path, gh_repo: str | None = None):
-    """Create GitHub issues for breaking changes. Called when --gh-issue is set."""
+def _create_gh_issues(run_timestamp: str, report_dir: Path, gh_repo: str | None = None):
+    """Create GitHub issues for a run's breaking changes. Called when --gh-issue is set."""
     if not shutil.which("gh"):
         print("Warning: 'gh' CLI not found — skipping GitHub issue creation.")
         return
 
-    run_timestamp = _extract_report_timestamp(report_text) or utcnow()
     conn = init_db(report_dir / "snapshots.db" if (report_dir / "snapshots.db").exists() else DB_PATH)
     events = get_change_events_for_run(conn, run_timestamp)
     breaking = [e for e in events if e["category"] == "breaking" and not e["gh_issue_url"]]
@@ -1499,47 +3894,63 @@ def _create_gh_issues(report_text: str, report_dir: Path, gh_repo: str | None =
         print(f"Created {created} GitHub issue(s) for breaking changes.")
 
 
+def _require_backend(requested: str) -> str:
+    """Resolve the LLM backend for digest/backfill, exiting with guidance if none is usable."""
+    # Allow running inside a Claude Code session (nested invocation); the SDK
+    # and CLI tiers both inherit this process's environment
+    os.environ.pop("CLAUDECODE", None)
+    try:
+        return resolve_backend(requested or "auto")
+    except RuntimeError as exc:
+        print(f"Error: {exc}")
+        sys.exit(1)
+
+
+def _print_api_usage():
+    """Summarize API-tier token use, including prompt-cache hits, if any API calls were made."""
+    usage = get_api_usage()
+    if not usage["calls"]:
+        return
+    msg = (f"API: {usage['calls']} call(s), {usage['input_tokens']} input tokens, "
+           f"{usage['cache_read_input_tokens']} read from prompt cache, "
+           f"{usage['cache_creation_input_tokens']} written to it, "
+           f"{usage['output_tokens']} output tokens")
+    if HAS_RICH:
+        console.print(f"[dim]{msg}[/dim]")
+    else:
+        print(msg)
+
+
 def cmd_digest(args):
     """AI-analyze latest diffs into an actionable digest."""
     report_dir = Path(args.report) if args.report else DB_DIR
-    report_path = report_dir / "report.md"
+    run = load_run_artifact(report_dir)
 
-    if not report_path.exists():
-        print("No report found. Run 'check' first to generate a report.")
+    if run is None:
+        print(f"No run artifact ({RUN_ARTIFACT}) found. Run 'check' first.")
         sys.exit(1)
 
-    report_text = report_path.read_text(encoding="utf-8")
-
     # Check for no changes
-    if "| Changed | 0 |" in report_text and "| Added | 0 |" in report_text:
+    if run["first_run"] or not (run["changes"] or run["added"] or run["removed"] or run["moved"]):
         print("No changes to digest.")
         return
 
-    # Extract diffs section to minimize token usage
-    diffs_marker = "\n## Diffs\n"
-    if diffs_marker in report_text:
-        diffs = report_text[report_text.index(diffs_marker) + len(diffs_marker):]
-    else:
-        # No diffs section — might be added/removed pages only
-        diffs = report_text
-
+    diffs = _run_prompt_text(run)
     if not diffs.strip():
-        print("No diffs found in report.")
+        print("No diffs found in run.")
         return
 
-    # Check that claude CLI is available
-    if not shutil.which("claude"):
-        print("Error: 'claude' CLI not found in PATH.")
-        print("Install Claude Code: https://docs.anthropic.com/en/docs/claude-code")
-        sys.exit(1)
-
     model = getattr(args, "model", "sonnet")
-
-    # Allow running inside a Claude Code session (nested invocation)
-    env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
+    backend = _require_backend(getattr(args, "backend", "auto"))
 
     # Phase 1: Structured classification (stores events in DB)
-    _run_structured_classification(report_text, diffs, model, env, report_dir)
+    _run_structured_classification(
+        run, model, backend, report_dir,
+        batch_tokens=getattr(args, "batch_tokens", None) or CLASSIFY_BATCH_TOKENS,
+        workers=getattr(args, "workers", None) or CLASSIFY_WORKERS,
+        min_llm_severity=getattr(args, "min_llm_severity", None) or MIN_LLM_SEVERITY,
+        fast_model=getattr(args, "cascade", None),
+    )
 
     # Phase 2: Text digest (existing behavior)
     stdin_text = f"## Diffs to analyze:\n\n{diffs}"
@@ -1550,28 +3961,10 @@ def cmd_digest(args):
         print("Generating AI digest...")
 
     try:
-        result = subprocess.run(
-            ["claude", "-p", _DIGEST_INSTRUCTION, "--model", model,
-             "--max-turns", "1", "--output-format", "text"],
-            input=stdin_text,
-            capture_output=True, text=True, timeout=300, env=env,
-        )
-    except subprocess.TimeoutExpired:
-        print("Error: claude CLI timed out after 300 seconds.")
-        sys.exit(1)
-    except FileNotFoundError:
-        print("Error: 'claude' CLI not found.")
-        sys.exit(1)
-
-    if result.returncode != 0:
-        print(f"Error: claude CLI exited with code {result.returncode}")
-        if result.stderr:
-            print(result.stderr[:500])
-        sys.exit(1)
-
-    digest_text = result.stdout.strip()
-    if not digest_text:
-        print("Error: claude CLI returned empty output.")
+        digest_text = call_claude(prompt=_DIGEST_INSTRUCTION, stdin=stdin_text, model=model,
+                                  backend=backend, timeout=300).strip()
+    except Exception as exc:  # RuntimeError/RateLimitError, or a timeout from any tier
+        print(f"Error: digest generation failed ({type(exc).__name__}: {str(exc)[:500]})")
         sys.exit(1)
 
     # Write outputs
@@ -1599,6 +3992,7 @@ def cmd_digest(args):
         print("=" * 60)
 
     print(f"\nDigest written to {digest_md_path} and {report_dir / 'digest.html'}")
+    _print_api_usage()
 
     if not getattr(args, "no_open", False):
         digest_html_path = report_dir / "digest.html"
@@ -1610,7 +4004,7 @@ def cmd_digest(args):
     # Phase 3: GitHub issue creation (if requested)
     if getattr(args, "gh_issue", False):
         gh_repo = getattr(args, "gh_repo", None)
-        _create_gh_issues(report_text, report_dir, gh_repo)
+        _create_gh_issues(run["timestamp"], report_dir, gh_repo)
 
 
 def cmd_query(args):
@@ -1719,12 +4113,73 @@ def cmd_query(args):
                     print(f"  Action: {r['action_required']}")
 
 
+def cmd_eval_heuristics(args):
+    """Measure the heuristic pre-classifier against existing model-labelled events."""
+    conn = init_db()
+    min_llm_severity = getattr(args, "min_llm_severity", None) or MIN_LLM_SEVERITY
+    threshold = SEVERITY_RANK[min_llm_severity]
+    limit = getattr(args, "limit", 10)
+
+    # One unit per diff per run: shared-change events are fanned out to every page
+    units: dict[tuple[str, str], list[sqlite3.Row]] = {}
+    for r in conn.execute(
+        "SELECT run_timestamp, page_name, category, severity, summary, diff_text "
+        "FROM change_events WHERE event_type = 'changed' AND diff_text IS NOT NULL "
+        "AND COALESCE(classifier, 'llm') != 'heuristic' ORDER BY id"
+    ):
+        units.setdefault((r["run_timestamp"], r["diff_text"]), []).append(r)
+    if not units:
+        print("No model-classified change events to evaluate. Run backfill or digest first.")
+        return
+
+    covered = cat_agree = sev_agree = skipped = 0
+    disagreements = []
+    for (_, diff_text), rows in units.items():
+        ev = heuristic_classify(diff_text)
+        if not ev:
+            continue
+        covered += 1
+        llm_sev = max(SEVERITY_RANK.get(r["severity"], 0) for r in rows)
+        same_cat = any(r["category"] == ev["category"] for r in rows)
+        same_sev = llm_sev <= SEVERITY_RANK[ev["severity"]]
+        cat_agree += same_cat
+        sev_agree += same_sev
+        if SEVERITY_RANK[ev["severity"]] < threshold:
+            skipped += 1
+        if not (same_cat and same_sev):
+            disagreements.append((ev, rows[0]))
+
+    def pct(n: int, d: int) -> str:
+        return f"{n / d:.0%}" if d else "—"
+
+    lines = [
+        f"Model-classified diffs:    {len(units)}",
+        f"Recognized by heuristics:  {covered} ({pct(covered, len(units))})",
+        f"Category agreement:        {cat_agree}/{covered} ({pct(cat_agree, covered)})",
+        f"Severity agreement:        {sev_agree}/{covered} ({pct(sev_agree, covered)})",
+        f"Model calls saved at --min-llm-severity {min_llm_severity}: {skipped} diff(s)",
+    ]
+    if HAS_RICH:
+        console.print("[bold]Heuristic pre-classifier vs. model labels[/bold]")
+    else:
+        print("Heuristic pre-classifier vs. model labels")
+    for line in lines:
+        print(f"  {line}")
+    if disagreements:
+        print(f"\nDisagreements (showing {min(limit, len(disagreements))} of {len(disagreements)}):")
+        for ev, r in disagreements[:limit]:
+            print(f"  {r['run_timestamp'][:19]}  {r['page_name'] or '—'}")
+            print(f"    heuristic: {ev['category']}/{ev['severity']} ({ev['tags'][0]})")
+            print(f"    model:     {r['category'] or '—'}/{r['severity'] or '—'}  {r['summary'] or ''}")
+
+
 def cmd_backfill(args):
     """Populate change_events from existing snapshot history."""
     conn = init_db()
     model = getattr(args, "model", "sonnet")
     dry_run = getattr(args, "dry_run", False)
     include_html = getattr(args, "include_html", False)
+    jobs = getattr(args, "jobs", 1) or 1
 
     # Get all index snapshots in order
     index_rows = conn.execute(
@@ -1735,75 +4190,35 @@ def cmd_backfill(args):
         print("No snapshots in database. Run 'check' first.")
         return
 
-    if not shutil.which("claude") and not dry_run:
-        print("Error: 'claude' CLI not found in PATH.")
-        sys.exit(1)
-
-    env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
+    backend = getattr(args, "backend", "auto")
+    batch = getattr(args, "batch", False)
+    if batch and not dry_run:
+        # Finish (or report on) batches submitted earlier before looking for new work
+        try:
+            if _resume_backfill_batches(conn, index_rows, getattr(args, "wait", False)):
+                return
+        except RuntimeError as exc:
+            print(f"Error: {exc}")
+            sys.exit(1)
+    elif not dry_run:
+        backend = _require_backend(backend)
+
+    # Skip runs that already have change events
+    classified_ts = {
+        r["run_timestamp"] for r in conn.execute("SELECT DISTINCT run_timestamp FROM change_events")
+    }
+    pending = [
+        run_idx for run_idx in range(1, len(index_rows))
+        if datetime.fromisoformat(index_rows[run_idx]["fetched_at"]).strftime("%Y-%m-%d %H:%M:%S UTC")
+        not in classified_ts
+    ]
 
     runs_to_classify = []
-    for run_idx in range(1, len(index_rows)):
-        idx_row = index_rows[run_idx]
-        run_time = idx_row["fetched_at"]
-        current_urls = json.loads(idx_row["urls_json"])
-
-        # Check if already classified
-        existing = conn.execute(
-            "SELECT COUNT(*) as cnt FROM change_events WHERE run_timestamp = ?",
-            (datetime.fromisoformat(run_time).strftime("%Y-%m-%d %H:%M:%S UTC"),)
-        ).fetchone()
-        if existing and existing["cnt"] > 0:
-            continue
-
-        # Determine time window
-        prev_time = index_rows[run_idx - 1]["fetched_at"]
-        if run_idx + 1 < len(index_rows):
-            next_time = index_rows[run_idx + 1]["fetched_at"]
-        else:
-            next_time = "9999-12-31T23:59:59+00:00"
-
-        prev_urls = json.loads(index_rows[run_idx - 1]["urls_json"])
-
-        # Get page snapshots for both runs
-        cur_pages = {}
-        for pr in conn.execute(
-            "SELECT url, content, hash FROM page_snapshots "
-            "WHERE fetched_at >= ? AND fetched_at < ? ORDER BY id",
-            (run_time, next_time),
-        ).fetchall():
-            cur_pages[pr["url"]] = dict(pr)
-
-        prev_pages = {}
-        for pr in conn.execute(
-            "SELECT url, content, hash FROM page_snapshots "
-            "WHERE fetched_at >= ? AND fetched_at < ? ORDER BY id",
-            (prev_time, run_time),
-        ).fetchall():
-            prev_pages[pr["url"]] = dict(pr)
-
-        # Compute diffs
-        changes = []
-        for url in current_urls:
-            cur = cur_pages.get(url)
-            prev = prev_pages.get(url)
-            if cur and prev and cur["hash"] and prev["hash"]:
-                if cur["hash"] != prev["hash"] and cur["content"] and prev["content"]:
-                    diff_text = compute_diff(prev["content"], cur["content"], url)
-                    if not include_html and is_html_diff(diff_text):
-                        continue
-                    changes.append({"url": url, "diff": diff_text})
-
-        added = sorted(set(current_urls) - set(prev_urls))
-        removed = sorted(set(prev_urls) - set(current_urls))
-
-        if changes or added or removed:
-            timestamp = datetime.fromisoformat(run_time).strftime("%Y-%m-%d %H:%M:%S UTC")
-            runs_to_classify.append({
-                "timestamp": timestamp,
-                "changes": changes,
-                "added": added,
-                "removed": removed,
-            })
+    index_ids = []  # index snapshot id of each run, for --batch
+    for run_idx, run, _ in reconstruct_runs(conn, index_rows, pending, include_html, jobs=jobs):
+        if run and (run["changes"] or run["added"] or run["removed"] or run["moved"]):
+            runs_to_classify.append(run)
+            index_ids.append(index_rows[run_idx]["id"])
 
     if not runs_to_classify:
         print("No unclassified runs found. All runs already have change events.")
@@ -1816,72 +4231,49 @@ def cmd_backfill(args):
             n_ch = len(run["changes"])
             n_add = len(run["added"])
             n_rm = len(run["removed"])
-            print(f"  {run['timestamp']}: {n_ch} changes, {n_add} added, {n_rm} removed")
+            n_mv = len(run["moved"])
+            print(f"  {run['timestamp']}: {n_ch} changes, {n_add} added, {n_rm} removed, {n_mv} moved")
         print("\n(Dry run — no API calls made.)")
         return
 
+    batch_tokens = getattr(args, "batch_tokens", None) or CLASSIFY_BATCH_TOKENS
+    workers = getattr(args, "workers", None) or CLASSIFY_WORKERS
+    min_llm_severity = getattr(args, "min_llm_severity", None) or MIN_LLM_SEVERITY
+    fast_model = getattr(args, "cascade", None)
+    if batch:
+        if fast_model:
+            print(f"Note: --cascade is not applied to --batch; submitting every diff to {model}.")
+        try:
+            batch_id = _submit_backfill_batch(conn, list(zip(index_ids, runs_to_classify)), model,
+                                              include_html, batch_tokens, min_llm_severity)
+            if batch_id and getattr(args, "wait", False):
+                _resume_backfill_batches(conn, index_rows, True)
+            elif batch_id:
+                print("Run 'backfill --batch' again to collect the results (or add --wait).")
+        except RuntimeError as exc:
+            print(f"Error: {exc}")
+            sys.exit(1)
+        _print_api_usage()
+        return
+
     classified = 0
     for run in runs_to_classify:
-        # Build diffs text
-        diffs_lines = []
-        for ch in run["changes"]:
-            diffs_lines.append(f"### {ch['url']}\n")
-            diffs_lines.append("```diff")
-            diffs_lines.append(ch["diff"])
-            diffs_lines.append("```\n")
-        diffs_text = "\n".join(diffs_lines)
-
-        # Build minimal report text for helpers
-        report_text = f"*Generated: {run['timestamp']}*\n"
-        if run["added"]:
-            report_text += "\n## Added Pages\n\n" + "\n".join(f"- {u}" for u in run["added"]) + "\n"
-        if run["removed"]:
-            report_text += "\n## Removed Pages\n\n" + "\n".join(f"- {u}" for u in run["removed"]) + "\n"
-
-        if diffs_text.strip():
-            stdin_text = f"## Diffs to classify:\n\n{diffs_text}"
+        # One unit per diff, with hunks shared across pages shown once
+        if next(_md_diff_units(run, "###"), None):
             if HAS_RICH:
                 console.print(f"[dim]Classifying run {run['timestamp']}...[/dim]")
             else:
                 print(f"Classifying run {run['timestamp']}...")
 
-            try:
-                result = subprocess.run(
-                    ["claude", "-p", _STRUCTURED_DIGEST_INSTRUCTION, "--model", model,
-                     "--max-turns", "1", "--output-format", "json",
-                     "--json-schema", _STRUCTURED_DIGEST_SCHEMA],
-                    input=stdin_text,
-                    capture_output=True, text=True, timeout=300, env=env,
-                )
-                if result.returncode == 0 and result.stdout.strip():
-                    parsed = json.loads(result.stdout.strip())
-                    if isinstance(parsed, dict) and "result" in parsed and isinstance(parsed["result"], str):
-                        parsed = json.loads(parsed["result"])
-                    events = parsed.get("events", [])
-                    for ev in events:
-                        diff_text = _extract_diff_for_url(diffs_text, ev.get("url", ""))
-                        store_change_event(conn, run["timestamp"], ev.get("url", ""), "changed",
-                                           diff_text=diff_text, ai_result=ev)
-                else:
-                    print(f"  Warning: classification failed for {run['timestamp']}")
-            except (subprocess.TimeoutExpired, json.JSONDecodeError) as exc:
-                print(f"  Warning: classification failed for {run['timestamp']}: {exc}")
-
-        # Store added/removed pages
-        for url in run["added"]:
-            store_change_event(conn, run["timestamp"], url, "added", ai_result={
-                "category": "feature", "severity": "medium",
-                "summary": f"New documentation page: {url_to_filename(url)}",
-                "details": "A new page was added to the documentation index.",
-                "tags": ["new-page"],
-            })
-        for url in run["removed"]:
-            store_change_event(conn, run["timestamp"], url, "removed", ai_result={
-                "category": "breaking", "severity": "high",
-                "summary": f"Documentation page removed: {url_to_filename(url)}",
-                "details": "A page was removed from the documentation index.",
-                "tags": ["removed-page"],
-            })
+            events, failed, _ = classify_run(conn, run, model, backend, batch_tokens, workers,
+                                             min_llm_severity, fast_model)
+            _store_classified_events(conn, run, events)
+            if failed:
+                print(f"  Warning: classification failed for {len(failed)} diff(s) in {run['timestamp']}")
+
+        # Store added/removed/moved pages
+        _store_index_events(conn, run)
+        _store_move_events(conn, run)
 
         conn.commit()
         classified += 1
@@ -1890,6 +4282,163 @@ def cmd_backfill(args):
         console.print(f"\n[green]Backfilled {classified} run(s) into change_events table.[/green]")
     else:
         print(f"\nBackfilled {classified} run(s) into change_events table.")
+    _print_api_usage()
+
+
+def _store_backfilled_run(conn: sqlite3.Connection, run: dict, events: list[dict]):
+    """Store a backfilled run's classified events plus its added/removed/moved pages."""
+    _store_classified_events(conn, run, events)
+    _store_index_events(conn, run)
+    _store_move_events(conn, run)
+    conn.commit()
+
+
+def _submit_backfill_batch(conn: sqlite3.Connection, runs: list[tuple[int, dict]], model: str,
+                           include_html: bool, batch_tokens: int,
+                           min_llm_severity: str = MIN_LLM_SEVERITY) -> str | None:
+    """Submit the uncached diffs of (index snapshot id, run) pairs as one Message Batch.
+
+    Runs answered entirely from the cache (or with only index events) are
+    stored right away. Each request is one token-budgeted group of a run's
+    diffs; classification_batches maps request ids back to the run's index
+    snapshot and unit ids so results can be ingested later. Returns the batch
+    id, or None if nothing needed the model.
+    """
+    requests = []
+    plan = {}
+    stored = 0
+    for index_id, run in runs:
+        units, keys, by_unit, misses = _lookup_cached_units(conn, run, model, min_llm_severity)
+        if not misses:
+            _store_backfilled_run(conn, run, _merge_classified(conn, units, keys, by_unit, [], [], model))
+            stored += 1
+            continue
+        for n, group in enumerate(batch_classification_units(misses, batch_tokens)):
+            custom_id = f"i{index_id}-{n}"
+            requests.append({
+                "custom_id": custom_id,
+                "prompt": _STRUCTURED_DIGEST_INSTRUCTION,
+                "stdin": "## Diffs to classify:\n\n" + "\n".join(t for _, t in group),
+                "json_schema": _STRUCTURED_DIGEST_SCHEMA,
+            })
+            plan[custom_id] = {"index_id": index_id, "units": [unit_id for unit_id, _ in group]}
+    if stored:
+        print(f"Stored {stored} run(s) answered entirely from the classification cache.")
+    if not requests:
+        return None
+
+    batch_id = submit_batch(requests, model=model, max_tokens=8192)
+    now = utcnow()
+    conn.execute(
+        "INSERT INTO classification_batches (batch_id, model, prompt_version, include_html, "
+        "min_llm_severity, requests_json, status, submitted_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, 'submitted', ?, ?)",
+        (batch_id, model, CLASSIFY_PROMPT_VERSION, int(include_html), min_llm_severity,
+         json.dumps(plan), now, now),
+    )
+    conn.commit()
+    n_runs = len({p["index_id"] for p in plan.values()})
+    if HAS_RICH:
+        console.print(f"[green]Submitted batch {batch_id}: {len(requests)} request(s) "
+                      f"covering {n_runs} run(s).[/green]")
+    else:
+        print(f"Submitted batch {batch_id}: {len(requests)} request(s) covering {n_runs} run(s).")
+    return batch_id
+
+
+def _ingest_backfill_batch(conn: sqlite3.Connection, row: sqlite3.Row,
+                           index_rows: list[sqlite3.Row]) -> tuple[int, int]:
+    """Store the results of an ended batch. Returns (runs stored, runs left for a later backfill).
+
+    Every successfully classified diff is cached, even in a run where another
+    request failed; such a run is left unclassified, so the next backfill
+    sends only its failed diffs. Results of a batch submitted under an older
+    CLASSIFY_PROMPT_VERSION are stored but not cached.
+    """
+    plan = json.loads(row["requests_json"])
+    model = row["model"]
+    events_by_index: dict[int, list[dict]] = {}
+    failed_index: set[int] = set()
+    for custom_id, text, error in batch_results(row["batch_id"]):
+        if custom_id not in plan:
+            continue
+        index_id = plan[custom_id]["index_id"]
+        events = None
+        if text is not None:
+            try:
+                events = _parse_events(text)
+            except (ValueError, AttributeError) as exc:
+                error = f"unparseable output ({exc})"
+        if events is None:
+            print(f"  Warning: batch request {custom_id} failed ({error}).")
+            failed_index.add(index_id)
+            continue
+        events_by_index.setdefault(index_id, []).extend(events)
+    answered = set(events_by_index) | failed_index
+    failed_index |= {p["index_id"] for p in plan.values()} - answered
+
+    positions = {r["id"]: i for i, r in enumerate(index_rows)}
+    run_idxs = sorted(positions[i] for i in {p["index_id"] for p in plan.values()} if i in positions)
+    stored = left = 0
+    for run_idx, run, _ in reconstruct_runs(conn, index_rows, run_idxs, bool(row["include_html"])):
+        if run is None:
+            continue
+        index_id = index_rows[run_idx]["id"]
+        # The same cut-off as at submission, so heuristic units are neither
+        # answered twice nor dropped
+        units, keys, by_unit, misses = _lookup_cached_units(
+            conn, run, model, row["min_llm_severity"] or MIN_LLM_SEVERITY)
+        if row["prompt_version"] != CLASSIFY_PROMPT_VERSION:
+            keys = {}  # answers to an older prompt must not be cached under the current one
+        events = _merge_classified(conn, units, keys, by_unit, misses,
+                                   events_by_index.get(index_id, []), model)
+        already = conn.execute("SELECT COUNT(*) AS cnt FROM change_events WHERE run_timestamp = ?",
+                               (run["timestamp"],)).fetchone()["cnt"]
+        if already:
+            continue  # classified by a digest or a plain backfill in the meantime
+        if index_id in failed_index:
+            left += 1
+            continue
+        _store_backfilled_run(conn, run, events)
+        stored += 1
+    conn.execute("UPDATE classification_batches SET status = 'ingested', updated_at = ? "
+                 "WHERE batch_id = ?", (utcnow(), row["batch_id"]))
+    conn.commit()
+    return stored, left
+
+
+def _resume_backfill_batches(conn: sqlite3.Connection, index_rows: list[sqlite3.Row],
+                             wait: bool) -> bool:
+    """Poll submitted backfill batches and ingest the ones that have ended.
+
+    With ``wait``, polls every BATCH_POLL_SECONDS until all have ended.
+    Returns True if a batch is still in progress.
+    """
+    rows = conn.execute("SELECT * FROM classification_batches WHERE status = 'submitted' "
+                        "ORDER BY submitted_at").fetchall()
+    in_progress = False
+    for row in rows:
+        status = poll_batch(row["batch_id"])
+        while wait and status["status"] != "ended":
+            time.sleep(BATCH_POLL_SECONDS)
+            status = poll_batch(row["batch_id"])
+        counts = status["counts"]
+        if status["status"] != "ended":
+            in_progress = True
+            print(f"Batch {row['batch_id']} is {status['status']}: {counts['processing']} processing, "
+                  f"{counts['succeeded']} succeeded, {counts['errored']} errored.")
+            continue
+        stored, left = _ingest_backfill_batch(conn, row, index_rows)
+        msg = f"Ingested batch {row['batch_id']}: backfilled {stored} run(s)"
+        if left:
+            msg += f"; {left} run(s) had failed requests and will be retried by the next backfill"
+        if HAS_RICH:
+            console.print(f"[green]{msg}.[/green]")
+        else:
+            print(f"{msg}.")
+    if in_progress:
+        print("Run 'backfill --batch' again later to collect the results.")
+    return in_progress
 
 
 def cmd_urls(args):
@@ -1940,8 +4489,12 @@ def build_parser() -> argparse.ArgumentParser:
   %(prog)s history                      show recent snapshot history (all pages)
   %(prog)s history URL                  show history for one page
   %(prog)s diff URL                     show diff between last two snapshots of a page
+  %(prog)s blame URL                    show when each line of a page first appeared
+  %(prog)s blame URL --grep FLAG        find when a sentence or flag was added
   %(prog)s urls                         list all tracked URLs with status
+  %(prog)s git-export ~/docs.git        commit every run into a bare git repo (incremental)
   %(prog)s rebuild-history               regenerate history files from DB
+  %(prog)s renormalize --dry-run        re-evaluate history under the current normalize rules
   %(prog)s dump                         export latest snapshots to data-claude/pages/
   %(prog)s dump ~/review                export to a custom directory
   %(prog)s digest                       AI-analyze latest diffs into an actionable digest
@@ -1952,7 +4505,8 @@ def build_parser() -> argparse.ArgumentParser:
   %(prog)s query "hooks" --severity high  keyword search with severity filter
   %(prog)s query --json | jq .          machine-readable output
   %(prog)s backfill                     classify historical changes with AI
-  %(prog)s backfill --dry-run           preview what would be classified""",
+  %(prog)s backfill --dry-run           preview what would be classified
+  %(prog)s eval-heuristics              compare the heuristic pre-classifier with model labels""",
     )
     sub = parser.add_subparsers(dest="command")
 
@@ -1980,10 +4534,24 @@ def build_parser() -> argparse.ArgumentParser:
         "--dump", metavar="DIR",
         help="Override page dump directory (default: data-claude/pages)",
     )
+    check_p.add_argument(
+        "--git-export", metavar="REPO",
+        help="After the run, append it as a commit to the bare git repository REPO (see git-export)",
+    )
+    check_p.add_argument(
+        "--snapshot-tree", metavar="DIR",
+        help="Also keep a versioned copy of the pages per run in DIR/<run-id>/, "
+             "hardlinking unchanged files, with DIR/current pointing at the latest",
+    )
     check_p.add_argument(
         "--report", metavar="DIR",
         help="Override report output directory (default: data-claude/)",
     )
+    check_p.add_argument(
+        "--max-diff-bytes", type=int, metavar="N",
+        help=f"Truncate diffs inlined in the report at N bytes; full diffs are always "
+             f"written to <report dir>/diffs/; 0 disables the cap (default: {MAX_DIFF_BYTES})",
+    )
     check_p.add_argument(
         "--include-html", action="store_true",
         help="Include diffs that are predominantly HTML/script noise (suppressed by default)",
@@ -2003,6 +4571,17 @@ def build_parser() -> argparse.ArgumentParser:
     )
     diff_p.add_argument("url", help="The page URL to diff")
 
+    # blame
+    blame_p = sub.add_parser(
+        "blame",
+        help="Show the run in which each current line of a page first appeared",
+    )
+    blame_p.add_argument("url", help="The page URL to blame")
+    blame_p.add_argument(
+        "--grep", metavar="PATTERN",
+        help="Only show lines matching PATTERN (case-insensitive regex)",
+    )
+
     # urls
     sub.add_parser(
         "urls",
@@ -2012,7 +4591,7 @@ def build_parser() -> argparse.ArgumentParser:
     # rebuild-history
     rebuild_p = sub.add_parser(
         "rebuild-history",
-        help="Rebuild history.html and history.md from all stored snapshots",
+        help="Rebuild the history files from stored snapshots (incremental; --full for everything)",
     )
     rebuild_p.add_argument(
         "--report", metavar="DIR",
@@ -2022,6 +4601,45 @@ def build_parser() -> argparse.ArgumentParser:
         "--include-html", action="store_true",
         help="Include diffs that are predominantly HTML/script noise",
     )
+    rebuild_p.add_argument(
+        "--full", action="store_true",
+        help="Discard stored per-run fragments and re-render every run",
+    )
+    rebuild_p.add_argument(
+        "--jobs", type=int, default=1, metavar="N",
+        help="Reconstruct runs in N worker processes (default: 1)",
+    )
+
+    # git-export
+    gitx_p = sub.add_parser(
+        "git-export",
+        help="Export snapshot history into a bare git repository, one commit per run",
+        description="Stream every run's page changes into `git fast-import`. The first export "
+                    "writes the whole history; later ones append only new runs.",
+    )
+    gitx_p.add_argument("repo", help="Bare repository path (created if missing)")
+    gitx_p.add_argument("--branch", default="main", help="Branch to write (default: main)")
+    gitx_p.add_argument(
+        "--full", action="store_true",
+        help="Re-export the whole history, replacing the branch",
+    )
+
+    # renormalize
+    renorm_p = sub.add_parser(
+        "renormalize",
+        help="Recompute normalized hashes for all snapshots under the current rules",
+        description="Apply the volatile-fragment rules (data-claude/normalize.json, or the "
+                    "built-in defaults) to every stored snapshot, update the stored normalized "
+                    "hashes, and report how many historical changes the rules suppress.",
+    )
+    renorm_p.add_argument(
+        "--dry-run", action="store_true",
+        help="Report the effect of the current rules without updating the database",
+    )
+    renorm_p.add_argument(
+        "--print-rules", action="store_true",
+        help="Print the active rules as JSON (a starting point for normalize.json) and exit",
+    )
 
     # dump
     dump_p = sub.add_parser(
@@ -2032,6 +4650,23 @@ def build_parser() -> argparse.ArgumentParser:
         "dir", nargs="?", default="data-claude/pages",
         help="Output directory (default: data-claude/pages)",
     )
+    dump_p.add_argument(
+        "--glob", action="append", metavar="PATTERN",
+        help="Only dump pages whose filename matches PATTERN (e.g. 'agent-sdk/*'); repeatable",
+    )
+    dump_p.add_argument(
+        "--changed-since", metavar="DATE",
+        help="Only dump pages whose content changed since DATE (e.g. 7d, 2026-03-01)",
+    )
+    dump_p.add_argument(
+        "--workers", type=int, metavar="N",
+        help=f"Parallel file writers (default: {DUMP_WORKERS})",
+    )
+    dump_p.add_argument(
+        "--snapshot-tree", metavar="DIR",
+        help="Instead of updating a flat directory, add a versioned tree DIR/<run-id>/ "
+             "(unchanged files hardlinked to the previous tree) and point DIR/current at it",
+    )
 
     # digest
     digest_p = sub.add_parser(
@@ -2054,6 +4689,29 @@ def build_parser() -> argparse.ArgumentParser:
         "--gh-repo", metavar="OWNER/REPO",
         help="Target repository for issues (default: current repo)",
     )
+    digest_p.add_argument(
+        "--backend", choices=["auto", "sdk", "cli", "api"], default="auto",
+        help="LLM backend: auto (sdk → cli → api), sdk, cli or api (default: auto)",
+    )
+    digest_p.add_argument(
+        "--batch-tokens", type=int, metavar="N",
+        help=f"Estimated input tokens per classification call (default: {CLASSIFY_BATCH_TOKENS})",
+    )
+    digest_p.add_argument(
+        "--workers", type=int, metavar="N",
+        help=f"Classification calls in flight at once (default: {CLASSIFY_WORKERS})",
+    )
+    digest_p.add_argument(
+        "--min-llm-severity", choices=["low", "medium", "high"], default=MIN_LLM_SEVERITY,
+        help="Send diffs the heuristic pre-classifier rates below this severity straight to the "
+             "database; 'low' sends every diff to the model (default: %(default)s)",
+    )
+    digest_p.add_argument(
+        "--cascade", nargs="?", const=CASCADE_FAST_MODEL, metavar="FAST_MODEL",
+        help=f"Classify with FAST_MODEL (default: {CASCADE_FAST_MODEL}) first and re-run only "
+             "breaking/high-severity or low-confidence diffs on --model; very large diffs go "
+             "straight to --model",
+    )
     digest_p.add_argument(
         "--no-open", action="store_true",
         help="Don't open digest.html in browser after generation",
@@ -2116,6 +4774,58 @@ def build_parser() -> argparse.ArgumentParser:
         "--include-html", action="store_true",
         help="Include diffs that are predominantly HTML/script noise",
     )
+    backfill_p.add_argument(
+        "--backend", choices=["auto", "sdk", "cli", "api"], default="auto",
+        help="LLM backend: auto (sdk → cli → api), sdk, cli or api (default: auto)",
+    )
+    backfill_p.add_argument(
+        "--batch-tokens", type=int, metavar="N",
+        help=f"Estimated input tokens per classification call (default: {CLASSIFY_BATCH_TOKENS})",
+    )
+    backfill_p.add_argument(
+        "--workers", type=int, metavar="N",
+        help=f"Classification calls in flight at once (default: {CLASSIFY_WORKERS})",
+    )
+    backfill_p.add_argument(
+        "--min-llm-severity", choices=["low", "medium", "high"], default=MIN_LLM_SEVERITY,
+        help="Send diffs the heuristic pre-classifier rates below this severity straight to the "
+             "database; 'low' sends every diff to the model (default: %(default)s)",
+    )
+    backfill_p.add_argument(
+        "--cascade", nargs="?", const=CASCADE_FAST_MODEL, metavar="FAST_MODEL",
+        help=f"Classify with FAST_MODEL (default: {CASCADE_FAST_MODEL}) first and re-run only "
+             "breaking/high-severity or low-confidence diffs on --model; very large diffs go "
+             "straight to --model",
+    )
+    backfill_p.add_argument(
+        "--batch", action="store_true",
+        help="Submit unclassified diffs as one Message Batch (API tier, half price) and "
+             "ingest the results on a later run; DOCS_MONITOR_BATCH_ENDPOINT=local for an offline stand-in",
+    )
+    backfill_p.add_argument(
+        "--wait", action="store_true",
+        help=f"With --batch, poll every {BATCH_POLL_SECONDS}s until the batch ends and ingest it",
+    )
+    backfill_p.add_argument(
+        "--jobs", type=int, default=1, metavar="N",
+        help="Reconstruct runs in N worker processes (default: 1)",
+    )
+
+    # eval-heuristics
+    evalh_p = sub.add_parser(
+        "eval-heuristics",
+        help="Compare the heuristic pre-classifier with existing model-labelled change events",
+        description="Run the deterministic pre-classifier over every model-classified diff in "
+                    "change_events and report coverage, agreement and the model calls it would save.",
+    )
+    evalh_p.add_argument(
+        "--min-llm-severity", choices=["low", "medium", "high"], default=MIN_LLM_SEVERITY,
+        help="Threshold to estimate savings for (default: %(default)s)",
+    )
+    evalh_p.add_argument(
+        "--limit", type=int, default=10,
+        help="Disagreements to list (default: 10)",
+    )
 
     return parser
 
@@ -2143,18 +4853,26 @@ def main():
         cmd_history(args)
     elif args.command == "diff":
         cmd_diff(args)
+    elif args.command == "blame":
+        cmd_blame(args)
     elif args.command == "urls":
         cmd_urls(args)
     elif args.command == "rebuild-history":
         cmd_rebuild_history(args)
+    elif args.command == "renormalize":
+        cmd_renormalize(args)
     elif args.command == "dump":
         cmd_dump(args)
+    elif args.command == "git-export":
+        cmd_git_export(args)
     elif args.command == "digest":
         cmd_digest(args)
     elif args.command == "query":
         cmd_query(args)
     elif args.command == "backfill":
         cmd_backfill(args)
+    elif args.command == "eval-heuristics":
+        cmd_eval_heuristics(args)
 
 
 if __name__ == "__main__":
@@ -30,6 +30,9 @@ MODEL = "claude-opus-4-7"
 TIMEOUT_SEC = 300
 BASELINE_TAG = "bare-ask-docs-f9f39cc"
 
+sys.path.insert(0, str(REPO))
+from llm_backend import acquire_rate_slot  # type: ignore  # noqa: E402
+
 
 def load_benchmark(qids):
     by_id = {}
@@ -146,6 +149,8 @@ def run_one(qid, question):
         "--dangerously-skip-permissions",
         "--", prompt,
     ]
+    # Share the model's request budget with any digest/backfill/scorer running alongside
+    acquire_rate_slot(MODEL)
     print(f"[{qid}] starting (timeout={TIMEOUT_SEC}s)", file=sys.stderr)
     t0 = time.time()
     try:
@@ -18,19 +18,49 @@ the environment before invocation so credential discovery falls through to
 ``~/.claude/.credentials.json`` (Max OAuth). The user-global rule
 ``~/.claude/rules/agent-sdk-max-oauth.md`` requires this.
 
+The ``sdk`` backend keeps a few pre-connected ``ClaudeSDKClient`` instances on one
+background event loop; each answers a single call, and a replacement is
+connected while it runs (see ``_SDKPool``). Set ``DOCS_MONITOR_SDK_POOL=0``
+to connect a fresh client per call instead.
+
+``acall_claude()`` is the async counterpart, and ``acall_claude_batch()`` /
+``call_claude_batch()`` run many prompts with bounded concurrency. Sync and
+async calls share one process-wide in-flight limit, set by
+``DOCS_MONITOR_MAX_CONCURRENCY`` (default 8) or ``set_concurrency_limit()``.
+
+``submit_batch()`` / ``poll_batch()`` / ``batch_results()`` drive the API's
+Message Batches endpoint for large offline jobs (``DOCS_MONITOR_BATCH_ENDPOINT
+=local`` substitutes an offline stand-in).
+
+Across processes, every call first takes a token from a per-model bucket
+kept in a lock-guarded state file (see ``_RateGovernor``), so concurrent
+``digest``/``backfill``/eval runs share one request budget and back off
+together. Quotas are requests per minute, set by ``DOCS_MONITOR_RPM``.
+
 Set ``DOCS_MONITOR_VERBOSE=1`` to print the chosen backend to stderr.
 """
 
 from __future__ import annotations
 
+import atexit
+import json
 import os
+import random
 import re
 import shutil
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+import uuid
 from typing import Optional
 
+try:
+    import fcntl
+except ImportError:  # Windows: the cross-process governor is disabled
+    fcntl = None  # type: ignore[assignment]
+
 _RESOLVED_BACKEND: Optional[str] = None
 
 
@@ -243,6 +273,222 @@ def _run_sdk_coro(coro, timeout: int):
         return future.result(timeout=timeout + 10)
 
 
+def _sdk_options(model: str):
+    from claude_agent_sdk import ClaudeAgentOptions  # pyright: ignore[reportMissingImports]
+
+    return ClaudeAgentOptions(
+        model=model,
+        permission_mode="bypassPermissions",
+        max_turns=1,
+        stderr=lambda line: print(f"[sdk-cli] {line}", file=sys.stderr, flush=True),
+    )
+
+
+async def _sdk_exchange(client, full_prompt: str, session_id: str = "default") -> str:
+    """Send one prompt on a connected client and collect the reply text."""
+    chunks: list[str] = []
+    final_result: Optional[str] = None
+    await client.query(full_prompt, session_id=session_id)
+    async for msg in client.receive_response():
+        result_attr = getattr(msg, "result", None)
+        if isinstance(result_attr, str) and result_attr:
+            final_result = result_attr
+            continue
+        content = getattr(msg, "content", None)
+        if isinstance(content, list):
+            for block in content:
+                text = getattr(block, "text", None)
+                if isinstance(text, str) and text:
+                    chunks.append(text)
+    return (final_result or "".join(chunks)).strip()
+
+
+# Pool tuning. A streaming ClaudeSDKClient is one conversation: there is no
+# way to clear its context (the SDK has no /clear; a new session_id on
+# query() does not start a fresh one), so each client answers exactly one
+# call and is then disconnected. What the pool saves is startup: while a call
+# runs, a replacement is connected in the background, up to _SDK_POOL_SIZE
+# ready clients per model. A ready client unused for _SDK_POOL_IDLE_TTL
+# seconds is disconnected.
+_SDK_POOL_SIZE = 4
+_SDK_POOL_IDLE_TTL = 300.0
+
+
+class _PooledClient:
+    __slots__ = ("client", "model", "connected_at")
+
+    def __init__(self, client, model: str):
+        self.client = client
+        self.model = model
+        self.connected_at = time.monotonic()
+
+
+class _SDKPool:
+    """Pre-connected, single-use ``ClaudeSDKClient`` instances for ``call_claude``.
+
+    Each client keeps a CLI subprocess that has already started, so a call
+    that finds a ready client skips process startup. Every client serves one
+    call and is retired, so no conversation history carries over between
+    prompts. All clients live on one event loop running in a daemon thread;
+    callers block on ``run()`` from any thread, whether or not they have a
+    loop of their own.
+    """
+
+    def __init__(self):
+        import asyncio
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name="llm-backend-sdk-pool", daemon=True)
+        self._thread.start()
+        self._ready: dict[str, list[_PooledClient]] = {}
+        self._warming: dict[str, int] = {}
+        self._tasks: set = set()  # background connects and disconnects, kept alive until done
+        self._spawn_lock = asyncio.Lock()  # serializes the ANTHROPIC_API_KEY strip around connect()
+        self._closed = False
+
+    def submit(self, coro, timeout: float):
+        """Schedule a coroutine on the pool's loop. Returns a concurrent.futures.Future."""
+        import asyncio
+
+        return asyncio.run_coroutine_threadsafe(asyncio.wait_for(coro, timeout), self._loop)
+
+    def run(self, coro, timeout: float):
+        """Run a coroutine on the pool's loop and wait for it from the calling thread."""
+        import concurrent.futures
+
+        future = self.submit(coro, timeout)
+        try:
+            return future.result(timeout + 10)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def _background(self, coro) -> None:
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _connect(self, model: str) -> _PooledClient:
+        from claude_agent_sdk import ClaudeSDKClient  # pyright: ignore[reportMissingImports]
+
+        async with self._spawn_lock:
+            saved_key = os.environ.pop("ANTHROPIC_API_KEY", None)
+            try:
+                client = ClaudeSDKClient(options=_sdk_options(model))
+                await client.connect()
+            finally:
+                if saved_key is not None:
+                    os.environ["ANTHROPIC_API_KEY"] = saved_key
+        _vprint(f"sdk pool: connected new client for {model}")
+        return _PooledClient(client, model)
+
+    @staticmethod
+    def _healthy(pc: _PooledClient) -> bool:
+        if time.monotonic() - pc.connected_at > _SDK_POOL_IDLE_TTL:
+            return False
+        transport = getattr(pc.client, "_transport", None)
+        is_ready = getattr(transport, "is_ready", None)
+        return bool(is_ready()) if callable(is_ready) else True
+
+    async def _retire(self, pc: _PooledClient, reason: str) -> None:
+        _vprint(f"sdk pool: retiring client for {pc.model} ({reason})")
+        try:
+            await pc.client.disconnect()
+        except Exception:
+            pass  # already dead; nothing to clean up
+
+    async def _warm(self, model: str) -> None:
+        """Connect one spare client for ``model`` in the background."""
+        try:
+            pc = await self._connect(model)
+        except Exception as e:
+            _vprint(f"sdk pool: background connect for {model} failed ({e!r})")
+            return
+        finally:
+            self._warming[model] -= 1
+        if self._closed:
+            await self._retire(pc, "shutdown")
+        else:
+            self._ready.setdefault(model, []).append(pc)
+
+    def _top_up(self, model: str) -> None:
+        """Start one replacement connect unless enough clients are ready or on the way."""
+        warming = self._warming.get(model, 0)
+        if self._closed or len(self._ready.get(model, [])) + warming >= _SDK_POOL_SIZE:
+            return
+        self._warming[model] = warming + 1
+        self._background(self._warm(model))
+
+    async def _acquire(self, model: str) -> _PooledClient:
+        ready = self._ready.setdefault(model, [])
+        pc = None
+        while ready and pc is None:
+            candidate = ready.pop()
+            if self._healthy(candidate):
+                pc = candidate
+            else:
+                self._background(self._retire(candidate, "stale"))
+        if pc is None:
+            pc = await self._connect(model)
+        self._top_up(model)
+        return pc
+
+    async def query(self, model: str, full_prompt: str) -> str:
+        pc = await self._acquire(model)
+        try:
+            return await _sdk_exchange(pc.client, full_prompt)
+        finally:
+            # One conversation per client: never hand it out again
+            self._background(self._retire(pc, "used"))
+
+    async def _close_all(self) -> None:
+        import asyncio
+
+        self._closed = True
+        for clients in self._ready.values():
+            while clients:
+                self._background(self._retire(clients.pop(), "shutdown"))
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def shutdown(self) -> None:
+        if not self._loop.is_running():
+            return
+        try:
+            self.run(self._close_all(), timeout=10)
+        except Exception:
+            pass  # best effort at interpreter exit
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+_SDK_POOL: Optional[_SDKPool] = None
+_SDK_POOL_LOCK = threading.Lock()
+
+
+def _get_sdk_pool() -> _SDKPool:
+    global _SDK_POOL
+    with _SDK_POOL_LOCK:
+        if _SDK_POOL is None:
+            _SDK_POOL = _SDKPool()
+            atexit.register(shutdown_sdk_pool)
+        return _SDK_POOL
+
+
+def shutdown_sdk_pool() -> None:
+    """Disconnect every pooled SDK client and stop the pool's loop. Registered atexit."""
+    global _SDK_POOL
+    with _SDK_POOL_LOCK:
+        pool, _SDK_POOL = _SDK_POOL, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def _sdk_pool_enabled() -> bool:
+    return os.environ.get("DOCS_MONITOR_SDK_POOL", "1") != "0"
+
+
 def _call_via_sdk(*, prompt: str, stdin: str, model: str,
                   json_schema: Optional[str], timeout: int) -> str:
     # Uses ``ClaudeSDKClient`` rather than the one-shot ``query()`` helper. The
@@ -252,85 +498,148 @@ def _call_via_sdk(*, prompt: str, stdin: str, model: str,
     # opaquely (exit 1, empty stderr) on every call AFTER a ClaudeSDKClient has
     # been used. The long-lived client gives the subprocess time to drain.
     # See report_builder.py:425-429 for the original observation in the gap-fill loop.
-    from claude_agent_sdk import ClaudeAgentOptions, ClaudeSDKClient  # pyright: ignore[reportMissingImports]
+    from claude_agent_sdk import ClaudeSDKClient  # pyright: ignore[reportMissingImports]
 
     full_prompt = _combine(prompt, stdin, json_schema)
 
-    saved_key = os.environ.pop("ANTHROPIC_API_KEY", None)
-    try:
-        options = ClaudeAgentOptions(
-            model=model,
-            permission_mode="bypassPermissions",
-            max_turns=1,
-            stderr=lambda line: print(f"[sdk-cli] {line}", file=sys.stderr, flush=True),
-        )
-
-        async def _run() -> str:
-            chunks: list[str] = []
-            final_result: Optional[str] = None
-            async with ClaudeSDKClient(options=options) as client:
-                await client.query(full_prompt)
-                async for msg in client.receive_response():
-                    result_attr = getattr(msg, "result", None)
-                    if isinstance(result_attr, str) and result_attr:
-                        final_result = result_attr
-                        continue
-                    content = getattr(msg, "content", None)
-                    if isinstance(content, list):
-                        for block in content:
-                            text = getattr(block, "text", None)
-                            if isinstance(text, str) and text:
-                                chunks.append(text)
-            return (final_result or "".join(chunks)).strip()
+    async def _run_once() -> str:
+        async with ClaudeSDKClient(options=_sdk_options(model)) as client:
+            return await _sdk_exchange(client, full_prompt)
 
-        try:
-            out = _run_sdk_coro(_run(), timeout)
-        except Exception as e:
-            err_text = f"{e!r} {e!s}"
-            if _is_rate_limit(err_text):
-                raise RateLimitError(str(e)) from e
-            if _is_sdk_opaque_failure(err_text):
-                raise RateLimitError(f"transient SDK subprocess failure: {e!s}") from e
+    try:
+        if _sdk_pool_enabled():
+            pool = _get_sdk_pool()
+            out = pool.run(pool.query(model, full_prompt), timeout)
+        else:
+            saved_key = os.environ.pop("ANTHROPIC_API_KEY", None)
+            try:
+                out = _run_sdk_coro(_run_once(), timeout)
+            finally:
+                if saved_key is not None:
+                    os.environ["ANTHROPIC_API_KEY"] = saved_key
+    except Exception as e:
+        err = _sdk_error(e)
+        if err is e:
             raise
-    finally:
-        if saved_key is not None:
-            os.environ["ANTHROPIC_API_KEY"] = saved_key
+        raise err from e
 
     if not out:
         raise RuntimeError("claude_agent_sdk returned empty output")
     return out
 
 
-def _call_via_api(*, prompt: str, stdin: str, model: str,
-                  json_schema: Optional[str], max_tokens: int,
-                  timeout: int) -> str:
-    import anthropic  # pyright: ignore[reportMissingImports]
+def _sdk_error(e: Exception) -> Exception:
+    """Translate an SDK failure into RateLimitError where a retry is likely to help."""
+    err_text = f"{e!r} {e!s}"
+    if _is_rate_limit(err_text):
+        return RateLimitError(str(e))
+    if _is_sdk_opaque_failure(err_text):
+        return RateLimitError(f"transient SDK subprocess failure: {e!s}")
+    return e
 
-    api_model = _MODEL_ALIASES_API.get(model, model)
-    full_prompt = _combine(prompt, stdin, json_schema)
 
-    client = anthropic.Anthropic(timeout=float(timeout))
+async def _acall_via_sdk(*, prompt: str, stdin: str, model: str,
+                         json_schema: Optional[str], timeout: int) -> str:
+    import asyncio
+
+    full_prompt = _combine(prompt, stdin, json_schema)
     try:
-        msg = client.messages.create(
-            model=api_model,
-            max_tokens=max_tokens,
-            messages=[{"role": "user", "content": full_prompt}],
-        )
-    except anthropic.RateLimitError as e:
+        if _sdk_pool_enabled():
+            # The pooled clients belong to the pool's loop; await the result from ours
+            pool = _get_sdk_pool()
+            out = await asyncio.wrap_future(pool.submit(pool.query(model, full_prompt), timeout))
+        else:
+            from claude_agent_sdk import ClaudeSDKClient  # pyright: ignore[reportMissingImports]
+
+            saved_key = os.environ.pop("ANTHROPIC_API_KEY", None)
+            try:
+                client = ClaudeSDKClient(options=_sdk_options(model))
+                await client.connect()
+            finally:
+                if saved_key is not None:
+                    os.environ["ANTHROPIC_API_KEY"] = saved_key
+            try:
+                out = await asyncio.wait_for(_sdk_exchange(client, full_prompt), timeout)
+            finally:
+                await client.disconnect()
+    except Exception as e:
+        err = _sdk_error(e)
+        if err is e:
+            raise
+        raise err from e
+
+    if not out:
+        raise RuntimeError("claude_agent_sdk returned empty output")
+    return out
+
+
+def _api_error(anthropic, e: Exception) -> Exception:
+    """Translate an anthropic SDK exception into RateLimitError where it is throttling."""
+    if isinstance(e, anthropic.RateLimitError):
         retry_after = None
         try:
             ra = e.response.headers.get("retry-after") if getattr(e, "response", None) else None
             retry_after = float(ra) if ra else None
         except (ValueError, TypeError, AttributeError):
             retry_after = None
-        raise RateLimitError(str(e), retry_after=retry_after) from e
-    except anthropic.APIStatusError as e:
-        # 529 overloaded falls under APIStatusError, not RateLimitError
-        status = getattr(e, "status_code", None)
-        if status in (429, 529) or _is_rate_limit(str(e)):
-            raise RateLimitError(str(e)) from e
-        raise
+        return RateLimitError(str(e), retry_after=retry_after)
+    # 529 overloaded falls under APIStatusError, not RateLimitError
+    status = getattr(e, "status_code", None)
+    if status in (429, 529) or _is_rate_limit(str(e)):
+        return RateLimitError(str(e))
+    return e
+
+
+def _api_request(prompt: str, stdin: str, json_schema: Optional[str]) -> dict:
+    """System and messages for a Messages API call, with the stable prefix cacheable.
+
+    When there is piped content, the prompt and schema instruction are fixed
+    per call site while stdin varies, so they go in a system block marked
+    ``cache_control`` and only stdin is sent as the user turn. Without stdin
+    there is no stable part, and the whole prompt is the user turn.
+
+    The API only caches prefixes of at least 1024 tokens (2048 on Haiku).
+    The monitor's classification prefix is about 440 tokens and the digest
+    prompt shorter still, so today both are sent uncached (cache reads stay
+    0); the marker only takes effect for a caller with a longer fixed prefix.
+    """
+    if not stdin:
+        return {"messages": [{"role": "user", "content": _combine(prompt, "", json_schema)}]}
+    return {
+        "system": [{"type": "text", "text": _combine(prompt, "", json_schema),
+                    "cache_control": {"type": "ephemeral"}}],
+        "messages": [{"role": "user", "content": stdin}],
+    }
+
+
+_API_USAGE = {"calls": 0, "input_tokens": 0, "output_tokens": 0,
+              "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0}
+_API_USAGE_LOCK = threading.Lock()
+
+
+def _record_api_usage(msg) -> None:
+    usage = getattr(msg, "usage", None)
+    if usage is None:
+        return
+    counts = {k: getattr(usage, k, 0) or 0 for k in _API_USAGE if k != "calls"}
+    with _API_USAGE_LOCK:
+        _API_USAGE["calls"] += 1
+        for k, v in counts.items():
+            _API_USAGE[k] += v
+    _vprint(
+        f"api usage: input={counts['input_tokens']} output={counts['output_tokens']} "
+        f"cache_write={counts['cache_creation_input_tokens']} "
+        f"cache_read={counts['cache_read_input_tokens']}"
+    )
 
+
+def get_api_usage() -> dict:
+    """Token counts summed over this process's API-tier calls, including prompt-cache reads/writes."""
+    with _API_USAGE_LOCK:
+        return dict(_API_USAGE)
+
+
+def _api_text(msg) -> str:
     text_parts: list[str] = []
     for block in msg.content:
         text = getattr(block, "text", None)
@@ -342,6 +651,246 @@ def _call_via_api(*, prompt: str, stdin: str, model: str,
     return out
 
 
+def _call_via_api(*, prompt: str, stdin: str, model: str,
+                  json_schema: Optional[str], max_tokens: int,
+                  timeout: int) -> str:
+    import anthropic  # pyright: ignore[reportMissingImports]
+
+    api_model = _MODEL_ALIASES_API.get(model, model)
+
+    client = anthropic.Anthropic(timeout=float(timeout))
+    try:
+        msg = client.messages.create(
+            model=api_model,
+            max_tokens=max_tokens,
+            **_api_request(prompt, stdin, json_schema),
+        )
+    except (anthropic.RateLimitError, anthropic.APIStatusError) as e:
+        err = _api_error(anthropic, e)
+        if err is e:
+            raise
+        raise err from e
+    _record_api_usage(msg)
+    return _api_text(msg)
+
+
+async def _acall_via_api(*, prompt: str, stdin: str, model: str,
+                         json_schema: Optional[str], max_tokens: int,
+                         timeout: int) -> str:
+    import anthropic  # pyright: ignore[reportMissingImports]
+
+    api_model = _MODEL_ALIASES_API.get(model, model)
+
+    client = anthropic.AsyncAnthropic(timeout=float(timeout))
+    try:
+        msg = await client.messages.create(
+            model=api_model,
+            max_tokens=max_tokens,
+            **_api_request(prompt, stdin, json_schema),
+        )
+    except (anthropic.RateLimitError, anthropic.APIStatusError) as e:
+        err = _api_error(anthropic, e)
+        if err is e:
+            raise
+        raise err from e
+    _record_api_usage(msg)
+    return _api_text(msg)
+
+
+class _CallLimiter:
+    """Process-wide cap on model calls in flight.
+
+    One ``threading`` semaphore shared by ``call_claude`` (blocking, from any
+    thread) and ``acall_claude`` (awaiting, from any event loop), so threads
+    and tasks together never exceed the limit. Async waiters poll rather than
+    block, keeping their loop responsive.
+    """
+
+    _POLL = 0.02
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._sem = threading.BoundedSemaphore(self.limit)
+
+    def __enter__(self):
+        self._sem.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self._sem.release()
+
+    async def __aenter__(self):
+        import asyncio
+
+        while not self._sem.acquire(blocking=False):
+            await asyncio.sleep(self._POLL)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._sem.release()
+
+
+_LIMITER = _CallLimiter(int(os.environ.get("DOCS_MONITOR_MAX_CONCURRENCY", "8")))
+
+
+def set_concurrency_limit(limit: int) -> None:
+    """Replace the process-wide in-flight call limit. Call while no model calls are running."""
+    global _LIMITER
+    _LIMITER = _CallLimiter(limit)
+
+
+def _parse_quotas(spec: str) -> dict[str, float]:
+    """Parse DOCS_MONITOR_RPM: "50" (every model) or "sonnet=50,opus=20,*=40"."""
+    quotas: dict[str, float] = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, sep, value = part.rpartition("=")
+        try:
+            quotas[name.strip() if sep else "*"] = float(value)
+        except ValueError:
+            _vprint(f"ignoring malformed DOCS_MONITOR_RPM entry: {part!r}")
+    return quotas
+
+
+class _RateGovernor:
+    """Cross-process token bucket per model, stored in a flock-guarded JSON file.
+
+    Each bucket refills at its quota (requests per minute) and holds up to ten
+    seconds of it, so a burst cannot outrun the quota for long. A rate-limit
+    response from any process empties the model's bucket and blocks it until
+    the backoff has passed, so every process pauses together and resumes at
+    the refill rate instead of retrying in lockstep. A quota of 0 disables the
+    governor for that model; without ``fcntl`` it is disabled entirely.
+    Aliases and full model IDs ("opus", "claude-opus-4-7") share one bucket
+    and one quota.
+    """
+
+    _BURST_SECONDS = 10.0
+
+    def __init__(self, path: str, quotas: dict[str, float]):
+        self.path = path
+        self.quotas = {_MODEL_ALIASES_API.get(m, m): q for m, q in quotas.items()}
+
+    def quota(self, model: str) -> float:
+        return self.quotas.get(_MODEL_ALIASES_API.get(model, model), self.quotas.get("*", 0.0))
+
+    def _update(self, model: str, fn) -> float:
+        """Apply fn(bucket, now) under the file lock; returns fn's result (seconds to wait)."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except json.JSONDecodeError:
+                    state = {}
+                rate = self.quota(model) / 60.0
+                capacity = max(1.0, rate * self._BURST_SECONDS)
+                now = time.time()
+                bucket = state.get(model) or {"tokens": capacity, "updated": now, "blocked_until": 0.0}
+                bucket["tokens"] = min(capacity, bucket["tokens"] + (now - bucket["updated"]) * rate)
+                bucket["updated"] = now
+                wait = fn(bucket, now, rate)
+                state[model] = bucket
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait
+
+    @staticmethod
+    def _take(bucket: dict, now: float, rate: float) -> float:
+        if bucket["blocked_until"] > now:
+            return bucket["blocked_until"] - now
+        if bucket["tokens"] >= 1.0:
+            bucket["tokens"] -= 1.0
+            return 0.0
+        return (1.0 - bucket["tokens"]) / rate
+
+    def _enabled(self, model: str) -> bool:
+        return fcntl is not None and self.quota(model) > 0
+
+    def _next_wait(self, model: str) -> float:
+        try:
+            wait = self._update(model, self._take)
+        except OSError as e:
+            _vprint(f"rate governor unavailable ({e}); not throttling")
+            return 0.0
+        # Jitter so processes woken by the same refill don't collide again
+        return wait * random.uniform(1.0, 1.25) if wait > 0 else 0.0
+
+    def acquire(self, model: str) -> None:
+        """Block until the model's bucket grants a request."""
+        model = _MODEL_ALIASES_API.get(model, model)
+        if not self._enabled(model):
+            return
+        while (wait := self._next_wait(model)) > 0:
+            _vprint(f"rate governor: waiting {wait:.2f}s for {model}")
+            time.sleep(wait)
+
+    async def aacquire(self, model: str) -> None:
+        """Async ``acquire``: waits with asyncio.sleep."""
+        import asyncio
+
+        model = _MODEL_ALIASES_API.get(model, model)
+        if not self._enabled(model):
+            return
+        while (wait := await asyncio.to_thread(self._next_wait, model)) > 0:
+            _vprint(f"rate governor: waiting {wait:.2f}s for {model}")
+            await asyncio.sleep(wait)
+
+    def penalize(self, model: str, delay: float) -> None:
+        """Record a rate-limit response: drain the bucket and block it for ``delay`` seconds."""
+        model = _MODEL_ALIASES_API.get(model, model)
+        if not self._enabled(model):
+            return
+
+        def _block(bucket: dict, now: float, rate: float) -> float:
+            bucket["tokens"] = 0.0
+            bucket["blocked_until"] = max(bucket["blocked_until"], now + delay)
+            return 0.0
+
+        try:
+            self._update(model, _block)
+        except OSError as e:
+            _vprint(f"rate governor unavailable ({e}); not recording backoff")
+
+
+_GOVERNOR = _RateGovernor(
+    os.environ.get("DOCS_MONITOR_RATE_FILE",
+                   os.path.join(tempfile.gettempdir(), "llm_backend_ratelimit.json")),
+    _parse_quotas(os.environ.get("DOCS_MONITOR_RPM", "50")),
+)
+
+
+def acquire_rate_slot(model: str) -> None:
+    """Wait for the cross-process governor to grant one request to ``model``.
+
+    ``call_claude``/``acall_claude`` do this themselves; scripts that call
+    ``claude`` directly (e.g. the eval runners) call it before each request.
+    """
+    _GOVERNOR.acquire(model)
+
+
+def _retry_delay(e: RateLimitError, attempt: int, max_retries: int, base: float,
+                 model: str) -> float:
+    """Jittered backoff after a RateLimitError, shared with other processes via the governor."""
+    delay = e.retry_after if e.retry_after else base * (3 ** attempt)
+    # Jitter upward only: never retry before the server's retry-after
+    delay *= random.uniform(1.0, 1.5)
+    transient = "transient SDK" in str(e)
+    if not transient:
+        _GOVERNOR.penalize(model, delay)
+    if attempt < max_retries:
+        _vprint(
+            f"{'transient-sdk' if transient else 'rate-limit'} retry "
+            f"(attempt {attempt + 1}/{max_retries + 1}), sleeping {delay:.1f}s: {e!s}"
+        )
+    return delay
+
+
 def call_claude(*, prompt: str, stdin: str = "", model: str = "sonnet",
                 json_schema: Optional[str] = None, backend: str = "auto",
                 max_tokens: int = 4096, timeout: int = 300,
@@ -382,18 +931,269 @@ def call_claude(*, prompt: str, stdin: str = "", model: str = "sonnet",
 
     last_err: Optional[RateLimitError] = None
     for attempt in range(max_retries + 1):
+        _GOVERNOR.acquire(model)
         try:
-            return _dispatch()
+            with _LIMITER:
+                return _dispatch()
         except RateLimitError as e:
             last_err = e
+            delay = _retry_delay(e, attempt, max_retries, retry_base_delay, model)
             if attempt >= max_retries:
                 break
-            delay = e.retry_after if e.retry_after else retry_base_delay * (3 ** attempt)
-            kind = "transient-sdk" if "transient SDK" in str(e) else "rate-limit"
-            _vprint(
-                f"{kind} retry (attempt {attempt + 1}/{max_retries + 1}), "
-                f"sleeping {delay:.1f}s: {e!s}"
-            )
             time.sleep(delay)
     assert last_err is not None
     raise last_err
+
+
+async def acall_claude(*, prompt: str, stdin: str = "", model: str = "sonnet",
+                       json_schema: Optional[str] = None, backend: str = "auto",
+                       max_tokens: int = 4096, timeout: int = 300,
+                       env: Optional[dict] = None,
+                       max_retries: int = 2,
+                       retry_base_delay: float = 5.0) -> str:
+    """Async counterpart of ``call_claude``: same arguments, result and errors.
+
+    The ``sdk`` and ``api`` tiers are awaited natively (pooled SDK clients,
+    ``anthropic.AsyncAnthropic``); the ``cli`` tier runs its subprocess in a
+    worker thread. Calls count against the same process-wide limit as
+    ``call_claude``, and rate-limit backoff (honouring ``retry_after``)
+    sleeps with ``asyncio.sleep`` so other tasks keep running.
+    """
+    import asyncio
+
+    chosen = resolve_backend(backend)
+    if env is None:
+        env = dict(os.environ)
+
+    _vprint(f"acall: backend={chosen} model={model} schema={'yes' if json_schema else 'no'}")
+
+    async def _dispatch() -> str:
+        if chosen == "sdk":
+            return await _acall_via_sdk(prompt=prompt, stdin=stdin, model=model,
+                                        json_schema=json_schema, timeout=timeout)
+        if chosen == "cli":
+            return await asyncio.to_thread(
+                _call_via_cli, prompt=prompt, stdin=stdin, model=model,
+                json_schema=json_schema, timeout=timeout, env=env)
+        if chosen == "api":
+            return await _acall_via_api(prompt=prompt, stdin=stdin, model=model,
+                                        json_schema=json_schema, max_tokens=max_tokens,
+                                        timeout=timeout)
+        raise RuntimeError(f"unknown backend: {chosen}")
+
+    last_err: Optional[RateLimitError] = None
+    for attempt in range(max_retries + 1):
+        await _GOVERNOR.aacquire(model)
+        try:
+            async with _LIMITER:
+                return await _dispatch()
+        except RateLimitError as e:
+            last_err = e
+            delay = _retry_delay(e, attempt, max_retries, retry_base_delay, model)
+            if attempt >= max_retries:
+                break
+            await asyncio.sleep(delay)
+    assert last_err is not None
+    raise last_err
+
+
+async def acall_claude_batch(requests: list[dict], *, concurrency: Optional[int] = None,
+                             return_exceptions: bool = True, **defaults) -> list:
+    """Run many ``acall_claude`` calls with bounded concurrency; results in input order.
+
+    Each request is a dict of ``acall_claude`` keyword arguments, layered over
+    ``defaults``. At most ``concurrency`` of them (default: the process-wide
+    limit) run at once. A failed request yields its exception in its slot, or
+    raises if ``return_exceptions`` is False.
+    """
+    import asyncio
+
+    gate = asyncio.Semaphore(concurrency or _LIMITER.limit)
+
+    async def _one(req: dict):
+        async with gate:
+            return await acall_claude(**{**defaults, **req})
+
+    return await asyncio.gather(*(_one(r) for r in requests),
+                                return_exceptions=return_exceptions)
+
+
+def call_claude_batch(requests: list[dict], *, concurrency: Optional[int] = None,
+                      return_exceptions: bool = True, **defaults) -> list:
+    """Blocking wrapper around ``acall_claude_batch`` for synchronous callers."""
+    import asyncio
+
+    coro = acall_claude_batch(requests, concurrency=concurrency,
+                              return_exceptions=return_exceptions, **defaults)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    import concurrent.futures
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+# ── Message Batches ─────────────────────────────────────────────────────────
+#
+# Asynchronous bulk calls through the API tier: submit many requests at once,
+# poll until the batch has ended, then read per-request results. Requests are
+# plain dicts — {"custom_id", "prompt", "stdin", "json_schema"?} — built into
+# Messages API params the same way as _call_via_api (cacheable system prefix).
+#
+# DOCS_MONITOR_BATCH_ENDPOINT=local swaps in _LocalBatches, an offline
+# stand-in that keeps batches as JSON files and answers each request through
+# a non-API backend (DOCS_MONITOR_BATCH_LOCAL_BACKEND, default "cli") when
+# polled. Batch ids say which endpoint owns them, so polling follows the id.
+
+_LOCAL_BATCH_PREFIX = "localbatch_"
+
+
+class _APIBatches:
+    def __init__(self):
+        import anthropic  # pyright: ignore[reportMissingImports]
+
+        self._client = anthropic.Anthropic()
+
+    def create(self, requests: list[dict], model: str, max_tokens: int) -> str:
+        api_model = _MODEL_ALIASES_API.get(model, model)
+        batch = self._client.messages.batches.create(requests=[
+            {"custom_id": r["custom_id"],
+             "params": {"model": api_model, "max_tokens": max_tokens,
+                        **_api_request(r["prompt"], r.get("stdin", ""), r.get("json_schema"))}}
+            for r in requests
+        ])
+        return batch.id
+
+    def retrieve(self, batch_id: str) -> dict:
+        batch = self._client.messages.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        return {"id": batch.id, "status": batch.processing_status,
+                "counts": {k: getattr(counts, k, 0) for k in
+                           ("processing", "succeeded", "errored", "canceled", "expired")}}
+
+    def results(self, batch_id: str):
+        for item in self._client.messages.batches.results(batch_id):
+            result = item.result
+            if result.type == "succeeded":
+                _record_api_usage(result.message)
+                try:
+                    yield item.custom_id, _api_text(result.message), None
+                except RuntimeError as e:
+                    yield item.custom_id, None, str(e)
+            else:
+                error = getattr(result, "error", None)
+                yield item.custom_id, None, f"{result.type}: {error}" if error else result.type
+
+
+class _LocalBatches:
+    """Offline stand-in for the Message Batches endpoint, for tests and dry runs.
+
+    Requests are answered on the first poll. With DOCS_MONITOR_BATCH_LOCAL_RESPONSES
+    set to a JSON file mapping custom_id to a response, answers come from it with
+    no model call: a string is the reply text, any other JSON value is sent
+    serialized, "*" answers ids not listed, and an id with no entry is an errored
+    result. Without it, each request goes through call_claude on
+    DOCS_MONITOR_BATCH_LOCAL_BACKEND (default "cli").
+    """
+
+    def __init__(self):
+        self.dir = os.environ.get("DOCS_MONITOR_BATCH_DIR",
+                                  os.path.join(tempfile.gettempdir(), "llm_backend_batches"))
+        self.backend = os.environ.get("DOCS_MONITOR_BATCH_LOCAL_BACKEND", "cli")
+        self.responses_path = os.environ.get("DOCS_MONITOR_BATCH_LOCAL_RESPONSES")
+
+    def _path(self, batch_id: str) -> str:
+        return os.path.join(self.dir, f"{batch_id}.json")
+
+    def _load(self, batch_id: str) -> dict:
+        try:
+            with open(self._path(batch_id), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise RuntimeError(f"unknown local batch: {batch_id}") from None
+
+    def _save(self, state: dict) -> None:
+        path = self._path(state["id"])
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+    def create(self, requests: list[dict], model: str, max_tokens: int) -> str:
+        os.makedirs(self.dir, exist_ok=True)
+        state = {"id": _LOCAL_BATCH_PREFIX + uuid.uuid4().hex, "model": model,
+                 "max_tokens": max_tokens, "requests": requests, "results": {}}
+        self._save(state)
+        return state["id"]
+
+    def _canned(self, responses: dict, custom_id: str) -> dict:
+        if custom_id in responses:
+            answer = responses[custom_id]
+        elif "*" in responses:
+            answer = responses["*"]
+        else:
+            return {"error": f"errored: no canned response for {custom_id}"}
+        return {"text": answer if isinstance(answer, str) else json.dumps(answer)}
+
+    def retrieve(self, batch_id: str) -> dict:
+        # Answer every outstanding request on the first poll, as if the batch
+        # had finished in the background since submission
+        state = self._load(batch_id)
+        responses = None
+        if self.responses_path:
+            with open(self.responses_path, encoding="utf-8") as f:
+                responses = json.load(f)
+        for r in state["requests"]:
+            if r["custom_id"] in state["results"]:
+                continue
+            if responses is not None:
+                state["results"][r["custom_id"]] = self._canned(responses, r["custom_id"])
+                continue
+            try:
+                text = call_claude(prompt=r["prompt"], stdin=r.get("stdin", ""),
+                                   model=state["model"], json_schema=r.get("json_schema"),
+                                   backend=self.backend, max_tokens=state["max_tokens"])
+                state["results"][r["custom_id"]] = {"text": text}
+            except Exception as e:  # any backend failure becomes an errored result
+                state["results"][r["custom_id"]] = {"error": f"errored: {e}"}
+        self._save(state)
+        results = state["results"].values()
+        return {"id": batch_id, "status": "ended",
+                "counts": {"processing": 0,
+                           "succeeded": sum(1 for r in results if "text" in r),
+                           "errored": sum(1 for r in results if "error" in r),
+                           "canceled": 0, "expired": 0}}
+
+    def results(self, batch_id: str):
+        state = self._load(batch_id)
+        for custom_id, r in state["results"].items():
+            yield custom_id, r.get("text"), r.get("error")
+
+
+def _batch_endpoint(batch_id: Optional[str] = None):
+    if batch_id is not None:
+        local = batch_id.startswith(_LOCAL_BATCH_PREFIX)
+    else:
+        local = os.environ.get("DOCS_MONITOR_BATCH_ENDPOINT", "api") == "local"
+    if local:
+        return _LocalBatches()
+    resolve_backend("api")  # raises with install guidance if the API tier is unavailable
+    return _APIBatches()
+
+
+def submit_batch(requests: list[dict], *, model: str = "sonnet", max_tokens: int = 4096) -> str:
+    """Submit requests as one Message Batch. Returns the batch id (persist it to resume)."""
+    _vprint(f"batch: submitting {len(requests)} request(s) for {model}")
+    return _batch_endpoint().create(requests, model, max_tokens)
+
+
+def poll_batch(batch_id: str) -> dict:
+    """Status of a batch: {"id", "status": "in_progress"|"canceling"|"ended", "counts"}."""
+    return _batch_endpoint(batch_id).retrieve(batch_id)
+
+
+def batch_results(batch_id: str):
+    """Yield (custom_id, text, error) for each request of an ended batch; text is None on error."""
+    yield from _batch_endpoint(batch_id).results(batch_id)
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
-"""MCP server for Claude Docs Monitor — read-only access to documentation intelligence.
+"""MCP server for Claude Docs Monitor — query access to documentation intelligence.
 
 Exposes the SQLite database (page snapshots, diffs, AI-classified change events)
-as MCP tools and resources. All write operations (check, digest, backfill) stay CLI-only.
+as MCP tools and resources. All write operations (check, digest, backfill) stay CLI-only;
+the one thing the server saves is the line provenance blame_page computes.
 
 Usage:
     python mcp_server.py                          # stdio transport (default)
@@ -28,6 +29,7 @@ from claude_docs_monitor import (
     get_page_history,
     get_two_snapshots,
     get_all_tracked_urls,
+    get_line_provenance,
     compute_diff,
     url_to_filename,
     _parse_relative_date,
@@ -48,7 +50,11 @@ DATA_DIR = DB_PATH.parent  # digest.md, report.md, pages/ live alongside the DB
 
 
 def _get_conn() -> sqlite3.Connection:
-    """Open a read-only DB connection. Calls init_db() to ensure schema exists."""
+    """Open a DB connection. Calls init_db() to ensure schema exists.
+
+    Tools only read through it, except blame_page, which saves the line
+    provenance it computes.
+    """
     return init_db(DB_PATH)
 
 
@@ -56,7 +62,8 @@ def _get_conn() -> sqlite3.Connection:
 
 mcp = FastMCP(
     "docs-monitor",
-    instructions="Read-only access to Claude Code documentation change intelligence",
+    instructions="Query access to Claude Code documentation change intelligence "
+                 "(blame_page also caches the line provenance it computes)",
 )
 
 VALID_CATEGORIES = {"feature", "breaking", "deprecation", "clarification", "flag_change", "bugfix"}
@@ -237,6 +244,31 @@ def search_pages(keyword: str, limit: int = 10) -> dict:
         conn.close()
 
 
+@mcp.tool()
+def blame_page(url: str, pattern: str | None = None, limit: int = 200) -> dict:
+    """Show when each line of a documentation page first appeared.
+
+    For every line of the latest snapshot, returns the timestamp of the run in
+    which that line was first seen. Use pattern (case-insensitive substring)
+    to answer "when was this sentence or flag added?".
+    Requires the full URL (e.g. 'https://code.claude.com/docs/en/hooks.md').
+    """
+    conn = _get_conn()
+    try:
+        # Saves the replayed provenance, so the next blame starts from here
+        result = get_line_provenance(conn, url)
+        if result is None:
+            return {"error": f"No snapshots found for {url}"}
+        lines = []
+        for n, (line, seen) in enumerate(zip(*result), 1):
+            if pattern and pattern.lower() not in line.lower():
+                continue
+            lines.append({"line": n, "first_seen": seen, "text": line})
+        return {"url": url, "lines": lines[:limit], "count": len(lines)}
+    finally:
+        conn.close()
+
+
 # ── Resources ───────────────────────────────────────────────────────────────
 
 @mcp.resource("docs://pages/{name}")
@@ -0,0 +1,159 @@
+"""backfill --batch end to end against the offline Message Batches stand-in."""
+
+import asyncio
+import json
+import time
+import types
+
+import pytest
+
+import claude_docs_monitor as m
+
+A = "https://code.claude.com/docs/en/a.md"
+B = "https://code.claude.com/docs/en/b.md"
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """A temp data dir, a fake docs site and a canned batch responder."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DOCS_MONITOR_BATCH_ENDPOINT", "local")
+    monkeypatch.setenv("DOCS_MONITOR_BATCH_DIR", str(tmp_path / "batches"))
+    responses = tmp_path / "responses.json"
+    monkeypatch.setenv("DOCS_MONITOR_BATCH_LOCAL_RESPONSES", str(responses))
+    pages: dict[str, str] = {}
+
+    async def fetch_url(client, url, semaphore, retries=3):
+        content = "\n".join(f"- [{u}]({u})" for u in pages) if url == m.INDEX_URL else pages.get(url)
+        return {"url": url, "content": content, "status_code": 200 if content else 404,
+                "duration_ms": 1.0, "error": None if content is not None else "HTTPError: 404"}
+
+    async def fetch_all(urls, show_progress=True):
+        return [await fetch_url(None, u, None) for u in urls]
+
+    monkeypatch.setattr(m, "fetch_url", fetch_url)
+    monkeypatch.setattr(m, "fetch_all", fetch_all)
+    return types.SimpleNamespace(pages=pages, responses=responses)
+
+
+def _check(ws, pages):
+    ws.pages.clear()
+    ws.pages.update(pages)
+    asyncio.run(m.cmd_check(types.SimpleNamespace(
+        quiet=True, save_diffs=None, poll=None, dump=None, report="data-claude", include_html=False)))
+
+
+def _backfill(min_llm_severity=None):
+    m.cmd_backfill(types.SimpleNamespace(model="sonnet", dry_run=False, include_html=False,
+                                         jobs=1, batch=True, wait=False,
+                                         min_llm_severity=min_llm_severity))
+
+
+def _answer_all(ws, conn):
+    """Write a canned model answer for every unit of the submitted batch."""
+    plan = json.loads(conn.execute("SELECT requests_json FROM classification_batches "
+                                   "WHERE status = 'submitted'").fetchone()[0])
+    ws.responses.write_text(json.dumps({
+        custom_id: {"events": [{"url": u, "category": "feature", "severity": "medium",
+                                "summary": "model", "details": "d", "action_required": None,
+                                "tags": [], "confidence": 0.9} for u in p["units"]]}
+        for custom_id, p in plan.items()}))
+
+
+def test_submit_poll_ingest(workspace):
+    _check(workspace, {A: "intro\nthe old behaviour\n", B: "b page\n"})
+    time.sleep(1.1)  # runs are keyed by their timestamp to the second
+    _check(workspace, {A: "intro\nhooks now run before tool approval\n", B: "b page\n"})
+
+    _backfill()
+    conn = m.init_db()
+    row = conn.execute("SELECT batch_id, status, requests_json FROM classification_batches").fetchone()
+    assert row["status"] == "submitted"
+    plan = json.loads(row["requests_json"])
+    assert [p["units"] for p in plan.values()] == [[A]]
+    assert conn.execute("SELECT COUNT(*) FROM change_events").fetchone()[0] == 0
+
+    event = {"url": A, "category": "feature", "severity": "medium", "summary": "Hooks run earlier",
+             "details": "d", "action_required": None, "tags": ["hooks"], "confidence": 0.9}
+    workspace.responses.write_text(json.dumps({custom_id: {"events": [event]} for custom_id in plan}))
+
+    _backfill()
+    assert conn.execute("SELECT status FROM classification_batches").fetchone()[0] == "ingested"
+    stored = conn.execute("SELECT url, category, summary, classifier FROM change_events "
+                          "WHERE event_type = 'changed'").fetchall()
+    assert [tuple(r) for r in stored] == [(A, "feature", "Hooks run earlier", "llm:sonnet")]
+    assert conn.execute("SELECT COUNT(*) FROM classification_cache").fetchone()[0] == 1
+
+    # Everything is cached now: a reset backfill stores the run again without a new batch
+    conn.execute("DELETE FROM change_events")
+    conn.commit()
+    _backfill()
+    assert conn.execute("SELECT COUNT(*) FROM classification_batches").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM change_events WHERE event_type = 'changed'").fetchone()[0] == 1
+
+
+def test_missing_canned_response_leaves_run_for_retry(workspace):
+    _check(workspace, {A: "intro\nthe old behaviour\n"})
+    time.sleep(1.1)
+    _check(workspace, {A: "intro\nhooks now run before tool approval\n"})
+    workspace.responses.write_text("{}")
+
+    _backfill()
+    _backfill()  # ingests the errored batch, then resubmits the still-unclassified run
+    conn = m.init_db()
+    statuses = [r[0] for r in conn.execute("SELECT status FROM classification_batches ORDER BY rowid")]
+    assert statuses == ["ingested", "submitted"]
+    assert conn.execute("SELECT COUNT(*) FROM change_events").fetchone()[0] == 0
+
+
+def test_batch_from_an_older_prompt_is_stored_but_not_cached(workspace):
+    _check(workspace, {A: "intro\nthe old behaviour\n"})
+    time.sleep(1.1)
+    _check(workspace, {A: "intro\nhooks now run before tool approval\n"})
+    _backfill()
+    conn = m.init_db()
+    conn.execute("UPDATE classification_batches SET prompt_version = 'older'")
+    conn.commit()
+    plan = json.loads(conn.execute("SELECT requests_json FROM classification_batches").fetchone()[0])
+    event = {"url": A, "category": "feature", "severity": "medium", "summary": "Hooks run earlier",
+             "details": "d", "action_required": None, "tags": ["hooks"], "confidence": 0.9}
+    workspace.responses.write_text(json.dumps({custom_id: {"events": [event]} for custom_id in plan}))
+
+    _backfill()
+    assert conn.execute("SELECT COUNT(*) FROM change_events WHERE event_type = 'changed'").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM classification_cache").fetchone()[0] == 0
+
+
+def test_ingest_uses_the_submitted_min_llm_severity(workspace):
+    _check(workspace, {A: "intro\nthe old behaviour\n", B: "It was recieved.\nSee [a](/en/a).\n"})
+    time.sleep(1.1)
+    _check(workspace, {A: "intro\nhooks now run before tool approval\n",
+                       B: "It was received.\nSee [a](/en/a).\n"})
+    conn = m.init_db()
+
+    _backfill("low")  # the typo on B goes to the model too
+    assert sorted(u for p in json.loads(conn.execute(
+        "SELECT requests_json FROM classification_batches").fetchone()[0]).values()
+        for u in p["units"]) == [A, B]
+    _answer_all(workspace, conn)
+    _backfill()
+    stored = conn.execute("SELECT url, classifier FROM change_events WHERE event_type = 'changed' "
+                          "ORDER BY url").fetchall()
+    assert [tuple(r) for r in stored] == [(A, "llm:sonnet"), (B, "llm:sonnet")]
+
+
+def test_ingest_keeps_heuristic_events_skipped_at_submission(workspace):
+    _check(workspace, {A: "intro\nthe old behaviour\n", B: "See [a](/en/a).\n"})
+    time.sleep(1.1)
+    _check(workspace, {A: "intro\nhooks now run before tool approval\n", B: "See [a](/en/b).\n"})
+    conn = m.init_db()
+
+    _backfill("high")  # the link change on B is answered by the heuristics
+    assert [u for p in json.loads(conn.execute(
+        "SELECT requests_json FROM classification_batches").fetchone()[0]).values()
+        for u in p["units"]] == [A]
+    _answer_all(workspace, conn)
+    _backfill()
+    stored = conn.execute("SELECT url, classifier FROM change_events WHERE event_type = 'changed' "
+                          "ORDER BY url").fetchall()
+    assert [tuple(r) for r in stored] == [(A, "llm:sonnet"), (B, "heuristic")]
@@ -0,0 +1,28 @@
+"""Routing of diff units between the fast and strong tiers of --cascade."""
+
+import sqlite3
+
+import claude_docs_monitor as m
+
+
+def test_large_diffs_skip_the_fast_tier(monkeypatch):
+    calls: dict[str, list[str]] = {}
+
+    def classify_units(units, model, backend="auto", batch_tokens=0, workers=0):
+        calls[model] = [unit_id for unit_id, _ in units]
+        confidence = {"unsure": 0.3}
+        return [{"url": unit_id, "category": "clarification", "severity": "low",
+                 "summary": unit_id, "confidence": confidence.get(unit_id, 0.9)}
+                for unit_id, _ in units], []
+
+    monkeypatch.setattr(m, "classify_units", classify_units)
+    large = "+" + "x" * (m.CASCADE_LARGE_DIFF_TOKENS * 4)
+    units = [("small", "+a line"), ("large", large), ("unsure", "+another line")]
+
+    events, failed, escalated = m.cascade_units(sqlite3.connect(":memory:"), {}, units,
+                                                "sonnet", "haiku")
+
+    assert calls == {"haiku": ["small", "unsure"], "sonnet": ["large", "unsure"]}
+    assert escalated == 2 and failed == []
+    assert [(ev["url"], ev["classifier"]) for ev in events] == [
+        ("small", "llm:haiku"), ("large", "llm:sonnet"), ("unsure", "llm:sonnet")]
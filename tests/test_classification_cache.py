@@ -0,0 +1,31 @@
+"""classification_cache keys follow the classified diff text and normalized page hashes."""
+
+import claude_docs_monitor as m
+
+URL = "https://code.claude.com/docs/en/a.md"
+DIFF = "--- a\n+++ b\n@@ -1,2 +1,2 @@\n-Built at 2026-01-01T00:00:00Z\n+Built at 2026-02-01T00:00:00Z\n-old\n+new\n"
+
+
+def _run(raw: str, diff: str, residual: str | None = None) -> dict:
+    change = {"url": URL, "diff": diff, "old_hash": raw + "1", "new_hash": raw + "2",
+              "old_normalized_hash": "n1", "new_normalized_hash": "n2"}
+    if residual is not None:
+        change["residual_diff"] = residual
+    return {"changes": [change], "shared": []}
+
+
+def test_volatile_only_differences_share_a_key():
+    other = DIFF.replace("2026-02-01", "2026-03-01")
+    assert m._classification_keys(_run("a", DIFF)) == m._classification_keys(_run("b", other))
+
+
+def test_residual_diff_is_part_of_the_key(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    conn = m.init_db()
+    whole = m._classification_keys(_run("a", DIFF))[URL]
+    partial = m._classification_keys(_run("a", DIFF, residual="@@ -2 +2 @@\n-old\n+new\n"))[URL]
+    assert whole[:3] == partial[:3] and whole != partial
+
+    m.store_cached_classification(conn, partial, "sonnet", "v1", [{"summary": "part"}])
+    assert m.get_cached_classification(conn, whole, "sonnet", "v1") is None
+    assert m.get_cached_classification(conn, partial, "sonnet", "v1") == [{"summary": "part"}]
@@ -0,0 +1,19 @@
+"""dump --changed-since selection."""
+
+import claude_docs_monitor as m
+
+A = "https://code.claude.com/docs/en/a.md"
+B = "https://code.claude.com/docs/en/b.md"
+
+
+def test_changed_since_ignores_volatile_only_differences(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    conn = m.init_db()
+    m.store_page_snapshot(conn, A, "Built at 2026-01-01T00:00:00Z\n", 200, 1.0)
+    m.store_page_snapshot(conn, B, "Old text\n", 200, 1.0)
+    conn.execute("UPDATE page_snapshots SET fetched_at = '2026-01-01T00:00:00+00:00'")
+    m.store_page_snapshot(conn, A, "Built at 2026-02-01T00:00:00Z\n", 200, 1.0)
+    m.store_page_snapshot(conn, B, "New text\n", 200, 1.0)
+    conn.commit()
+
+    assert [url for url, _ in m.iter_latest_snapshots(conn, "2026-01-15T00:00:00+00:00")] == [B]
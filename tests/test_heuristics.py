@@ -0,0 +1,93 @@
+"""The heuristic pre-classifier's rules and the --min-llm-severity cut-off."""
+
+from difflib import unified_diff
+
+import pytest
+
+import claude_docs_monitor as m
+
+
+def _diff(old: str, new: str) -> str:
+    return "".join(unified_diff(old.splitlines(keepends=True), new.splitlines(keepends=True),
+                                "old", "new"))
+
+
+def _kind(old: str, new: str) -> str | None:
+    ev = m.heuristic_classify(_diff(old, new))
+    return ev["tags"][0] if ev else None
+
+
+PAGE = "\n".join(f"Paragraph {i} says something about option {i}." for i in range(12)) + "\n"
+
+
+@pytest.mark.parametrize("old, new", [
+    ("synchronous", "asynchronous"),
+    ("allowed", "disallowed"),
+    ("increase", "decrease"),
+    ("visible", "invisible"),
+    ("secure", "insecure"),
+    ("enabled", "unenabled"),
+    ("true", "True"),
+    ("Hooks", "hooks"),
+    ("read", "lead"),
+])
+def test_word_swaps_that_change_meaning_are_not_typos(old, new):
+    assert _kind(f"The call is {old} by default.\n", f"The call is {new} by default.\n") is None
+
+
+@pytest.mark.parametrize("old, new", [
+    ("recieved", "received"),
+    ("seperate", "separate"),
+    ("configuraton", "configuration"),
+])
+def test_misspellings_are_typos(old, new):
+    ev = m.heuristic_classify(_diff(f"The value is {old} once.\n", f"The value is {new} once.\n"))
+    assert ev["tags"] == ["typo"] and ev["severity"] == "low"
+
+
+def test_too_many_corrections_is_not_a_typo():
+    old = "Teh configuraton is recieved and seperate.\n"
+    new = "The configuration is received and separate.\n"
+    assert _kind(old, new) is None
+
+
+def test_reflow_in_place_is_whitespace():
+    old = PAGE.replace("Paragraph 5 says", "Paragraph 5\nsays")
+    assert _kind(old, PAGE) == "whitespace"
+
+
+@pytest.mark.parametrize("old, new", [
+    ("Run `claude --resume last` to continue.\n", "Run `claude --resumelast` to continue.\n"),
+    ("There is no thing to configure.\n", "There is nothing to configure.\n"),
+])
+def test_joined_or_split_words_are_not_whitespace(old, new):
+    assert _kind(old, new) is None
+
+
+def test_moved_paragraph_is_not_whitespace():
+    lines = PAGE.splitlines(keepends=True)
+    moved = lines[:2] + lines[3:10] + [lines[2]] + lines[10:]
+    assert _kind(PAGE, "".join(moved)) is None
+
+
+def test_code_fence_tag():
+    assert _kind("```\nx = 1\n```\n", "```python\nx = 1\n```\n") == "code-fence"
+
+
+def test_link_targets_are_medium():
+    ev = m.heuristic_classify(_diff("See [hooks](/en/hooks).\n", "See [hooks](/en/hooks-guide).\n"))
+    assert ev["tags"] == ["links"] and ev["severity"] == "medium"
+
+
+@pytest.mark.parametrize("level, skipped", [
+    ("low", set()),
+    ("medium", {"typo"}),
+    ("high", {"typo", "links"}),
+])
+def test_min_llm_severity(level, skipped):
+    run = {"changes": [
+        {"url": "typo", "diff": _diff("It was recieved.\n", "It was received.\n")},
+        {"url": "links", "diff": _diff("See [a](/en/a).\n", "See [a](/en/b).\n")},
+        {"url": "prose", "diff": _diff("Hooks run first.\n", "Hooks run last.\n")},
+    ]}
+    assert set(m._heuristic_unit_events(run, level)) == skipped
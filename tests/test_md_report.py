@@ -0,0 +1,35 @@
+"""report.md is written one diff unit at a time."""
+
+import claude_docs_monitor as m
+
+DIFF = "--- a\n+++ b\n@@ -1 +1 @@\n-old\n+new\n"
+
+
+def _report_data(n: int) -> dict:
+    return {"timestamp": "2026-01-01 00:00:00 UTC", "first_run": False, "added": [],
+            "removed": [], "errors": [], "shared": [],
+            "changes": [{"url": f"https://example.com/{i}.md", "diff": DIFF, "artifact": f"p{i}"}
+                        for i in range(n)]}
+
+
+def test_diff_units_render_as_they_are_consumed(monkeypatch):
+    rendered = []
+    truncate = m.truncate_diff
+
+    def truncate_diff(diff_text, max_bytes):
+        rendered.append(diff_text)
+        return truncate(diff_text, max_bytes)
+
+    monkeypatch.setattr(m, "truncate_diff", truncate_diff)
+    lines = m._md_report_diff_lines(_report_data(3), 0)
+    assert next(lines) == "### https://example.com/0.md\n"
+    assert len(rendered) == 1
+    assert sum(line == "### https://example.com/2.md\n" for line in lines) == 1
+    assert len(rendered) == 3
+
+
+def test_report_lists_every_diff(tmp_path):
+    m.generate_md_report(_report_data(2), tmp_path, max_diff_bytes=0)
+    text = (tmp_path / "report.md").read_text(encoding="utf-8")
+    assert "### https://example.com/0.md" in text and "### https://example.com/1.md" in text
+    assert text.count("[full diff](") == 2 and "Truncated" not in text
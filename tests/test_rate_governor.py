@@ -0,0 +1,17 @@
+"""The cross-process rate governor's per-model buckets."""
+
+import json
+
+import llm_backend as lb
+
+
+def test_alias_and_model_id_share_a_bucket(tmp_path):
+    path = tmp_path / "rate.json"
+    gov = lb._RateGovernor(str(path), {"opus": 6})
+    assert gov.quota(lb._MODEL_ALIASES_API["opus"]) == 6
+
+    gov.acquire("opus")
+    gov.penalize(lb._MODEL_ALIASES_API["opus"], 60)
+
+    assert list(json.loads(path.read_text())) == [lb._MODEL_ALIASES_API["opus"]]
+    assert gov._next_wait(lb._MODEL_ALIASES_API["opus"]) > 50
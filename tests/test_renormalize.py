@@ -0,0 +1,26 @@
+"""renormalize's re-evaluation of history across databases upgraded mid-way."""
+
+import types
+
+import claude_docs_monitor as m
+
+URL = "https://code.claude.com/docs/en/a.md"
+
+
+def test_rows_from_before_normalization_compare_by_raw_hash(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(m, "HAS_RICH", False)
+    conn = m.init_db()
+    m.store_page_snapshot(conn, URL, "Built at 2026-01-01T00:00:00Z\n", 200, 1.0)
+    m.store_page_snapshot(conn, URL, "Built at 2026-01-01T00:00:00Z\n", 200, 1.0)
+    # The first row predates normalization
+    conn.execute("UPDATE page_snapshots SET normalized_hash = NULL, normalize_rules = NULL "
+                 "WHERE id = (SELECT MIN(id) FROM page_snapshots)")
+    conn.commit()
+
+    m.cmd_renormalize(types.SimpleNamespace(dry_run=True, print_rules=False))
+
+    out = capsys.readouterr().out
+    assert "Raw hash changes:          0" in out
+    assert "Previous normalized hash:  0" in out
+    assert "Current rules:             0" in out